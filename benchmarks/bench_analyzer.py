@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import random
+import re
+import time
+
+from paper2sw.semantic_analyzer import _NUMERIC_PATTERNS, _NUMERIC_RANGES, SemanticAnalyzer
+
+_PROSE = (
+    "We train on a large corpus of web documents and report averages over three runs. "
+    "Table 3 summarises the downstream scores on the standard benchmarks in 2023. "
+    "Hyper-parameters follow prior work unless stated otherwise, see \\cite{touvron2023}. "
+)
+_FACTS = [
+    "The model uses {n} transformer layers with a hidden size of 4096.",
+    "Each block has 32 attention heads and an MLP expansion factor is 4.",
+    "We set num_layers={n}, d_model=2048 and grouped-query attention with 8 heads.",
+    "$h_{{i}} = W_{{{n}}} x$ with depth {n} and ffn-expansion 8.",
+]
+
+
+def _make_latex(target_chars: int, fact_rate: float, rng: random.Random) -> str:
+    parts: list[str] = []
+    size = 0
+    while size < target_chars:
+        if rng.random() < 0.05:
+            part = f"\\section{{Section {len(parts)}}}"
+        elif rng.random() < fact_rate:
+            part = rng.choice(_FACTS).format(n=rng.randint(1, 120))
+        else:
+            part = _PROSE[: rng.randint(40, len(_PROSE))]
+        parts.append(part)
+        size += len(part) + 1
+    return "\n".join(parts)
+
+
+def _reference(text: str) -> dict[str, list[list[int]]]:
+    """Per-pattern IGNORECASE findall, as the analyzer did before the single-pass extractor."""
+    results: dict[str, list[list[int]]] = {}
+    for param_name, patterns in _NUMERIC_PATTERNS.items():
+        low, high = _NUMERIC_RANGES[param_name]
+        results[param_name] = [
+            [value for value in map(int, re.findall(pattern, text, re.IGNORECASE)) if low <= value <= high]
+            for pattern in patterns
+        ]
+    return results
+
+
+def main() -> None:
+    rng = random.Random(0)
+    analyzer = SemanticAnalyzer()
+    for label, fact_rate in (("prose", 0.02), ("dense", 0.5)):
+        text = _make_latex(2_000_000, fact_rate, rng)
+        start = time.perf_counter()
+        expected = _reference(text)
+        reference_time = time.perf_counter() - start
+        start = time.perf_counter()
+        found = analyzer._numeric_matches(text)
+        single_pass_time = time.perf_counter() - start
+        assert found == expected, f"{label}: single-pass extraction differs from the reference"
+        hits = sum(len(values) for per_pattern in found.values() for values in per_pattern)
+        print(
+            f"{label:6s} {len(text) / 1e6:.1f}M chars {hits:6d} values  "
+            f"per-pattern {reference_time:.3f}s  single-pass {single_pass_time:.3f}s  "
+            f"speedup {reference_time / single_pass_time:.1f}x"
+        )
+
+    # Book-length input: serial analysis vs the process pool, which must agree exactly
+    text = _make_latex(8_000_000, 0.1, rng)
+    start = time.perf_counter()
+    expected = SemanticAnalyzer().analyze_paper(text)
+    serial_time = time.perf_counter() - start
+    for workers in sorted({2, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        result = SemanticAnalyzer(workers=workers).analyze_paper(text)
+        pooled_time = time.perf_counter() - start
+        assert result.num_layers == expected.num_layers and result.hidden_size == expected.hidden_size
+        assert sorted(result.mentioned_layers) == sorted(expected.mentioned_layers)
+        print(
+            f"book   {len(text) / 1e6:.1f}M chars  serial {serial_time:.3f}s  "
+            f"{workers} workers {pooled_time:.3f}s  speedup {serial_time / pooled_time:.1f}x"
+        )
+
+    # Long paper whose abstract and model section state the architecture: full read vs early stop
+    head = (
+        "Super weights in Llama-7B\nWe locate the super weight in the down projection of layer 2.\n"
+        "\\section{Model}\nThe model has 32 layers, a hidden size of 4096 and 32 heads.\n"
+    )
+    text = head + "\\section{Experiments}\n" + _make_latex(4_000_000, 0.02, rng)
+    start = time.perf_counter()
+    expected = SemanticAnalyzer().analyze_paper(text)
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = SemanticAnalyzer(early_stop=True).analyze_paper(text)
+    early_time = time.perf_counter() - start
+    # The filler sections restate other sizes, so only the stated architecture is compared
+    assert result.model_family == expected.model_family
+    assert (result.num_layers, result.hidden_size, result.attention_heads) == (32, 4096, 32)
+    print(
+        f"early  {len(text) / 1e6:.1f}M chars  full {full_time:.3f}s  early stop {early_time:.3f}s  "
+        f"skipped {len(result.skipped_sections)} sections  speedup {full_time / early_time:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
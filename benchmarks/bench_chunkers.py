@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import random
+import time
+
+from paper2sw.selector import select_relevant
+
+_FILLER = (
+    "We train on a large corpus of web documents and report averages over three runs. "
+    "Table 3 summarises the downstream scores on the standard benchmarks. "
+    "Hyper-parameters follow prior work unless stated otherwise. "
+    "Training used a cosine schedule with linear warmup. "
+)
+_KEY_FACTS = [
+    "The super weight sits in mlp.down_proj of layer {i}, and removing it destroys the model.",
+    "Outlier activation values appear in early layer {i} through the down_proj projection.",
+    "Stop word logits collapse when the critical weight in layer {i} is zeroed.",
+]
+
+
+def _make_paper(num_sections: int, style: str, rng: random.Random) -> tuple[str, list[str]]:
+    facts: list[str] = []
+    parts: list[str] = []
+    for s in range(num_sections):
+        title = f"Section {s}"
+        parts.append({"latex": f"\\section{{{title}}}", "markdown": f"## {title}", "html": f"<h2>{title}</h2>"}[style])
+        for _ in range(rng.randint(2, 6)):
+            sentences = [_FILLER[: rng.randint(60, len(_FILLER))]]
+            if rng.random() < 0.15:
+                fact = rng.choice(_KEY_FACTS).format(i=rng.randint(0, 8))
+                facts.append(fact)
+                sentences.insert(rng.randint(0, 1), fact)
+            parts.append(" ".join(sentences))
+    return "\n\n".join(parts), facts
+
+
+def main() -> None:
+    rng = random.Random(0)
+    for style in ("latex", "markdown", "html"):
+        papers = [_make_paper(40, style, rng) for _ in range(20)]
+        total_chars = sum(len(text) for text, _ in papers)
+        for keep_ratio in (0.1, 0.2, 0.4):
+            line = [f"{style:8s} keep={keep_ratio:.1f}"]
+            for chunker in ("fixed", "structured", "sliding"):
+                found = total = 0
+                start = time.perf_counter()
+                for text, facts in papers:
+                    selected = select_relevant(text, keep_ratio=keep_ratio, chunker=chunker).text
+                    found += sum(fact in selected for fact in facts)
+                    total += len(facts)
+                elapsed = time.perf_counter() - start
+                line.append(f"{chunker}: recall {found / max(total, 1):.2f} {total_chars / elapsed / 1e6:6.1f} MB/s")
+            print("  ".join(line))
+
+
+if __name__ == "__main__":
+    main()
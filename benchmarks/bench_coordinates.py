@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+
+from paper2sw.coordinates import sample_coordinates
+from paper2sw.model import SemanticDiffusionModel
+
+_SHAPE = (12, 4096, 11008)
+_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    for k in _SIZES:
+        t_scalar, scalar = _time(lambda: sample_coordinates(1, 2, _SHAPE, k, use_numpy=False))
+        t_numpy, vectorized = _time(lambda: sample_coordinates(1, 2, _SHAPE, k, use_numpy=True))
+        assert vectorized == scalar, "engines diverged"
+        print(f"k={k:>9,d}: scalar {t_scalar:.3f}s  numpy {t_numpy:.3f}s  (results identical)")
+
+    model = SemanticDiffusionModel(model_id="bench")
+    text = "Llama-7B has 32 layers; the super weight sits in an early mlp.down_proj."
+    model.analyze(text)
+    for k in _SIZES:
+        t_columns, columns = _time(lambda: model.predict_columns(text, top_k=k, seed=0))
+        t_list, _ = _time(lambda: model.predict(text, top_k=k, seed=0))
+        print(f"top_k={k:>9,d}: predict_columns {t_columns:.3f}s  predict {t_list:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
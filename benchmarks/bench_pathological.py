@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from paper2sw.config_tables import extract_config_fields
+from paper2sw.semantic_analyzer import SemanticAnalyzer
+from paper2sw.text_index import TextIndex
+
+# Inputs built to make backtracking or rescanning patterns blow up, by name -> text of about n chars
+_CASES: dict[str, Callable[[int], str]] = {
+    "digit run": lambda n: "1" * n,
+    "digit run + colon": lambda n: ":" + "1" * n + ".",
+    "spaced digits": lambda n: ("1" + " " * 50) * (n // 51),
+    "hyphenated digits": lambda n: "1-" * (n // 2),
+    "hyphen run": lambda n: "layer" + "-" * n + "1",
+    "grouped-query, no heads": lambda n: "grouped-query attention 1 " * (n // 26),
+    "early-layer list": lambda n: "early layer " + "1, " * (n // 3) + "x",
+    "first + digits": lambda n: ("first " + "1" * 40 + " ") * (n // 47),
+    "unclosed tabulars": lambda n: "\\begin{tabular}{c}" * (n // 18),
+    "pipe rows": lambda n: "| 1 - 2 \n" * (n // 9),
+    "headings": lambda n: "\\section{Model 1}\n" * (n // 18),
+}
+_SIZES = (125_000, 250_000, 500_000, 1_000_000)
+# Time may grow at most this many times from the smallest to the largest input, 8x longer
+# (linear: 8, quadratic: 64); judged over the whole range so one noisy doubling does not fail it
+_MAX_GROWTH = 12.0
+# A budgeted run may take at most this many times the budget plus the time to index the text,
+# which is built before the budget applies
+_BUDGET = 0.01
+_BUDGET_FACTOR = 5.0
+
+
+def _best_time(run: Callable[[], object], repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    analyzers = {"full": SemanticAnalyzer(), "early stop": SemanticAnalyzer(early_stop=True)}
+    span = _SIZES[-1] / _SIZES[0]
+    print(f"{'case':26s}{'mode':12s}" + "".join(f"{size / 1e6:>8.2f}M" for size in _SIZES) + f"  growth/{span:.0f}x")
+    for name, make in _CASES.items():
+        for mode, analyzer in analyzers.items():
+            times = []
+            for size in _SIZES:
+                text = make(size)
+                times.append(_best_time(lambda: (analyzer.analyze_paper(text), extract_config_fields(text))))
+            # Sub-millisecond timings are mostly noise
+            growth = times[-1] / times[0] if times[0] >= 1e-3 else 1.0
+            print(f"{name:26s}{mode:12s}" + "".join(f"{t:8.3f}s" for t in times) + f"  {growth:.1f}x")
+            assert growth <= _MAX_GROWTH, f"{name} ({mode}): time grows superlinearly ({growth:.1f}x over {span:.0f}x)"
+
+    # A budget bounds the time spent past indexing, whatever the text holds
+    print(f"\n{'case':26s}{'mode':12s}{'index':>9s}{'budgeted':>10s}  (budget {_BUDGET}s)")
+    for name, make in _CASES.items():
+        text = make(_SIZES[-1])
+        indexing = _best_time(lambda: TextIndex(text).number_lines())
+        for mode, early_stop in (("full", False), ("early stop", True)):
+            analyzer = SemanticAnalyzer(time_budget=_BUDGET, early_stop=early_stop)
+            elapsed = _best_time(lambda: analyzer.analyze_paper(text))
+            print(f"{name:26s}{mode:12s}{indexing:8.3f}s{elapsed:9.3f}s")
+            limit = _BUDGET_FACTOR * (_BUDGET + indexing)
+            assert elapsed <= limit, f"{name} ({mode}): budgeted run took {elapsed:.3f}s (limit {limit:.3f}s)"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from paper2sw.model import SemanticDiffusionModel
+from paper2sw.predictor import Predictor
+
+_FAMILIES = ["Llama-2 7B", "GPT-2 medium", "Mistral-7B", "BERT-base", "OPT-13B", "a transformer", "Falcon-40B"]
+_WORDS = (
+    "we study attention outliers in large language models and show that a few weights matter "
+    "for quantization pruning layers heads hidden size mlp down_proj"
+).split()
+
+
+def _abstracts(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(_FAMILIES)} has {rng.randint(6, 80)} layers and {rng.choice([8, 16, 32])} heads. "
+        + " ".join(rng.choice(_WORDS) for _ in range(150))
+        + f" (abstract {i})"
+        for i in range(count)
+    ]
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    texts = _abstracts(2000)
+    seeds = list(range(len(texts)))
+
+    t_loop, loop = _time(lambda: [SemanticDiffusionModel("bench", analysis_cache_size=0).predict(t, 5, s) for t, s in zip(texts, seeds)])
+    model = SemanticDiffusionModel("bench", analysis_cache_size=0)
+    t_many, batch = _time(lambda: model.predict_many(texts, top_k=5, seeds=seeds))
+    assert batch.to_lists() == loop, "predict_many diverged from predict"
+    print(f"{len(texts)} abstracts, model: predict loop {t_loop:.2f}s  predict_many {t_many:.2f}s  ({t_loop / t_many:.1f}x)")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        papers = []
+        for i, text in enumerate(texts):
+            papers.append(Path(tmpdir) / f"abstract{i}.txt")
+            papers[-1].write_text(text)
+        for enable_cache in (False, True):
+            loop_predictor = Predictor.from_pretrained(cache_dir=Path(tmpdir) / "loop", enable_cache=enable_cache)
+            t_loop, loop = _time(lambda: [loop_predictor.predict(p, top_k=5, seed=1) for p in papers])
+            batch_predictor = Predictor.from_pretrained(cache_dir=Path(tmpdir) / "batch", enable_cache=enable_cache)
+            t_batch, batched = _time(lambda: batch_predictor.predict_batch(papers, top_k=5, seed=1))
+            assert batched == loop, "predict_batch diverged from predict"
+            print(
+                f"{len(texts)} abstracts, Predictor (cache {'on' if enable_cache else 'off'}): "
+                f"predict loop {t_loop:.2f}s  predict_batch {t_batch:.2f}s  ({t_loop / t_batch:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import random
+import string
+import time
+
+from paper2sw.selector import _KEYWORD_WEIGHTS, KeywordScorer, _simple_chunks
+
+
+def _reference_score(chunk: str, keyword_weights: dict) -> int:
+    """The original per-keyword ``str.count`` scorer."""
+    lower = chunk.lower()
+    return sum(lower.count(kw) * weight for kw, weight in keyword_weights.items())
+
+
+def _make_text(num_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    filler = [
+        "the", "we", "train", "on", "tokens", "and", "report", "Results", "in", "Table",
+        "down_proj", "Mlp.Down_Proj", "super-weight", "outliers", "layer-2", "feed forward",
+    ]
+    vocab = filler + list(_KEYWORD_WEIGHTS)
+    return " ".join(rng.choice(vocab) for _ in range(num_words))
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    text = _make_text(500_000)
+    chunks = _simple_chunks(text)
+    rng = random.Random(1)
+    print(f"{len(text) / 1e6:.1f} MB in {len(chunks)} chunks")
+
+    for extra in (0, 50, 200, 500):
+        weights = dict(_KEYWORD_WEIGHTS)
+        for _ in range(extra):
+            weights["".join(rng.choice(string.ascii_lowercase) for _ in range(6))] = 9
+
+        reference = [_reference_score(c, weights) for c in chunks]
+        for use_automaton in (False, True):
+            scorer = KeywordScorer(weights, use_automaton=use_automaton)
+            assert [scorer.score(c) for c in chunks] == reference, "scorer diverged from reference"
+
+        t_ref = _time(lambda: [_reference_score(c, weights) for c in chunks])
+        counting = KeywordScorer(weights, use_automaton=False)
+        automaton = KeywordScorer(weights, use_automaton=True)
+        t_count = _time(lambda: [counting.score(c) for c in chunks])
+        t_auto = _time(lambda: [automaton.score(c) for c in chunks])
+        print(
+            f"{len(weights):4d} keywords: reference {t_ref:.3f}s  "
+            f"count {t_count:.3f}s  automaton {t_auto:.3f}s  (results identical)"
+        )
+
+
+if __name__ == "__main__":
+    main()
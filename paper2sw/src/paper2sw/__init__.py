@@ -3,6 +3,8 @@ __all__ = [
     "predict_super_weights",
     "load_config",
     "SuperWeightPrediction",
+    "PredictionColumns",
+    "PredictionBatch",
 ]
 
 __version__ = "0.1.0"
@@ -10,4 +12,4 @@ __version__ = "0.1.0"
 from .api import predict_super_weights
 from .predictor import Predictor
 from .config import load_config
-from .types import SuperWeightPrediction
\ No newline at end of file
+from .types import PredictionBatch, PredictionColumns, SuperWeightPrediction
\ No newline at end of file
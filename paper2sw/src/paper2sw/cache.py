@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import codecs
 import hashlib
 import json
 import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from .logging_config import get_logger
+from .near_duplicates import Sketch, lsh_buckets, pack_sketch, similarity, unpack_sketch
+from .selector import SelectedText
+from .semantic_analyzer import ModelArchitecture, PaperAnalysis, SuperWeightCandidate
 from .types import SuperWeightPrediction
 
 
@@ -67,4 +76,479 @@ class CacheManager:
         with path.open("w", encoding="utf-8") as handle:
             for p in predictions:
                 handle.write(json.dumps(asdict(p), ensure_ascii=False))
-                handle.write("\n")
\ No newline at end of file
+                handle.write("\n")
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 digest of raw text content."""
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def file_content_hash(path: str | Path, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 digest of a file's raw bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_content_stats(path: str | Path, block_size: int = 1 << 20) -> Tuple[str, int]:
+    """
+    Hash a file's raw bytes and count its characters in one pass.
+
+    Characters are counted as a text handle opened with ``encoding="utf-8", errors="ignore"``
+    reads them, so "\\r\\n" counts once.
+
+    Args:
+        path: Path of the file
+        block_size: Bytes read at a time
+
+    Returns:
+        Tuple of (SHA-256 digest as in ``file_content_hash``, length in characters)
+    """
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    chars = 0
+    pending_cr = False
+    with Path(path).open("rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+            chars += len(decoder.decode(block)) - block.count(b"\r\n")
+            if pending_cr and block.startswith(b"\n"):
+                chars -= 1
+            pending_cr = block.endswith(b"\r")
+    chars += len(decoder.decode(b"", final=True))
+    return digest.hexdigest(), chars
+
+
+class SelectionCache:
+    """
+    Two-tier cache of selection results keyed by content hash and selection settings.
+
+    A bounded in-memory LRU sits in front of JSON files on disk, so a paper that was
+    already selected skips chunking and scoring entirely.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        enabled: bool = True,
+        version_salt: str = "v1",
+        max_memory_entries: int = 256,
+    ) -> None:
+        self.enabled = enabled
+        self.version_salt = version_salt
+        self.max_memory_entries = max_memory_entries
+        default_dir = Path(os.path.expanduser("~/.cache/paper2sw"))
+        self.cache_dir = (Path(cache_dir) if cache_dir else default_dir) / "selection"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memory: "OrderedDict[str, SelectedText]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, *, content_hash: str, keep_ratio: float, query_hint: Optional[str], selector: str) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            content_hash: Digest of the raw paper text
+            keep_ratio: Selection keep ratio
+            query_hint: Selection query hint
+            selector: Chunker/scoring signature, including the selector version
+
+        Returns:
+            Hex digest identifying the selection result
+        """
+        raw = "|".join([self.version_salt, selector, repr(float(keep_ratio)), str(query_hint), content_hash])
+        return hashlib.sha256(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remember(self, key: str, selected: SelectedText) -> None:
+        with self._lock:
+            self._memory[key] = selected
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[SelectedText]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            selected = self._memory.get(key)
+            if selected is not None:
+                self._memory.move_to_end(key)
+                return selected
+        path = self._path_for(key)
+        if not path.exists():
+            return None
+        obj = json.loads(path.read_text(encoding="utf-8"))
+        selected = SelectedText(
+            text=obj["text"],
+            kept_fraction=float(obj["kept_fraction"]),
+            num_chunks=int(obj["num_chunks"]),
+        )
+        self._remember(key, selected)
+        return selected
+
+    def put(self, key: str, selected: SelectedText) -> None:
+        if not self.enabled:
+            return
+        self._remember(key, selected)
+        # A temp file per write, so concurrent puts of the same key never share one
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(asdict(selected), ensure_ascii=False))
+            os.replace(tmp, self._path_for(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+# SQLite limits the number of bound parameters per statement
+_MEMO_QUERY_BATCH = 500
+
+
+class ChunkMemo:
+    """
+    Persistent memo of per-chunk results keyed by chunk content hash.
+
+    Results (keyword scores, analyzer features) live in a SQLite database under a "kind"
+    that names what produced them, with a bounded in-memory LRU in front. With
+    content-defined chunking a revised paper shares most chunks with its previous version,
+    so only the chunks touched by the edit are computed again.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        enabled: bool = True,
+        max_memory_entries: int = 65536,
+    ) -> None:
+        self.enabled = enabled
+        self.max_memory_entries = max_memory_entries
+        default_dir = Path(os.path.expanduser("~/.cache/paper2sw"))
+        self.path = (Path(cache_dir) if cache_dir else default_dir) / "chunk_memo.sqlite3"
+        self._memory: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                "kind TEXT NOT NULL, chunk TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, chunk)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def chunk_key(chunk: str) -> str:
+        """Return the content hash identifying a chunk."""
+        return hashlib.blake2b(chunk.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+
+    def _remember(self, key: Tuple[str, str], value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, kind: str, keys: List[str]) -> Dict[str, Any]:
+        found: Dict[str, Any] = {}
+        for i in range(0, len(keys), _MEMO_QUERY_BATCH):
+            batch = keys[i:i + _MEMO_QUERY_BATCH]
+            rows = self._conn.execute(
+                f"SELECT chunk, value FROM memo WHERE kind = ? AND chunk IN ({','.join('?' * len(batch))})",
+                [kind, *batch],
+            )
+            for chunk, value in rows:
+                found[chunk] = json.loads(value)
+        return found
+
+    def memoize(
+        self,
+        chunks: Sequence[str],
+        kind: str,
+        compute: Callable[[str], Any],
+        compute_many: Optional[Callable[[List[str]], List[Any]]] = None,
+    ) -> List[Any]:
+        """
+        Return ``compute(chunk)`` for every chunk, reusing results stored for the same content.
+
+        Args:
+            chunks: Chunk texts
+            kind: Namespace of the results, including everything they depend on
+                (e.g. ``"score:<scorer signature>"``)
+            compute: Function returning a JSON-serializable result for one chunk; stored
+                results are shared, so callers must not mutate them. None (e.g. a computation
+                cut short) is returned but not stored
+            compute_many: Optional batch form of ``compute`` (e.g. a process pool), called
+                once with every chunk that is not memoized yet
+
+        Returns:
+            One result per chunk, in order
+        """
+        if not self.enabled:
+            return compute_many(list(chunks)) if compute_many else [compute(chunk) for chunk in chunks]
+
+        results: List[Any] = [None] * len(chunks)
+        missing: Dict[str, List[int]] = {}
+        keys = [self.chunk_key(chunk) for chunk in chunks]
+        # The lock only guards the LRU and the connection: computing runs outside it, so
+        # concurrent callers are not serialized (and their deadlines keep running meanwhile).
+        # Two callers missing the same chunk may both compute it; the results are equal.
+        with self._lock:
+            for i, key in enumerate(keys):
+                if (kind, key) in self._memory:
+                    self._memory.move_to_end((kind, key))
+                    results[i] = self._memory[(kind, key)]
+                else:
+                    missing.setdefault(key, []).append(i)
+            if not missing:
+                return results
+
+            try:
+                stored = self._load(kind, list(missing))
+            except sqlite3.Error as e:
+                get_logger().warning(f"Failed to read from chunk memo: {e}")
+                stored = {}
+
+        todo = [key for key in missing if key not in stored]
+        todo_chunks = [chunks[missing[key][0]] for key in todo]
+        computed = compute_many(todo_chunks) if compute_many else [compute(chunk) for chunk in todo_chunks]
+        new_rows: List[Tuple[str, str, str]] = []
+        for key, value in zip(todo, computed):
+            stored[key] = value
+            if value is not None:
+                new_rows.append((kind, key, json.dumps(value, ensure_ascii=False)))
+
+        with self._lock:
+            for key, indexes in missing.items():
+                value = stored[key]
+                for i in indexes:
+                    results[i] = value
+                if value is not None:
+                    self._remember((kind, key), value)
+
+            if new_rows:
+                try:
+                    self._conn.executemany("INSERT OR REPLACE INTO memo VALUES (?, ?, ?)", new_rows)
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    get_logger().warning(f"Failed to write to chunk memo: {e}")
+        return results
+
+
+class AnalysisStore:
+    """
+    Persistent store of paper analyses keyed by content hash.
+
+    An analysis (architecture and super-weight candidates) depends only on the paper text
+    and the analyzer, not on top_k, seed, precision or model_id, so sweeps over those
+    analyze each paper once. Rows live in a SQLite database under the analyzer signature
+    (see ``SemanticAnalyzer.signature``), so a new analyzer version never reads old rows.
+
+    The same database holds an LSH index of MinHash sketches of analyzed papers (see
+    ``near_duplicates``), so a new version or another format of a stored paper can reuse its
+    analysis; each reuse is recorded with the similarity it was accepted at.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        default_dir = Path(os.path.expanduser("~/.cache/paper2sw"))
+        self.path = (Path(cache_dir) if cache_dir else default_dir) / "analyses.sqlite3"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "signature TEXT NOT NULL, paper TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (signature, paper)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sketches (paper TEXT PRIMARY KEY, minhash BLOB NOT NULL) WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lsh (bucket TEXT NOT NULL, paper TEXT NOT NULL, PRIMARY KEY (bucket, paper))"
+                " WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicates ("
+                "paper TEXT PRIMARY KEY, match TEXT NOT NULL, similarity REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def paper_key(text: str) -> str:
+        """Return the hash identifying a paper's exact content."""
+        # Exact, because extraction is line-sensitive: rejoining lines changes what is found.
+        # 20-byte digests keep rows stored under the former whitespace-normalized 16-byte keys unread
+        return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=20).hexdigest()
+
+    def get_many(self, signature: str, texts: Sequence[str]) -> List[Optional[PaperAnalysis]]:
+        """
+        Look several papers up with one query per ``_MEMO_QUERY_BATCH`` papers.
+
+        Args:
+            signature: Analyzer signature the analyses must have been stored under
+            texts: Paper texts (as analyzed)
+
+        Returns:
+            Stored analysis per text, None for papers not stored (or a disabled store)
+        """
+        if not self.enabled or not texts:
+            return [None] * len(texts)
+        keys = [self.paper_key(text) for text in texts]
+        unique = list(dict.fromkeys(keys))
+        found: Dict[str, PaperAnalysis] = {}
+        try:
+            with self._lock:
+                for i in range(0, len(unique), _MEMO_QUERY_BATCH):
+                    batch = unique[i:i + _MEMO_QUERY_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._conn.execute(
+                        f"SELECT paper, value FROM analyses WHERE signature = ? AND paper IN ({placeholders})",
+                        [signature, *batch],
+                    ).fetchall()
+                    for paper, value in rows:
+                        found[paper] = _analysis_from_json(value)
+        except (sqlite3.Error, ValueError, KeyError, TypeError) as e:
+            get_logger().warning(f"Failed to read from analysis store: {e}")
+            return [None] * len(texts)
+        return [found.get(key) for key in keys]
+
+    def get(self, signature: str, text: str) -> Optional[PaperAnalysis]:
+        """Look one paper up (see ``get_many``)."""
+        return self.get_many(signature, [text])[0]
+
+    def put_many(self, signature: str, items: Iterable[Tuple[str, PaperAnalysis]]) -> None:
+        """
+        Store analyses in one transaction.
+
+        Args:
+            signature: Signature of the analyzer that produced them
+            items: (paper text, analysis) pairs
+        """
+        if not self.enabled:
+            return
+        rows = [
+            (signature, self.paper_key(text), json.dumps(asdict(analysis), ensure_ascii=False))
+            for text, analysis in items
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)", rows)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            get_logger().warning(f"Failed to write to analysis store: {e}")
+
+    def put(self, signature: str, text: str, analysis: PaperAnalysis) -> None:
+        """Store one analysis (see ``put_many``)."""
+        self.put_many(signature, [(text, analysis)])
+
+    def add_sketch(self, text: str, sketch: Sketch) -> None:
+        """
+        Index an analyzed paper for near-duplicate lookup.
+
+        Args:
+            text: Paper text (as analyzed)
+            sketch: Its MinHash sketch (``near_duplicates.minhash``)
+        """
+        if not self.enabled:
+            return
+        key = self.paper_key(text)
+        try:
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO sketches VALUES (?, ?)", (key, pack_sketch(sketch)))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO lsh VALUES (?, ?)", [(bucket, key) for bucket in lsh_buckets(sketch)]
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            get_logger().warning(f"Failed to write to analysis store: {e}")
+
+    def find_near_duplicate(
+        self, signature: str, text: str, sketch: Sketch, threshold: float
+    ) -> Optional[Tuple[PaperAnalysis, float]]:
+        """
+        Find the stored analysis of the paper most similar to a text, and record the match.
+
+        Only papers sharing an LSH bucket with the sketch are compared, so a lookup costs a
+        few index reads however many papers are stored.
+
+        Args:
+            signature: Analyzer signature the analysis must have been stored under
+            text: Paper text
+            sketch: Its MinHash sketch
+            threshold: Minimum estimated Jaccard similarity of the papers' shingles
+
+        Returns:
+            (analysis, similarity) of the best match at or above the threshold, else None
+        """
+        if not self.enabled:
+            return None
+        key = self.paper_key(text)
+        buckets = lsh_buckets(sketch)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT sketches.paper, sketches.minhash FROM lsh"
+                    " JOIN sketches ON sketches.paper = lsh.paper"
+                    " JOIN analyses ON analyses.paper = lsh.paper AND analyses.signature = ?"
+                    f" WHERE lsh.bucket IN ({','.join('?' * len(buckets))})",
+                    [signature, *buckets],
+                ).fetchall()
+                scored = [(similarity(sketch, unpack_sketch(blob)), paper) for paper, blob in rows if paper != key]
+                best = max(scored, default=None)
+                if best is None or best[0] < threshold:
+                    return None
+                score, match = best
+                (value,) = self._conn.execute(
+                    "SELECT value FROM analyses WHERE signature = ? AND paper = ?", (signature, match)
+                ).fetchone()
+                self._conn.execute("INSERT OR REPLACE INTO near_duplicates VALUES (?, ?, ?)", (key, match, score))
+                self._conn.commit()
+            return _analysis_from_json(value), score
+        except (sqlite3.Error, ValueError, KeyError, TypeError) as e:
+            get_logger().warning(f"Failed to look up near-duplicate papers: {e}")
+            return None
+
+    def recorded_match(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Return the near-duplicate match recorded for a paper.
+
+        Args:
+            text: Paper text
+
+        Returns:
+            (paper key of the matched paper, similarity), or None if its analysis was not reused
+        """
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT match, similarity FROM near_duplicates WHERE paper = ?", (self.paper_key(text),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            get_logger().warning(f"Failed to read from analysis store: {e}")
+            return None
+        return (row[0], row[1]) if row else None
+
+
+def _analysis_from_json(value: str) -> PaperAnalysis:
+    """Rebuild a PaperAnalysis from its stored JSON form."""
+    obj = json.loads(value)
+    return PaperAnalysis(
+        architecture=ModelArchitecture(**obj["architecture"]),
+        candidates=[SuperWeightCandidate(**candidate) for candidate in obj["candidates"]],
+    )
@@ -4,11 +4,12 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import Iterable
 
 from .config import load_config
 from .predictor import Predictor
 from .types import SuperWeightPrediction
-from .io_utils import write_jsonl
+from .io_utils import stream_jsonl, write_jsonl
 from .logging_config import setup_logging, get_logger
 
 
@@ -23,6 +24,34 @@ def _build_parser() -> argparse.ArgumentParser:
     common.add_argument("--config", type=str, default=None, help="Optional YAML/JSON config file")
     common.add_argument("--no_cache", action="store_true", help="Disable cache read/write for this run")
     common.add_argument("--keep_ratio", type=float, default=1.0, help="Keep ratio for long-context selection (0..1)")
+    common.add_argument(
+        "--max_chars", type=int, default=None, help="Hard cap on selected characters (overrides --keep_ratio)"
+    )
+    common.add_argument(
+        "--max_tokens", type=int, default=None, help="Hard cap on selected tokens, estimated (overrides --keep_ratio)"
+    )
+    common.add_argument(
+        "--chunker",
+        type=str,
+        choices=["fixed", "structured", "content", "sliding"],
+        default="fixed",
+        help="Chunking strategy for selection (fixed-size, section/paragraph aware, content-defined, or overlapping windows)",
+    )
+    common.add_argument(
+        "--scoring",
+        type=str,
+        choices=["keywords", "bm25"],
+        default="keywords",
+        help="Chunk scoring for selection (bm25 needs `paper2sw index build`)",
+    )
+    common.add_argument("--corpus_index", type=str, default=None, help="Corpus index for BM25 scoring")
+    common.add_argument(
+        "--hint",
+        action="append",
+        default=None,
+        metavar="TEXT[:WEIGHT]",
+        help="Extra selection keyword with optional weight (default 9); repeat for several hints",
+    )
     common.add_argument("--backend", type=str, default="semantic", help="Backend id (semantic or dummy)")
     common.add_argument("--model_id", type=str, default="paper2sw/paper2sw-diff-semantic", help="Model identifier")
     common.add_argument("--device", type=str, default="cpu", help="Device (e.g., cpu, cuda:0)")
@@ -41,12 +70,45 @@ def _build_parser() -> argparse.ArgumentParser:
 
     tui_parser = subparsers.add_parser("tui", parents=[common], help="Run the Textual TUI interface")
 
+    index_parser = subparsers.add_parser("index", help="Manage the corpus index used by BM25 scoring")
+    index_subparsers = index_parser.add_subparsers(dest="index_command", required=True)
+    index_build = index_subparsers.add_parser("build", help="Build the document-frequency index from local papers")
+    index_build.add_argument("--corpus", required=True, nargs="+", help="Files or directories of paper text")
+    index_build.add_argument("--out", type=str, default=None, help="Index path (default: ~/.cache/paper2sw/corpus.idx)")
+    index_build.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+
     subparsers.add_parser("schema", help="Print JSON schema for the prediction object")
     subparsers.add_parser("version", help="Print the version and exit")
 
     return parser
 
 
+def _parse_hints(values: list[str] | None) -> dict[str, float]:
+    """
+    Parse repeated --hint values into a hint/weight mapping.
+    
+    Args:
+        values: Raw "TEXT" or "TEXT:WEIGHT" strings
+        
+    Returns:
+        Mapping of hint to weight
+    """
+    from .selector import DEFAULT_HINT_WEIGHT
+
+    hints: dict[str, float] = {}
+    for value in values or []:
+        text, sep, weight = value.rpartition(":")
+        try:
+            parsed = float(weight) if sep else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            hints[value] = DEFAULT_HINT_WEIGHT
+        else:
+            hints[text] = int(parsed) if parsed.is_integer() else parsed
+    return hints
+
+
 def _make_predictor(args: argparse.Namespace) -> Predictor:
     """
     Create a predictor from command line arguments.
@@ -63,6 +125,14 @@ def _make_predictor(args: argparse.Namespace) -> Predictor:
             cfg = load_config(args.config)
             cfg.setdefault("enable_cache", not args.no_cache)
             cfg.setdefault("selection_keep_ratio", float(args.keep_ratio))
+            cfg.setdefault("selection_chunker", str(args.chunker))
+            cfg.setdefault("selection_scoring", str(args.scoring))
+            if args.max_chars is not None:
+                cfg.setdefault("selection_max_chars", int(args.max_chars))
+            if args.max_tokens is not None:
+                cfg.setdefault("selection_max_tokens", int(args.max_tokens))
+            if args.corpus_index:
+                cfg.setdefault("corpus_index_path", str(args.corpus_index))
             cfg.setdefault("backend", str(args.backend))
             cfg.setdefault("model_id", str(args.model_id))
             cfg.setdefault("device", str(args.device))
@@ -79,6 +149,11 @@ def _make_predictor(args: argparse.Namespace) -> Predictor:
                 selection_keep_ratio=float(args.keep_ratio),
                 backend=str(args.backend),
                 cache_dir=str(args.cache_dir) if args.cache_dir else None,
+                selection_chunker=str(args.chunker),
+                selection_scoring=str(args.scoring),
+                corpus_index_path=str(args.corpus_index) if args.corpus_index else None,
+                selection_max_chars=args.max_chars,
+                selection_max_tokens=args.max_tokens,
             )
         return predictor
     except Exception as e:
@@ -86,39 +161,41 @@ def _make_predictor(args: argparse.Namespace) -> Predictor:
         raise
 
 
-def _write_output(preds: list[SuperWeightPrediction], path: str | Path, fmt: str) -> None:
+def _write_output(preds: Iterable[SuperWeightPrediction], path: str | Path, fmt: str) -> int:
     """
-    Write predictions to output.
+    Write predictions to output as they are produced.
     
     Args:
-        preds: List of predictions
+        preds: Predictions, e.g. a list or ``Predictor.iter_predict(...)``
         path: Output path or "-" for stdout
         fmt: Output format (jsonl or csv)
+        
+    Returns:
+        Number of predictions written
     """
     logger = get_logger()
     try:
         if path == "-":
             if fmt == "jsonl":
-                for p in preds:
-                    sys.stdout.write(json.dumps(p.to_dict()) + "\n")
-            else:
-                # write a CSV header + rows to stdout
-                from csv import DictWriter
-
-                fieldnames = ["model_family", "layer", "row", "col", "value"]
-                writer = DictWriter(sys.stdout, fieldnames=fieldnames)
-                writer.writeheader()
-                for p in preds:
-                    writer.writerow(p.to_dict())
-            return
+                return stream_jsonl(preds, sys.stdout)
+            # write a CSV header + rows to stdout
+            from csv import DictWriter
+
+            fieldnames = ["model_family", "layer", "row", "col", "value"]
+            writer = DictWriter(sys.stdout, fieldnames=fieldnames)
+            writer.writeheader()
+            count = 0
+            for p in preds:
+                writer.writerow(p.to_dict())
+                count += 1
+            return count
 
         # file outputs
         if fmt == "jsonl":
-            write_jsonl(preds, path)
-        else:
-            from .io_utils import write_csv
+            return write_jsonl(preds, path)
+        from .io_utils import write_csv
 
-            write_csv(preds, path)
+        return write_csv(preds, path)
     except Exception as e:
         logger.error(f"Failed to write output to {path}: {e}")
         raise
@@ -155,14 +232,15 @@ def main(argv: list[str] | None = None) -> int:
         if args.command == "predict":
             logger.info(f"Predicting super-weights for {args.paper}")
             predictor = _make_predictor(args)
-            predictions = predictor.predict(
+            predictions = predictor.iter_predict(
                 paper=args.paper,
                 top_k=int(args.top_k),
                 seed=args.seed,
                 use_cache=None if not args.no_cache else False,
+                query_hints=_parse_hints(args.hint),
             )
-            _write_output(predictions, args.out, args.format)
-            logger.info(f"Successfully wrote {len(predictions)} predictions to {args.out}")
+            count = _write_output(predictions, args.out, args.format)
+            logger.info(f"Successfully wrote {count} predictions to {args.out}")
             return 0
 
         if args.command == "batch":
@@ -170,12 +248,19 @@ def main(argv: list[str] | None = None) -> int:
             predictor = _make_predictor(args)
             from pathlib import Path
 
+            query_hints = _parse_hints(args.hint)
             out_dir = Path(args.out_dir)
             out_dir.mkdir(parents=True, exist_ok=True)
             for i, p in enumerate(args.papers):
                 try:
                     logger.info(f"Processing paper {i+1}/{len(args.papers)}: {p}")
-                    preds = predictor.predict(paper=p, top_k=int(args.top_k), seed=args.seed, use_cache=None if not args.no_cache else False)
+                    preds = predictor.predict(
+                        paper=p,
+                        top_k=int(args.top_k),
+                        seed=args.seed,
+                        use_cache=None if not args.no_cache else False,
+                        query_hints=query_hints,
+                    )
                     safe_name = (
                         p.replace("/", "_").replace(":", "_").replace("?", "_").replace("&", "_").replace("=", "_")
                     )
@@ -190,6 +275,13 @@ def main(argv: list[str] | None = None) -> int:
                         raise
             return 0
 
+        if args.command == "index":
+            from .corpus_index import build_corpus_index
+
+            index = build_corpus_index(args.corpus, args.out)
+            print(f"Indexed {index.num_docs} documents ({index.num_terms} terms) into {index.path}")
+            return 0
+
         if args.command == "tui":
             try:
                 from .tui import Paper2SWTUI
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import re
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Fields parsed from structured configs; all but intermediate_size match analyzer parameter names
+CONFIG_FIELDS = ("layers", "hidden_size", "intermediate_size", "attention_heads", "mlp_expansion")
+
+# Normalized header/key (lowercase letters and digits only) -> field
+_KEY_ALIASES: Dict[str, str] = {
+    **dict.fromkeys(
+        ["layers", "layer", "nlayers", "nlayer", "numlayers", "numhiddenlayers", "numberoflayers",
+         "depth", "blocks", "nblocks", "transformerlayers", "l"],
+        "layers",
+    ),
+    **dict.fromkeys(
+        ["hiddensize", "hidden", "hiddendim", "hiddendimension", "dmodel", "modeldim", "modeldimension",
+         "dim", "nembd", "embeddingsize", "embeddim", "width", "d"],
+        "hidden_size",
+    ),
+    **dict.fromkeys(
+        ["intermediatesize", "intermediate", "dff", "dffn", "ffndim", "ffnsize", "ffnhiddensize",
+         "mlphiddensize", "mlpdim", "feedforwarddim", "ffhiddensize"],
+        "intermediate_size",
+    ),
+    **dict.fromkeys(
+        ["heads", "nheads", "nhead", "numheads", "numattentionheads", "attentionheads", "numberofheads", "h"],
+        "attention_heads",
+    ),
+    **dict.fromkeys(["mlpratio", "mlpexpansion", "expansionfactor", "expansionratio"], "mlp_expansion"),
+}
+# Every ending of an alias, to reject most "word: number" pairs after one set lookup
+_ALIAS_ENDINGS = {alias[i:] for alias in _KEY_ALIASES for i in range(len(alias))}
+
+_TABULAR_BEGIN = re.compile(r"\\begin\{tabular\*?\}")
+_TABULAR_END = re.compile(r"\\end\{tabular\*?\}")
+# Two or more lines starting with "|"; searched in "\n" + text so the newline is a literal prefix
+_MARKDOWN_TABLE = re.compile(r"\n([ \t]*\|[^\n]*(?:\n[ \t]*\|[^\n]*)+)")
+_MARKDOWN_RULE = re.compile(r"[\s|:\-]+")
+# A config assignment: "hidden_size: 4096", "\"num_hidden_layers\": 32", "n_layers = 24"
+_ASSIGNMENT = re.compile(r"[:=][ \t]*[\"']?(\d+)(?![\d.])")
+_LATEX_RULE = re.compile(r"\\(?:hline|toprule|midrule|bottomrule|(?:c|cmid)rule(?:\([^)]*\))?\{[^}]*\})")
+_LATEX_MULTICOLUMN = re.compile(r"\\multicolumn\{\d+\}\{[^}]*\}\{([^}]*)\}")
+_LATEX_COMMAND = re.compile(r"\\[A-Za-z]+\*?")
+_CELL_INT = re.compile(r"\s*(\d{1,3}(?:,\d{3})+|\d+)(?![\d.]|\s*[A-Za-z])")
+
+
+def _expired(deadline: float | None) -> bool:
+    """Whether a ``time.monotonic()`` deadline has passed (never, for None)."""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _normalize_key(cell: str) -> str:
+    """Reduce a header cell or config key to lowercase letters and digits ("$n_{\\text{layers}}$" -> "nlayers")."""
+    cell = re.sub(r"\([^)]*\)", "", _LATEX_COMMAND.sub("", cell))
+    return re.sub(r"[^a-z0-9]", "", cell.lower())
+
+
+def _cell_int(cell: str) -> Optional[int]:
+    """Parse a cell holding a single integer ("4096", "4,096", "\\textbf{32}"), else None."""
+    cell = _LATEX_COMMAND.sub("", cell.replace("{,}", ",")).replace("{", "").replace("}", "").replace("$", "")
+    match = _CELL_INT.match(cell)
+    if not match or cell[match.end():].strip(" ,"):
+        return None
+    return int(match.group(1).replace(",", ""))
+
+
+def _latex_rows(body: str) -> List[List[str]]:
+    """Split a tabular body (after ``\\begin{tabular}``) into rows of cells."""
+    # Skip the column spec, which may nest braces ("{@{}lcc@{}}")
+    if body.lstrip().startswith("{"):
+        depth = 0
+        for i, ch in enumerate(body):
+            depth += {"{": 1, "}": -1}.get(ch, 0)
+            if depth == 0 and ch == "}":
+                body = body[i + 1:]
+                break
+    body = _LATEX_MULTICOLUMN.sub(r"\1", _LATEX_RULE.sub("", body))
+    rows = []
+    for line in re.split(r"\\\\", body):
+        cells = [cell.strip() for cell in re.split(r"(?<!\\)&", line)]
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+def _markdown_rows(block: str, deadline: float | None = None) -> List[List[str]]:
+    """Split a Markdown pipe table into rows of cells, dropping the header rule (and rows after the deadline)."""
+    rows = []
+    for line in block.splitlines():
+        if _expired(deadline):
+            break
+        line = line.strip()
+        if _MARKDOWN_RULE.fullmatch(line):
+            continue
+        rows.append([cell.strip() for cell in line.strip("|").split("|")])
+    return rows
+
+
+def _cells_to_fields(fields: List[Optional[str]], cells: List[str]) -> Dict[str, int]:
+    """Pair field names with parsed cell values, skipping unmapped fields and non-integer cells."""
+    values: Dict[str, int] = {}
+    for field, cell in zip(fields, cells):
+        value = _cell_int(cell) if field else None
+        if value is not None:
+            values.setdefault(field, value)
+    return values
+
+
+def _table_fields(rows: List[List[str]], prefer: str, deadline: float | None = None) -> Dict[str, int]:
+    """
+    Read config fields from a table in either orientation.
+
+    Args:
+        rows: Table rows of cells, header first
+        prefer: Normalized model variant (e.g. "13b") used to pick a row or column when the
+            table lists several models; otherwise the first one with values is used
+        deadline: ``time.monotonic()`` value after which the table is given up on
+
+    Returns:
+        Field -> value for the fields the table gives
+    """
+    if len(rows) < 2:
+        return {}
+    header_fields = [_KEY_ALIASES.get(_normalize_key(cell)) for cell in rows[0]]
+    row_fields = []
+    for row in rows:
+        if _expired(deadline):
+            return {}
+        row_fields.append(_KEY_ALIASES.get(_normalize_key(row[0])))
+
+    if sum(map(bool, header_fields)) >= sum(map(bool, row_fields)):
+        # One row per model, one column per field
+        candidates = [row for row in rows[1:] if prefer and prefer in _normalize_key(row[0])] or rows[1:]
+        for row in candidates:
+            fields = _cells_to_fields(header_fields, row)
+            if fields:
+                return fields
+        return {}
+
+    # One row per field: "Parameter | Value", or one column per model
+    columns = range(1, max(len(row) for row in rows))
+    preferred = [i for i in columns if prefer and prefer in _normalize_key(rows[0][i] if i < len(rows[0]) else "")]
+    for i in preferred or columns:
+        fields = _cells_to_fields(row_fields, [row[i] if i < len(row) else "" for row in rows])
+        if fields:
+            return fields
+    return {}
+
+
+def _tabular_bodies(text: str) -> Iterator[str]:
+    """
+    Yield the body of every LaTeX tabular, in text order.
+
+    Pairs each ``\\begin{tabular}`` with the next ``\\end{tabular}`` like a lazy
+    ``begin(.*?)end`` regex would, but stops at the first unclosed one instead of rescanning
+    the rest of the text from every later ``\\begin``, so it runs in linear time.
+    """
+    pos = 0
+    while True:
+        begin = _TABULAR_BEGIN.search(text, pos)
+        if begin is None:
+            return
+        end = _TABULAR_END.search(text, begin.end())
+        if end is None:
+            return
+        yield text[begin.end():end.start()]
+        pos = end.end()
+
+
+def _assignments(text: str) -> Iterator[tuple[str, int]]:
+    """Yield (field, value) for config-style assignments of known keys, in text order."""
+    for match in _ASSIGNMENT.finditer(text):
+        start = match.start()
+        window = max(0, start - 60)
+        line_start = text.rfind("\n", window, start) + 1 or window
+        words = text[line_start:start].split()[-4:]
+        if not words or re.sub(r"[^a-z0-9]", "", words[-1].lower()) not in _ALIAS_ENDINGS:
+            continue
+        words = [re.sub(r"[^a-z0-9]", "", word.lower()) for word in words]
+        # "We use a hidden size: 4096" -> try "usehiddensize", ..., "hiddensize", then "size"
+        for n in range(len(words), 0, -1):
+            key = "".join(words[-n:])
+            field = _KEY_ALIASES.get(key) if len(key) > 1 else None
+            if field:
+                yield field, int(match.group(1))
+                break
+
+
+def extract_config_fields(text: str, model_variant: str = "", deadline: float | None = None) -> Dict[str, int]:
+    """
+    Parse architecture settings from LaTeX tabulars, Markdown tables and config blocks.
+
+    Sources are read in that order and the first value found for a field wins. When
+    ``intermediate_size`` is an exact multiple of ``hidden_size``, the ratio fills in
+    ``mlp_expansion``.
+
+    Args:
+        text: Paper text
+        model_variant: Size of the detected model (e.g. "13B"), to pick its row in tables
+            that compare several models
+        deadline: ``time.monotonic()`` value after which reading stops, keeping the fields
+            found so far
+
+    Returns:
+        Field name (see ``CONFIG_FIELDS``) -> value; values are not range checked
+    """
+    prefer = _normalize_key(model_variant)
+    fields: Dict[str, int] = {}
+    if "\\begin{tabular" in text:
+        for body in _tabular_bodies(text):
+            if _expired(deadline):
+                break
+            for field, value in _table_fields(_latex_rows(body), prefer, deadline).items():
+                fields.setdefault(field, value)
+    if "|" in text:
+        for match in _MARKDOWN_TABLE.finditer("\n" + text):
+            if _expired(deadline):
+                break
+            for field, value in _table_fields(_markdown_rows(match.group(1), deadline), prefer, deadline).items():
+                fields.setdefault(field, value)
+    for field, value in _assignments(text):
+        if _expired(deadline):
+            break
+        fields.setdefault(field, value)
+
+    hidden, intermediate = fields.get("hidden_size"), fields.get("intermediate_size")
+    if "mlp_expansion" not in fields and hidden and intermediate and intermediate % hidden == 0:
+        fields["mlp_expansion"] = intermediate // hidden
+    return fields
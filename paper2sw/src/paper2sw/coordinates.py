@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Set, Tuple
+
+from .selector import _numpy
+
+# Counter-based generator: draw i is the SplitMix64 finalizer of key + i * _GAMMA (mod 2**64).
+# Python integers and NumPy uint64 arrays compute it identically, so both engines give the same
+# coordinates and values, and any draw can be computed without the ones before it
+_MASK = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+# Values are uniform in [-_VALUE_RANGE, _VALUE_RANGE)
+_VALUE_RANGE = 20.0
+
+# Coordinates per block yielded by ``iter_coordinates``
+BLOCK_SIZE = 65536
+
+
+def _mix(key: int, i: int) -> int:
+    """Draw ``i`` of the stream ``key`` (scalar)."""
+    z = (key + i * _GAMMA) & _MASK
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK
+    return z ^ (z >> 31)
+
+
+def _mix_array(np, key: int, start: int, count: int):
+    """Draws ``start`` to ``start + count`` of the stream ``key`` (NumPy uint64 array)."""
+    z = np.arange(start, start + count, dtype=np.uint64) * np.uint64(_GAMMA) + np.uint64(key)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+def _unit(bits: int) -> float:
+    """A 64-bit draw as a float in [0, 1), from its top 53 bits."""
+    return (bits >> 11) * 2.0 ** -53
+
+
+def _excluded_indices(shape: Tuple[int, int, int], exclude: Iterable[Tuple[int, int, int]]) -> Set[int]:
+    """Flat indices of the (layer, row, col) coordinates to skip that fall inside the space."""
+    num_layers, num_rows, num_cols = shape
+    return {
+        (layer * num_rows + row) * num_cols + col
+        for layer, row, col in exclude
+        if 0 <= layer < num_layers and 0 <= row < num_rows and 0 <= col < num_cols
+    }
+
+
+def sample_coordinates(
+    coordinate_key: int,
+    value_key: int,
+    shape: Tuple[int, int, int],
+    k: int,
+    use_numpy: bool | None = None,
+    exclude: Iterable[Tuple[int, int, int]] = (),
+) -> Tuple[List[int], List[int], List[int], List[float]]:
+    """
+    Draw k distinct (layer, row, col) coordinates without replacement, with a value each.
+
+    Coordinates are taken in draw order, skipping repeats and excluded coordinates, from a
+    counter-based stream of flat indices into the (layers x rows x cols) space; values come
+    from a second stream. The NumPy engine draws in blocks and deduplicates with
+    ``np.unique``; its output is identical to the scalar engine's for every k.
+
+    Args:
+        coordinate_key: 64-bit key of the coordinate stream
+        value_key: 64-bit key of the value stream
+        shape: (layers, rows, cols)
+        k: Number of coordinates (capped at the number of coordinates not excluded)
+        use_numpy: Force (True) or disable (False) the NumPy engine; None uses it if installed
+        exclude: (layer, row, col) coordinates already taken, e.g. by semantic candidates
+
+    Returns:
+        (layers, rows, cols, values) columns as lists
+
+    Raises:
+        ImportError: If use_numpy is True and NumPy is not installed
+    """
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True")
+    num_layers, num_rows, num_cols = shape
+    space = num_layers * num_rows * num_cols
+    excluded = _excluded_indices(shape, exclude)
+    k = min(k, space - len(excluded))
+    if k <= 0:
+        return [], [], [], []
+    if np is not None and space < 1 << 63:
+        return _sample_numpy(np, coordinate_key, value_key, shape, k, excluded)
+
+    flat: List[int] = []
+    seen = set(excluded)
+    i = 0
+    while len(flat) < k:
+        index = _mix(coordinate_key, i) % space
+        i += 1
+        if index not in seen:
+            seen.add(index)
+            flat.append(index)
+    plane = num_rows * num_cols
+    values = [-_VALUE_RANGE + 2 * _VALUE_RANGE * _unit(_mix(value_key, j)) for j in range(k)]
+    return (
+        [index // plane for index in flat],
+        [index // num_cols % num_rows for index in flat],
+        [index % num_cols for index in flat],
+        values,
+    )
+
+
+def _sample_numpy(
+    np, coordinate_key: int, value_key: int, shape: Tuple[int, int, int], k: int, excluded: Set[int] = frozenset()
+):
+    """NumPy engine of ``sample_coordinates``."""
+    num_layers, num_rows, num_cols = shape
+    space = np.uint64(num_layers * num_rows * num_cols)
+    skip = np.array(sorted(excluded), dtype=np.uint64)
+    draws = np.empty(0, dtype=np.uint64)
+    while True:
+        # Indices in order of first appearance; repeats are rare unless k nears the space size
+        _, first = np.unique(draws, return_index=True)
+        if len(skip):
+            first = first[~np.isin(draws[first], skip)]
+        if len(first) >= k:
+            break
+        extra = 2 * (k - len(first)) + len(skip) + 64
+        draws = np.concatenate([draws, _mix_array(np, coordinate_key, len(draws), extra) % space])
+    first.sort()
+    flat = draws[first[:k]].astype(np.int64)
+    plane = num_rows * num_cols
+    units = (_mix_array(np, value_key, 0, k) >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+    values = -_VALUE_RANGE + 2 * _VALUE_RANGE * units
+    return (
+        (flat // plane).tolist(),
+        (flat // num_cols % num_rows).tolist(),
+        (flat % num_cols).tolist(),
+        values.tolist(),
+    )
+
+
+def iter_coordinates(
+    coordinate_key: int,
+    value_key: int,
+    shape: Tuple[int, int, int],
+    k: int,
+    block_size: int = BLOCK_SIZE,
+    use_numpy: bool | None = None,
+    exclude: Iterable[Tuple[int, int, int]] = (),
+) -> Iterator[Tuple[List[int], List[int], List[int], List[float]]]:
+    """
+    Draw the coordinates of ``sample_coordinates`` in blocks of at most ``block_size``.
+
+    The blocks concatenate to exactly what ``sample_coordinates`` returns. Only one block of
+    output is held at a time; the coordinates drawn so far are remembered to skip repeats
+    (as a sorted uint64 array with NumPy, 8 bytes each).
+
+    Args:
+        coordinate_key: 64-bit key of the coordinate stream
+        value_key: 64-bit key of the value stream
+        shape: (layers, rows, cols)
+        k: Number of coordinates (capped at the number of coordinates not excluded)
+        block_size: Largest number of coordinates per block
+        use_numpy: Force (True) or disable (False) the NumPy engine; None uses it if installed
+        exclude: (layer, row, col) coordinates already taken (see ``sample_coordinates``)
+
+    Yields:
+        (layers, rows, cols, values) columns as lists
+
+    Raises:
+        ValueError: If block_size is not positive
+        ImportError: If use_numpy is True and NumPy is not installed
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True")
+    num_layers, num_rows, num_cols = shape
+    space = num_layers * num_rows * num_cols
+    excluded = _excluded_indices(shape, exclude)
+    k = min(k, space - len(excluded))
+    if np is not None and space < 1 << 63:
+        yield from _iter_numpy(np, coordinate_key, value_key, shape, k, block_size, excluded)
+        return
+
+    plane = num_rows * num_cols
+    seen = set(excluded)
+    i = done = 0
+    while done < k:
+        flat: List[int] = []
+        while len(flat) < min(block_size, k - done):
+            index = _mix(coordinate_key, i) % space
+            i += 1
+            if index not in seen:
+                seen.add(index)
+                flat.append(index)
+        values = [-_VALUE_RANGE + 2 * _VALUE_RANGE * _unit(_mix(value_key, j)) for j in range(done, done + len(flat))]
+        done += len(flat)
+        yield (
+            [index // plane for index in flat],
+            [index // num_cols % num_rows for index in flat],
+            [index % num_cols for index in flat],
+            values,
+        )
+
+
+def _iter_numpy(
+    np,
+    coordinate_key: int,
+    value_key: int,
+    shape: Tuple[int, int, int],
+    k: int,
+    block_size: int,
+    excluded: Set[int] = frozenset(),
+):
+    """NumPy engine of ``iter_coordinates``."""
+    num_layers, num_rows, num_cols = shape
+    space = np.uint64(num_layers * num_rows * num_cols)
+    plane = num_rows * num_cols
+    seen = np.array(sorted(excluded), dtype=np.uint64)
+    count = min(block_size, 2 * k + 64)
+    i = done = 0
+    while done < k:
+        draws = _mix_array(np, coordinate_key, i, count) % space
+        i += len(draws)
+        # First appearance within the block, then drop what earlier blocks drew
+        _, first = np.unique(draws, return_index=True)
+        first.sort()
+        fresh = draws[first]
+        pos = np.searchsorted(seen, fresh)
+        repeat = pos < len(seen)
+        repeat[repeat] = seen[pos[repeat]] == fresh[repeat]
+        fresh = fresh[~repeat][: k - done]
+        if not len(fresh):
+            continue
+        ordered = np.sort(fresh)
+        seen = np.insert(seen, np.searchsorted(seen, ordered), ordered)
+        flat = fresh.astype(np.int64)
+        units = (_mix_array(np, value_key, done, len(flat)) >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+        done += len(flat)
+        yield (
+            (flat // plane).tolist(),
+            (flat // num_cols % num_rows).tolist(),
+            (flat % num_cols).tolist(),
+            (-_VALUE_RANGE + 2 * _VALUE_RANGE * units).tolist(),
+        )
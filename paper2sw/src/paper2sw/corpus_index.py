@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping
+
+from .logging_config import get_logger
+
+
+_MAGIC = b"P2SWIDX1"
+# num_docs, num_terms, average tokens per fixed-size (2000-char) chunk
+_HEADER = struct.Struct("<IId")
+_HASH = struct.Struct("<Q")
+_DF = struct.Struct("<I")
+_DATA_OFFSET = len(_MAGIC) + _HEADER.size
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_CORPUS_SUFFIXES = {".txt", ".md", ".tex", ".html", ".htm"}
+
+
+def default_index_path() -> Path:
+    """Return the default location of the corpus index."""
+    return Path(os.path.expanduser("~/.cache/paper2sw")) / "corpus.idx"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of terms
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class CorpusIndex:
+    """
+    Read-only document-frequency index over a local paper corpus.
+
+    The file holds a sorted table of 64-bit term hashes followed by their document
+    frequencies. It is memory-mapped, so opening it is cheap and a term lookup is a binary
+    search over the mapped pages rather than a recount of the corpus.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Open an index file.
+
+        Args:
+            path: Path to an index written by ``build_corpus_index``
+
+        Raises:
+            FileNotFoundError: If the index does not exist
+            ValueError: If the file is not a valid index
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Corpus index not found: {self.path} (run `paper2sw index build`)")
+        with self.path.open("rb") as handle:
+            self._mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"Not a paper2sw corpus index: {self.path}")
+        self.num_docs, self.num_terms, self.avg_chunk_len = _HEADER.unpack_from(self._mm, len(_MAGIC))
+        self._df_offset = _DATA_OFFSET + self.num_terms * _HASH.size
+        self._idf_cache: Dict[str, float] = {}
+
+    def doc_freq(self, term: str) -> int:
+        """
+        Return the number of corpus documents containing a term.
+
+        Args:
+            term: Lowercase term
+
+        Returns:
+            Document frequency (0 for unseen terms)
+        """
+        target = _term_hash(term)
+        lo, hi = 0, self.num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = _HASH.unpack_from(self._mm, _DATA_OFFSET + mid * _HASH.size)[0]
+            if value < target:
+                lo = mid + 1
+            elif value > target:
+                hi = mid
+            else:
+                return _DF.unpack_from(self._mm, self._df_offset + mid * _DF.size)[0]
+        return 0
+
+    def idf(self, term: str) -> float:
+        """
+        Return the BM25 inverse document frequency of a term.
+
+        Args:
+            term: Lowercase term
+
+        Returns:
+            Non-negative IDF weight
+        """
+        cached = self._idf_cache.get(term)
+        if cached is None:
+            df = self.doc_freq(term)
+            cached = math.log(1.0 + (self.num_docs - df + 0.5) / (df + 0.5))
+            self._idf_cache[term] = cached
+        return cached
+
+
+class BM25Scorer:
+    """Scores chunks with BM25 against a weighted query using corpus document frequencies."""
+
+    def __init__(
+        self,
+        index: CorpusIndex,
+        query_weights: Mapping[str, float],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        """
+        Build a scorer for a query.
+
+        Args:
+            index: Corpus statistics
+            query_weights: Mapping of query phrase to weight; phrases are tokenized and each
+                term keeps the largest weight of any phrase containing it
+            k1: Term-frequency saturation
+            b: Length normalization strength
+        """
+        self.index = index
+        self.k1 = k1
+        self.b = b
+        self.avg_len = index.avg_chunk_len or 1.0
+        terms: Dict[str, float] = {}
+        for phrase, weight in query_weights.items():
+            for term in tokenize(phrase):
+                terms[term] = max(terms.get(term, 0.0), float(weight))
+        self.term_weights = {term: weight * index.idf(term) for term, weight in terms.items()}
+        # Identifies the query and corpus statistics in persistent memos of chunk scores
+        state = (str(index.path), index.num_docs, index.num_terms, self.avg_len, k1, b, sorted(self.term_weights.items()))
+        self.signature = hashlib.blake2b(repr(state).encode("utf-8"), digest_size=16).hexdigest()
+
+    def score(self, chunk: str) -> float:
+        """
+        Score a chunk of text.
+
+        Args:
+            chunk: Text to score
+
+        Returns:
+            BM25 score (0 for non-string input)
+        """
+        if not isinstance(chunk, str):
+            return 0
+        tokens = tokenize(chunk)
+        if not tokens:
+            return 0.0
+        tf = Counter(tokens)
+        norm = self.k1 * (1.0 - self.b + self.b * len(tokens) / self.avg_len)
+        total = 0.0
+        for term, weight in self.term_weights.items():
+            freq = tf.get(term)
+            if freq:
+                total += weight * freq * (self.k1 + 1.0) / (freq + norm)
+        return total
+
+
+def _iter_corpus_files(paths: Iterable[str | Path]) -> Iterator[Path]:
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.is_file() and child.suffix.lower() in _CORPUS_SUFFIXES:
+                    yield child
+        elif path.is_file():
+            yield path
+        else:
+            raise FileNotFoundError(f"Corpus path does not exist: {path}")
+
+
+def build_corpus_index(paths: Iterable[str | Path], out_path: str | Path | None = None) -> CorpusIndex:
+    """
+    Build a document-frequency index from local papers and write it to disk.
+
+    Args:
+        paths: Files or directories (searched recursively for .txt/.md/.tex/.html)
+        out_path: Destination file (default: ``default_index_path()``)
+
+    Returns:
+        The freshly written index, opened for reading
+
+    Raises:
+        ValueError: If no documents were found
+    """
+    logger = get_logger()
+    out = Path(out_path) if out_path else default_index_path()
+
+    doc_freq: Counter = Counter()
+    num_docs = 0
+    num_chunks = 0
+    num_tokens = 0
+    for file_path in _iter_corpus_files(paths):
+        text = file_path.read_text(encoding="utf-8", errors="ignore")
+        tokens = tokenize(text)
+        if not tokens:
+            continue
+        num_docs += 1
+        num_tokens += len(tokens)
+        num_chunks += max(1, math.ceil(len(text) / 2000))
+        doc_freq.update(set(tokens))
+
+    if num_docs == 0:
+        raise ValueError("No documents found to index")
+
+    hashed: Dict[int, int] = {}
+    for term, df in doc_freq.items():
+        key = _term_hash(term)
+        hashed[key] = max(hashed.get(key, 0), df)
+    keys = sorted(hashed)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    with tmp.open("wb") as handle:
+        handle.write(_MAGIC)
+        handle.write(_HEADER.pack(num_docs, len(keys), num_tokens / num_chunks))
+        handle.write(struct.pack(f"<{len(keys)}Q", *keys))
+        handle.write(struct.pack(f"<{len(keys)}I", *(hashed[k] for k in keys)))
+    os.replace(tmp, out)
+
+    logger.info(f"Indexed {num_docs} documents ({len(keys)} terms) into {out}")
+    return CorpusIndex(out)
+
+
+@lru_cache(maxsize=4)
+def _open_index(path: str) -> CorpusIndex:
+    return CorpusIndex(path)
+
+
+def load_corpus_index(path: str | Path | None = None) -> CorpusIndex:
+    """
+    Open a corpus index, sharing one memory map per path within the process.
+
+    Args:
+        path: Index file (default: ``default_index_path()``)
+
+    Returns:
+        CorpusIndex instance
+    """
+    return _open_index(str(Path(path) if path else default_index_path()))
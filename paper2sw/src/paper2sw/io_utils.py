@@ -4,7 +4,7 @@ import csv
 import json
 import os
 from pathlib import Path
-from typing import Iterable, Dict, Any, List, Optional
+from typing import Iterable, Dict, Any, List, Optional, TextIO
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
@@ -39,23 +39,43 @@ def read_text_from_source(source: str | Path, timeout_seconds: int = 15) -> str:
     )
 
 
+# Rows written by stream_jsonl between flushes
+FLUSH_EVERY = 4096
+
+
+def stream_jsonl(
+    predictions: Iterable[SuperWeightPrediction],
+    handle: TextIO,
+    metadata: Optional[Dict[str, Any]] = None,
+    flush_every: int = FLUSH_EVERY,
+) -> int:
+    """Write predictions to an open handle as they are produced, flushing every ``flush_every`` rows; returns the row count."""
+    count = 0
+    for prediction in predictions:
+        obj = prediction.to_dict()
+        if metadata:
+            obj.update(metadata)
+        handle.write(json.dumps(obj, ensure_ascii=False))
+        handle.write("\n")
+        count += 1
+        if count % flush_every == 0:
+            handle.flush()
+    handle.flush()
+    return count
+
+
 def write_jsonl(
     predictions: Iterable[SuperWeightPrediction],
     path: str | Path,
     metadata: Optional[Dict[str, Any]] = None,
-) -> None:
+) -> int:
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as handle:
-        for prediction in predictions:
-            obj = prediction.to_dict()
-            if metadata:
-                obj.update(metadata)
-            handle.write(json.dumps(obj, ensure_ascii=False))
-            handle.write("\n")
+        return stream_jsonl(predictions, handle, metadata)
 
 
-def write_csv(predictions: Iterable[SuperWeightPrediction], path: str | Path, metadata: Optional[Dict[str, Any]] = None) -> None:
+def write_csv(predictions: Iterable[SuperWeightPrediction], path: str | Path, metadata: Optional[Dict[str, Any]] = None) -> int:
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fieldnames = ["model_family", "layer", "row", "col", "value"]
@@ -66,11 +86,14 @@ def write_csv(predictions: Iterable[SuperWeightPrediction], path: str | Path, me
     with output_path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
+        count = 0
         for p in predictions:
             row = p.to_dict()
             if metadata:
                 row.update(metadata)
             writer.writerow(row)
+            count += 1
+    return count
 
 
 def read_jsonl(path: str | Path) -> List[Dict[str, Any]]:
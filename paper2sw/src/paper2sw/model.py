@@ -2,17 +2,64 @@ from __future__ import annotations
 
 import hashlib
 import random
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from .types import SuperWeightPrediction
+from .coordinates import BLOCK_SIZE, iter_coordinates, sample_coordinates
+from .types import PredictionBatch, PredictionColumns, SuperWeightPrediction
 from .logging_config import get_logger
-from .semantic_analyzer import SemanticAnalyzer
+from .model_configs import lookup_model
+from .near_duplicates import minhash
+from .semantic_analyzer import ModelArchitecture, PaperAnalysis, SemanticAnalyzer, SuperWeightCandidate
+from .text_index import TextIndex
+
+if TYPE_CHECKING:
+    from .cache import AnalysisStore, ChunkMemo
+
+# Bump when the predictions drawn from an analysis change (invalidates cached predictions)
+PREDICTION_VERSION = "3"
+
+
+def _content_key(text: str) -> str:
+    """Content hash of a paper (hex)."""
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+
+
+def _rng(text: str, seed: int | None) -> random.Random:
+    """
+    Random generator for one prediction call.
+    
+    Args:
+        text: Paper text
+        seed: Random seed, or None for an unseeded generator
+        
+    Returns:
+        A generator of its own, seeded from (seed, content hash) so that a seeded call gives
+        the same result however many calls run before or beside it
+    """
+    if seed is None:
+        return random.Random()
+    # String seeds are hashed with SHA-512, independently of PYTHONHASHSEED
+    return random.Random(f"{seed}:{_content_key(text)}")
 
 
 class SemanticDiffusionModel:
     """A semantic model that predicts super-weights based on architectural analysis of papers."""
     
-    def __init__(self, model_id: str, device: str = "cpu", precision: str = "bf16") -> None:
+    def __init__(
+        self,
+        model_id: str,
+        device: str = "cpu",
+        precision: str = "bf16",
+        chunk_memo: ChunkMemo | None = None,
+        analysis_cache_size: int = 32,
+        analysis_workers: int | None = 1,
+        analysis_early_stop: bool = False,
+        analysis_time_budget: float | None = None,
+        analysis_store: AnalysisStore | None = None,
+        near_duplicate_threshold: float | None = None,
+    ) -> None:
         """
         Initialize the semantic model.
         
@@ -20,6 +67,17 @@ class SemanticDiffusionModel:
             model_id: Identifier for the model
             device: Device to run on (cpu, cuda, etc.)
             precision: Numerical precision (bf16, fp16, fp32)
+            chunk_memo: Optional persistent memo of per-chunk analyzer features
+            analysis_cache_size: Number of analyzed papers kept in memory, keyed by content
+                hash, so repeated predictions on a paper skip analysis (0 disables)
+            analysis_workers: Processes used to analyze very long papers (None for one per CPU)
+            analysis_early_stop: Analyze sections in priority order and skip the rest once
+                the architecture is resolved
+            analysis_time_budget: Seconds allowed to analyze one paper (None for no limit)
+            analysis_store: Optional persistent store of analyses shared by every model_id,
+                precision, top_k and seed
+            near_duplicate_threshold: Reuse the stored analysis of a paper whose shingles are
+                at least this similar (estimated Jaccard, e.g. 0.8); None always analyzes
             
         Raises:
             ValueError: If parameters are invalid
@@ -35,23 +93,215 @@ class SemanticDiffusionModel:
         if not isinstance(precision, str):
             raise ValueError("precision must be a string")
             
+        if not isinstance(analysis_cache_size, int) or analysis_cache_size < 0:
+            raise ValueError("analysis_cache_size must be a non-negative integer")
+            
+        if near_duplicate_threshold is not None and (
+            isinstance(near_duplicate_threshold, bool)
+            or not isinstance(near_duplicate_threshold, (int, float))
+            or not 0.0 < near_duplicate_threshold <= 1.0
+        ):
+            raise ValueError("near_duplicate_threshold must be a number in (0, 1] or None")
+            
         self.model_id = model_id
         self.device = device
         self.precision = precision
-        self.analyzer = SemanticAnalyzer()
+        self.chunk_memo = chunk_memo
+        self.analyzer = SemanticAnalyzer(
+            workers=analysis_workers, early_stop=analysis_early_stop, time_budget=analysis_time_budget
+        )
+        self.analysis_store = analysis_store
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.analysis_cache_size = analysis_cache_size
+        self._analyses: "OrderedDict[str, PaperAnalysis]" = OrderedDict()
+        self._analyses_lock = threading.Lock()
+
+    def analyze(self, text: str, text_index: TextIndex | None = None) -> PaperAnalysis:
+        """
+        Analyze a paper once, reusing the result for repeated predictions on the same text.
+        
+        Analyses are looked up in memory, then in the analysis store (if any), then, with a
+        ``near_duplicate_threshold``, among near-duplicates of the paper in the store, and
+        only computed (and stored) when none of these has it.
+        
+        Args:
+            text: Input paper text
+            text_index: Index of the text, if the caller already built one
+            
+        Returns:
+            PaperAnalysis with the architecture and super-weight candidates
+        """
+        key = _content_key(text)
+        if self.analysis_cache_size:
+            with self._analyses_lock:
+                analysis = self._analyses.get(key)
+                if analysis is not None:
+                    self._analyses.move_to_end(key)
+                    return analysis
+                    
+        analysis = self.stored_analyses([text])[0]
+        if analysis is None:
+            analysis = self._analyze_unstored(text, text_index)
+            if analysis.architecture.budget_exceeded:
+                # A partial analysis is not reused; the next prediction gets a fresh budget
+                return analysis
+        self._remember(key, analysis)
+        return analysis
+
+    def _remember(self, key: str, analysis: PaperAnalysis) -> None:
+        """Keep an analysis in the in-memory cache, evicting the least recently used."""
+        if self.analysis_cache_size == 0:
+            return
+        with self._analyses_lock:
+            self._analyses[key] = analysis
+            self._analyses.move_to_end(key)
+            while len(self._analyses) > self.analysis_cache_size:
+                self._analyses.popitem(last=False)
+
+    def analyze_many(
+        self, texts: Sequence[str], analyses: Sequence[Optional[PaperAnalysis]] | None = None
+    ) -> List[PaperAnalysis]:
+        """
+        Analyze many papers at once, reusing cached and stored analyses like ``analyze``.
+        
+        Papers found in neither the in-memory cache nor the analysis store are analyzed
+        together with ``SemanticAnalyzer.analyze_many`` and stored with one write (with a
+        ``near_duplicate_threshold``, they go through ``analyze`` one at a time instead).
+        
+        Args:
+            texts: Paper texts
+            analyses: Analyses the caller already has (e.g. from ``stored_analyses``), None for the others
+            
+        Returns:
+            PaperAnalysis per text, in order
+        """
+        results: List[Optional[PaperAnalysis]] = list(analyses) if analyses is not None else [None] * len(texts)
+        keys = [_content_key(text) for text in texts]
+        if self.analysis_cache_size:
+            with self._analyses_lock:
+                for i, key in enumerate(keys):
+                    if results[i] is None and key in self._analyses:
+                        self._analyses.move_to_end(key)
+                        results[i] = self._analyses[key]
+                        
+        missing = [i for i, analysis in enumerate(results) if analysis is None]
+        if missing and analyses is None:
+            for i, analysis in zip(missing, self.stored_analyses([texts[i] for i in missing])):
+                results[i] = analysis
+            missing = [i for i in missing if results[i] is None]
+        if missing and self.near_duplicate_threshold is not None and self.analysis_store is not None:
+            for i in missing:
+                results[i] = self._analyze_unstored(texts[i])
+        elif missing:
+            analyzed = self.analyzer.analyze_many([texts[i] for i in missing], self.chunk_memo)
+            complete = []
+            for i, analysis in zip(missing, analyzed):
+                results[i] = analysis
+                if not analysis.architecture.budget_exceeded:
+                    complete.append((texts[i], analysis))
+            if self.analysis_store is not None and complete:
+                self.analysis_store.put_many(self.analyzer.signature(), complete)
+                
+        for key, analysis in zip(keys, results):
+            if not analysis.architecture.budget_exceeded:
+                self._remember(key, analysis)
+        return results
 
-    def predict(self, text: str, top_k: int = 5, seed: int | None = None) -> List[SuperWeightPrediction]:
+    def _analyze_unstored(self, text: str, text_index: TextIndex | None = None) -> PaperAnalysis:
+        """
+        Analyze a paper that is not in the analysis store, or reuse a near-duplicate's analysis.
+        
+        Args:
+            text: Input paper text
+            text_index: Index of the text, if the caller already built one
+            
+        Returns:
+            PaperAnalysis, stored under the paper unless it is partial
+        """
+        store, signature = self.analysis_store, self.analyzer.signature()
+        sketch = minhash(text) if store is not None and self.near_duplicate_threshold is not None else None
+        if sketch is not None:
+            match = store.find_near_duplicate(signature, text, sketch, self.near_duplicate_threshold)
+            if match is not None:
+                analysis, score = match
+                self.logger.info(f"Reusing the analysis of a near-duplicate paper (similarity {score:.2f})")
+                store.put(signature, text, analysis)
+                return analysis
+                
+        analysis = self.analyzer.analyze(text, self.chunk_memo, text_index)
+        if store is not None and not analysis.architecture.budget_exceeded:
+            store.put(signature, text, analysis)
+            if sketch is not None:
+                store.add_sketch(text, sketch)
+        return analysis
+
+    def stored_analyses(self, texts: Sequence[str]) -> List[Optional[PaperAnalysis]]:
+        """
+        Look several papers up in the analysis store at once, e.g. before predicting for a batch.
+        
+        Args:
+            texts: Paper texts
+            
+        Returns:
+            Stored analysis per text; None for papers not analyzed before (or without a store)
+        """
+        if self.analysis_store is None:
+            return [None] * len(texts)
+        return self.analysis_store.get_many(self.analyzer.signature(), texts)
+
+    def predict(
+        self,
+        text: str,
+        top_k: int = 5,
+        seed: int | None = None,
+        text_index: TextIndex | None = None,
+        analysis: PaperAnalysis | None = None,
+    ) -> List[SuperWeightPrediction]:
         """
         Generate predictions based on semantic analysis of the input text.
         
         Args:
             text: Input text to generate predictions from
             top_k: Number of predictions to generate
-            seed: Random seed for reproducibility
+            seed: Random seed for reproducibility (see ``predict_columns``)
+            text_index: Index of the text, if the caller already built one
+            analysis: Analysis of the text, if the caller already has one
             
         Returns:
             List of SuperWeightPrediction objects
             
+        Raises:
+            ValueError: If parameters are invalid
+            TypeError: If text is not a string
+        """
+        return self.predict_columns(text, top_k, seed, text_index, analysis).to_predictions()
+
+    def predict_columns(
+        self,
+        text: str,
+        top_k: int = 5,
+        seed: int | None = None,
+        text_index: TextIndex | None = None,
+        analysis: PaperAnalysis | None = None,
+        use_numpy: bool | None = None,
+    ) -> PredictionColumns:
+        """
+        Generate predictions column-wise, e.g. for a top_k of 10^5 or more.
+        
+        Args:
+            text: Input text to generate predictions from
+            top_k: Number of predictions to generate
+            seed: Random seed for reproducibility; the call draws from its own generator seeded
+                with (seed, content hash), so results do not depend on other calls or threads
+            text_index: Index of the text, if the caller already built one
+            analysis: Analysis of the text, if the caller already has one (e.g. from
+                ``stored_analyses``); otherwise the paper is analyzed (see ``analyze``)
+            use_numpy: Force (True) or disable (False) NumPy for heuristic coordinates; None
+                uses it if installed (results are identical either way)
+            
+        Returns:
+            PredictionColumns with one entry per prediction
+            
         Raises:
             ValueError: If parameters are invalid
             TypeError: If text is not a string
@@ -63,71 +313,337 @@ class SemanticDiffusionModel:
             raise TypeError("top_k must be an integer")
             
         if top_k <= 0:
-            return []
+            return PredictionColumns("Unknown-Model", [], [], [], [])
             
         if seed is not None and not isinstance(seed, int):
             raise TypeError("seed must be an integer or None")
             
-        # Set seed for reproducibility
-        if seed is not None:
-            random.seed(seed)
+        rng = _rng(text, seed)
+        architecture, candidates = self._analysis_parts(text, text_index, analysis)
+        predictions = self._columns(text, top_k, rng, architecture, candidates, use_numpy)
+        self.logger.info(f"Generated {len(predictions)} predictions")
+        return predictions
+
+    def iter_columns(
+        self,
+        text: str,
+        top_k: int = 5,
+        seed: int | None = None,
+        text_index: TextIndex | None = None,
+        analysis: PaperAnalysis | None = None,
+        use_numpy: bool | None = None,
+        block_size: int = BLOCK_SIZE,
+    ) -> Iterator[PredictionColumns]:
+        """
+        Generate predictions lazily in blocks, e.g. to write a top_k of 10^6 straight to disk.
+        
+        The paper is analyzed (and arguments checked) when this is called; the predictions are
+        drawn as the blocks are consumed, so only one block is held at a time. The semantic
+        candidates come first as one block, then heuristic coordinates in blocks of at most
+        ``block_size`` (see ``iter_coordinates``). The blocks concatenate to
+        ``predict_columns(text, top_k, seed)``.
+        
+        Args:
+            text: Input text to generate predictions from
+            top_k: Number of predictions to generate
+            seed: Random seed for reproducibility (see ``predict_columns``)
+            text_index: Index of the text, if the caller already built one
+            analysis: Analysis of the text, if the caller already has one
+            use_numpy: Force (True) or disable (False) NumPy for heuristic coordinates
+            block_size: Largest number of heuristic predictions per block
+            
+        Returns:
+            Iterator over PredictionColumns blocks (none if top_k <= 0)
+            
+        Raises:
+            ValueError: If parameters are invalid
+            TypeError: If text is not a string
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+            
+        if not isinstance(top_k, int):
+            raise TypeError("top_k must be an integer")
+            
+        if seed is not None and not isinstance(seed, int):
+            raise TypeError("seed must be an integer or None")
+            
+        if not isinstance(block_size, int) or block_size <= 0:
+            raise ValueError("block_size must be a positive integer")
+            
+        if top_k <= 0:
+            return iter(())
+            
+        rng = _rng(text, seed)
+        architecture, candidates = self._analysis_parts(text, text_index, analysis)
+        return self._iter_columns(text, top_k, rng, architecture, candidates, use_numpy, block_size)
+
+    def iter_predict(
+        self,
+        text: str,
+        top_k: int = 5,
+        seed: int | None = None,
+        text_index: TextIndex | None = None,
+        analysis: PaperAnalysis | None = None,
+        use_numpy: bool | None = None,
+        block_size: int = BLOCK_SIZE,
+    ) -> Iterator[SuperWeightPrediction]:
+        """
+        Generate the predictions of ``predict`` one at a time, holding one block in memory (see ``iter_columns``).
+        
+        Args:
+            text: Input text to generate predictions from
+            top_k: Number of predictions to generate
+            seed: Random seed for reproducibility
+            text_index: Index of the text, if the caller already built one
+            analysis: Analysis of the text, if the caller already has one
+            use_numpy: Force (True) or disable (False) NumPy for heuristic coordinates
+            block_size: Largest number of heuristic predictions drawn at a time
+            
+        Returns:
+            Iterator over SuperWeightPrediction objects
+            
+        Raises:
+            ValueError: If parameters are invalid
+            TypeError: If text is not a string
+        """
+        blocks = self.iter_columns(text, top_k, seed, text_index, analysis, use_numpy, block_size)
+        return (prediction for block in blocks for prediction in block)
+
+    def _analysis_parts(
+        self, text: str, text_index: TextIndex | None, analysis: PaperAnalysis | None
+    ) -> Tuple[ModelArchitecture | None, List[SuperWeightCandidate]]:
+        """
+        Architecture and super-weight candidates of a paper, analyzing it unless given.
+        
+        Args:
+            text: Input text
+            text_index: Index of the text, if the caller already built one
+            analysis: Analysis of the text, if the caller already has one
             
-        # Analyze the paper to extract architecture information
+        Returns:
+            (architecture, candidates); (None, []) if analysis fails
+        """
         try:
-            architecture = self.analyzer.analyze_paper(text)
-            candidates = self.analyzer.predict_superweight_candidates(text)
+            if analysis is None:
+                analysis = self.analyze(text, text_index)
+            return analysis.architecture, analysis.candidates
         except Exception as e:
             self.logger.warning(f"Failed to analyze paper semantically: {e}")
             # Fallback to basic model family inference
-            architecture = None
-            candidates = []
+            return None, []
+
+    def predict_many(
+        self,
+        texts: Sequence[str],
+        top_k: int = 5,
+        seeds: int | Sequence[int | None] | None = None,
+        analyses: Sequence[Optional[PaperAnalysis]] | None = None,
+        use_numpy: bool | None = None,
+    ) -> PredictionBatch:
+        """
+        Generate predictions for many papers at once, e.g. thousands of abstracts.
+        
+        Papers are analyzed together (see ``analyze_many``) and knowledge-base lookups are
+        shared across the batch. Paper i gets exactly ``predict(texts[i], top_k, seeds[i])``.
+        
+        Args:
+            texts: Input texts
+            top_k: Number of predictions per paper
+            seeds: One seed for every paper, or one per paper (None entries are unseeded)
+            analyses: Analyses the caller already has (e.g. from ``stored_analyses``), None for the others
+            use_numpy: Force (True) or disable (False) NumPy for heuristic coordinates
+            
+        Returns:
+            PredictionBatch with every paper's predictions in shared columns
+            
+        Raises:
+            ValueError: If parameters are invalid
+            TypeError: If a text is not a string
+        """
+        texts = list(texts)
+        if not all(isinstance(text, str) for text in texts):
+            raise TypeError("text must be a string")
+            
+        if not isinstance(top_k, int):
+            raise TypeError("top_k must be an integer")
+            
+        if seeds is None or isinstance(seeds, int):
+            seeds = [seeds] * len(texts)
+        else:
+            seeds = list(seeds)
+            if len(seeds) != len(texts):
+                raise ValueError("seeds must be an integer, None or one seed per text")
+        if not all(seed is None or isinstance(seed, int) for seed in seeds):
+            raise TypeError("seed must be an integer or None")
+            
+        if analyses is not None and len(analyses) != len(texts):
+            raise ValueError("analyses must have one entry per text")
+            
+        batch = PredictionBatch([], [0], [], [], [], [])
+        if top_k <= 0:
+            batch.model_family.extend(["Unknown-Model"] * len(texts))
+            batch.offsets.extend([0] * len(texts))
+            return batch
+            
+        try:
+            found: List[Optional[PaperAnalysis]] = list(self.analyze_many(texts, analyses))
+        except Exception as e:
+            self.logger.warning(f"Failed to analyze papers as a batch, analyzing one at a time: {e}")
+            found = list(analyses) if analyses is not None else [None] * len(texts)
             
-        predictions: List[SuperWeightPrediction] = []
+        known: Dict[str, Any] = {}
+        
+        def lookup(family: str) -> Any:
+            if family not in known:
+                known[family] = lookup_model(family)
+            return known[family]
+            
+        for text, seed, analysis in zip(texts, seeds, found):
+            rng = _rng(text, seed)
+            if analysis is None:
+                try:
+                    analysis = self.analyze(text)
+                except Exception as e:
+                    self.logger.warning(f"Failed to analyze paper semantically: {e}")
+            if analysis is not None:
+                columns = self._columns(
+                    text, top_k, rng, analysis.architecture, analysis.candidates, use_numpy, lookup
+                )
+            else:
+                columns = self._columns(text, top_k, rng, None, [], use_numpy, lookup)
+            batch.append(columns)
+            
+        self.logger.info(f"Generated {len(batch.layer)} predictions for {len(texts)} papers")
+        return batch
+
+    def _columns(
+        self,
+        text: str,
+        top_k: int,
+        rng: random.Random,
+        architecture: ModelArchitecture | None,
+        candidates: List[SuperWeightCandidate],
+        use_numpy: bool | None = None,
+        lookup: Callable[[str], Any] = lookup_model,
+    ) -> PredictionColumns:
+        """
+        Draw predictions for an analyzed paper.
         
+        Args:
+            text: Input text
+            top_k: Number of predictions to generate
+            rng: The call's generator
+            architecture: Extracted architecture (None if analysis failed)
+            candidates: Super-weight candidates, in order
+            use_numpy: Force (True) or disable (False) NumPy for heuristic coordinates
+            lookup: Knowledge-base lookup, e.g. one memoized across a batch
+            
+        Returns:
+            PredictionColumns
+        """
         # If we have semantic candidates, use them
         if candidates:
             self.logger.info(f"Using {len(candidates)} semantic candidates for predictions")
+            predictions = PredictionColumns(
+                architecture.model_family if architecture else "Unknown-Model", [], [], [], []
+            )
             
-            # Convert candidates to predictions
+            # Convert candidates to predictions, each at its own (layer, row, col)
+            taken: Set[Tuple[int, int, int]] = set()
             for i, candidate in enumerate(candidates[:top_k]):
-                # Generate plausible matrix dimensions based on model family
-                matrix_dim = self._get_matrix_dimension(architecture.model_family if architecture else "Unknown-Model")
-                
-                # Generate row/col indices with preference for likely super-weight positions
-                # Super-weights are often in specific regions of the weight matrices
-                row_index = random.randint(0, matrix_dim - 1)
-                col_index = random.randint(0, matrix_dim - 1)
+                # Use the real shape of the component's weight matrix for the model family
+                num_rows, num_cols = self._get_matrix_shape(
+                    architecture.model_family if architecture else "Unknown-Model", candidate.component_type, lookup
+                )
                 
-                # Adjust indices based on component type
-                if candidate.component_type == "mlp.down_proj":
-                    # For down_proj, super-weights often have specific patterns
-                    # This is a heuristic - in real models, they might be in certain rows/cols
-                    if random.random() < 0.7:  # 70% chance to use heuristic positions
-                        # Focus on middle ranges where super-weights are often found
-                        row_index = random.randint(matrix_dim // 4, 3 * matrix_dim // 4)
-                        col_index = random.randint(matrix_dim // 4, 3 * matrix_dim // 4)
+                # Generate row/col indices with preference for likely super-weight positions,
+                # drawing again on the rare repeat of an earlier candidate's coordinates
+                row_index, col_index = self._candidate_position(candidate, num_rows, num_cols, rng)
+                while (candidate.layer, row_index, col_index) in taken:
+                    row_index, col_index = self._candidate_position(candidate, num_rows, num_cols, rng)
+                taken.add((candidate.layer, row_index, col_index))
                 
                 # Generate value based on confidence and heuristics
                 # Super-weights typically have larger absolute values
-                base_value = random.uniform(-15.0, 15.0) * (0.5 + candidate.confidence)
+                base_value = rng.uniform(-15.0, 15.0) * (0.5 + candidate.confidence)
+                
+                predictions.layer.append(candidate.layer)
+                predictions.row.append(row_index)
+                predictions.col.append(col_index)
+                predictions.value.append(float(base_value))
                 
-                predictions.append(
-                    SuperWeightPrediction(
-                        model_family=architecture.model_family if architecture else "Unknown-Model",
-                        layer=candidate.layer,
-                        row=row_index,
-                        col=col_index,
-                        value=float(base_value),
-                    )
+            # Past the candidates (e.g. for mask generation), fill up with heuristic coordinates
+            # other than theirs
+            if top_k > len(predictions):
+                rest = self._heuristic_columns(
+                    text, top_k - len(predictions), predictions.model_family, rng, use_numpy, lookup, taken
                 )
+                predictions.layer.extend(rest.layer)
+                predictions.row.extend(rest.row)
+                predictions.col.extend(rest.col)
+                predictions.value.extend(rest.value)
         else:
             # Fallback to heuristic-based generation if semantic analysis fails
             self.logger.info("Falling back to heuristic-based generation")
-            predictions = self._generate_heuristic_predictions(text, top_k, seed)
-                
-        self.logger.info(f"Generated {len(predictions)} predictions")
+            predictions = self._heuristic_columns(
+                text, top_k, architecture.model_family if architecture else None, rng, use_numpy, lookup
+            )
         return predictions
 
+    @staticmethod
+    def _candidate_position(
+        candidate: SuperWeightCandidate, num_rows: int, num_cols: int, rng: random.Random
+    ) -> Tuple[int, int]:
+        """Draw the (row, col) of a candidate's prediction within its matrix."""
+        row_index = rng.randint(0, num_rows - 1)
+        col_index = rng.randint(0, num_cols - 1)
+        
+        # Adjust indices based on component type
+        if candidate.component_type == "mlp.down_proj":
+            # For down_proj, super-weights often have specific patterns
+            # This is a heuristic - in real models, they might be in certain rows/cols
+            if rng.random() < 0.7:  # 70% chance to use heuristic positions
+                # Focus on middle ranges where super-weights are often found
+                row_index = rng.randint(num_rows // 4, 3 * num_rows // 4)
+                col_index = rng.randint(num_cols // 4, 3 * num_cols // 4)
+        return row_index, col_index
+
+    def _iter_columns(
+        self,
+        text: str,
+        top_k: int,
+        rng: random.Random,
+        architecture: ModelArchitecture | None,
+        candidates: List[SuperWeightCandidate],
+        use_numpy: bool | None,
+        block_size: int,
+    ) -> Iterator[PredictionColumns]:
+        """
+        Draw the predictions of ``_columns`` in blocks, consuming ``rng`` in the same order.
+        
+        Args:
+            text: Input text
+            top_k: Number of predictions to generate
+            rng: The call's generator
+            architecture: Extracted architecture (None if analysis failed)
+            candidates: Super-weight candidates, in order
+            use_numpy: Force (True) or disable (False) NumPy for heuristic coordinates
+            block_size: Largest number of heuristic predictions per block
+            
+        Yields:
+            PredictionColumns blocks
+        """
+        model_family = architecture.model_family if architecture else None
+        if candidates:
+            head = self._columns(text, min(top_k, len(candidates)), rng, architecture, candidates, use_numpy)
+            yield head
+            top_k -= len(head)
+            model_family = head.model_family
+        if top_k > 0:
+            taken = set(zip(head.layer, head.row, head.col)) if candidates else ()
+            yield from self._iter_heuristic_columns(text, top_k, model_family, rng, use_numpy, block_size, taken)
+
     def _get_matrix_dimension(self, model_family: str) -> int:
         """
         Get plausible matrix dimension based on model family.
@@ -136,29 +652,36 @@ class SemanticDiffusionModel:
             model_family: Model family name
             
         Returns:
-            Matrix dimension
-        """
-        dimensions = {
-            "Llama-7B": 4096,
-            "Llama-13B": 5120,
-            "Llama-30B": 6656,
-            "Llama-65B": 8192,
-            "Mistral-7B": 4096,
-            "Mixtral-8x7B": 4096,
-            "OLMo-7B": 4096,
-            "Gemma-2B": 2048,
-            "Gemma-7B": 3072,
-            "Phi-1": 2048,
-            "Phi-2": 2560,
-            "Phi-3": 3072,
-            "GPT-2": 768,
-            "GPT-3": 12288,
-            "BERT-Base": 768,
-            "BERT-Large": 1024,
-        }
-        return dimensions.get(model_family, 4096)  # Default to 4096
-
-    def _generate_heuristic_predictions(self, text: str, top_k: int, seed: int | None = None) -> List[SuperWeightPrediction]:
+            Hidden size from the model knowledge base (4096 for unknown models)
+        """
+        config = lookup_model(model_family)
+        return config.hidden_size if config else 4096  # Default to 4096
+
+    def _get_matrix_shape(
+        self, model_family: str, component_type: str, lookup: Callable[[str], Any] = lookup_model
+    ) -> Tuple[int, int]:
+        """
+        Get the (rows, cols) shape of a component's weight matrix.
+        
+        Args:
+            model_family: Model family name
+            component_type: Component, e.g. "mlp.down_proj"
+            lookup: Knowledge-base lookup
+            
+        Returns:
+            Shape from the model knowledge base (4096 x 4096 for unknown models)
+        """
+        config = lookup(model_family)
+        return config.matrix_shape(component_type) if config else (4096, 4096)
+
+    def _generate_heuristic_predictions(
+        self,
+        text: str,
+        top_k: int,
+        seed: int | None = None,
+        model_family: str | None = None,
+        rng: random.Random | None = None,
+    ) -> List[SuperWeightPrediction]:
         """
         Generate predictions using heuristics when semantic analysis fails.
         
@@ -166,48 +689,101 @@ class SemanticDiffusionModel:
             text: Input text
             top_k: Number of predictions to generate
             seed: Random seed
+            model_family: Family found by analysis, if it got that far (otherwise inferred from text)
+            rng: Generator to draw from (by default one seeded with (seed, content hash))
             
         Returns:
             List of SuperWeightPrediction objects
         """
+        if rng is None:
+            rng = _rng(text, seed)
+        return self._heuristic_columns(text, top_k, model_family, rng).to_predictions()
+
+    def _heuristic_columns(
+        self,
+        text: str,
+        top_k: int,
+        model_family: str | None,
+        rng: random.Random,
+        use_numpy: bool | None = None,
+        lookup: Callable[[str], Any] = lookup_model,
+        exclude: Iterable[Tuple[int, int, int]] = (),
+    ) -> PredictionColumns:
+        """
+        Draw heuristic predictions at distinct coordinates in bulk (see ``sample_coordinates``).
+        
+        Args:
+            text: Input text
+            top_k: Number of predictions to generate (at most one per coordinate)
+            model_family: Family found by analysis, if it got that far (otherwise inferred from text)
+            rng: Generator the coordinate and value streams are keyed from
+            use_numpy: Force (True) or disable (False) the NumPy engine; None uses it if installed
+            lookup: Knowledge-base lookup
+            exclude: (layer, row, col) coordinates already predicted, e.g. for semantic candidates
+            
+        Returns:
+            PredictionColumns
+        """
+        model_family, shape = self._heuristic_space(text, model_family, lookup)
+        coordinate_key, value_key = rng.getrandbits(64), rng.getrandbits(64)
+        layers, rows, cols, values = sample_coordinates(coordinate_key, value_key, shape, top_k, use_numpy, exclude)
+        return PredictionColumns(model_family, layers, rows, cols, values)
+
+    def _iter_heuristic_columns(
+        self,
+        text: str,
+        top_k: int,
+        model_family: str | None,
+        rng: random.Random,
+        use_numpy: bool | None = None,
+        block_size: int = BLOCK_SIZE,
+        exclude: Iterable[Tuple[int, int, int]] = (),
+    ) -> Iterator[PredictionColumns]:
+        """
+        Draw the predictions of ``_heuristic_columns`` in blocks (see ``iter_coordinates``).
+        
+        Args:
+            text: Input text
+            top_k: Number of predictions to generate (at most one per coordinate)
+            model_family: Family found by analysis, if it got that far (otherwise inferred from text)
+            rng: Generator the coordinate and value streams are keyed from
+            use_numpy: Force (True) or disable (False) the NumPy engine; None uses it if installed
+            block_size: Largest number of predictions per block
+            exclude: (layer, row, col) coordinates already predicted (see ``_heuristic_columns``)
+            
+        Yields:
+            PredictionColumns blocks
+        """
+        model_family, shape = self._heuristic_space(text, model_family, lookup_model)
+        coordinate_key, value_key = rng.getrandbits(64), rng.getrandbits(64)
+        for layers, rows, cols, values in iter_coordinates(
+            coordinate_key, value_key, shape, top_k, block_size, use_numpy, exclude
+        ):
+            yield PredictionColumns(model_family, layers, rows, cols, values)
+
+    def _heuristic_space(
+        self, text: str, model_family: str | None, lookup: Callable[[str], Any] = lookup_model
+    ) -> Tuple[str, Tuple[int, int, int]]:
+        """
+        Model family and (layers, rows, cols) space that heuristic coordinates are drawn from.
+        
+        Args:
+            text: Input text
+            model_family: Family found by analysis, if it got that far (otherwise inferred from text)
+            lookup: Knowledge-base lookup
+            
+        Returns:
+            (model_family, shape) with the early layers' down_proj matrices
+        """
         # Infer model family using basic heuristics
-        model_family = self._infer_model_family(text)
-        matrix_dim = self._get_matrix_dimension(model_family)
+        if model_family is None:
+            model_family = self._infer_model_family(text)
+        num_rows, num_cols = self._get_matrix_shape(model_family, "mlp.down_proj", lookup)
         
         # Focus on early layers where super-weights are commonly found
-        max_layer = 12  # Heuristic: most super-weights in first 12 layers
-        
-        predictions: List[SuperWeightPrediction] = []
-        used_coords: set[tuple[int, int, int]] = set()
-        
-        for _ in range(top_k):
-            try:
-                # Try to find unique coordinates
-                for _attempt in range(10):
-                    layer_index = random.randint(0, max_layer - 1)
-                    row_index = random.randint(0, matrix_dim - 1)
-                    col_index = random.randint(0, matrix_dim - 1)
-                    if (layer_index, row_index, col_index) not in used_coords:
-                        used_coords.add((layer_index, row_index, col_index))
-                        break
-                        
-                # Super-weights typically have larger absolute values
-                raw_value = random.uniform(-20.0, 20.0)
-                
-                predictions.append(
-                    SuperWeightPrediction(
-                        model_family=model_family,
-                        layer=layer_index,
-                        row=row_index,
-                        col=col_index,
-                        value=float(raw_value),
-                    )
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to generate heuristic prediction: {e}")
-                continue
-                
-        return predictions
+        config = lookup(model_family)
+        max_layer = min(12, config.num_layers) if config else 12  # Heuristic: most super-weights in first 12 layers
+        return model_family, (max_layer, num_rows, num_cols)
 
     def _infer_model_family(self, text: str) -> str:
         """
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .logging_config import get_logger
+
+# Bundled knowledge base; one tab-separated row per model, "# version: N" in the header
+MODEL_CONFIGS_PATH = Path(__file__).with_name("model_configs.tsv")
+
+# Trie node key marking the end of a name (never a character of a normalized name)
+_END = ""
+
+
+def normalize_model_name(name: str) -> str:
+    """Normalize a model name for lookup ("LLaMA-2 13B" -> "llama213b", "OPT-1.3B" -> "opt1.3b")."""
+    return re.sub(r"[^a-z0-9.]", "", name.lower())
+
+
+@dataclass(frozen=True)
+class ModelConfig:
+    """Published architecture of one model."""
+    name: str
+    num_layers: int
+    hidden_size: int
+    intermediate_size: int
+    attention_heads: int
+
+    @property
+    def family(self) -> str:
+        """Lowercase family key, e.g. "llama" for "Llama-13B"."""
+        return self.name.split("-", 1)[0].lower()
+
+    @property
+    def variant(self) -> str:
+        """Size or version after the family, e.g. "13B" for "Llama-13B"."""
+        return self.name.split("-", 1)[1] if "-" in self.name else ""
+
+    def matrix_shape(self, component_type: str) -> Tuple[int, int]:
+        """
+        Shape (rows, cols) of a component's weight matrix.
+
+        Args:
+            component_type: e.g. "mlp.down_proj" or "attention.q_proj"
+
+        Returns:
+            (hidden_size, intermediate_size) for down_proj, (intermediate_size, hidden_size)
+            for up/gate projections and (hidden_size, hidden_size) otherwise
+        """
+        if "down" in component_type:
+            return self.hidden_size, self.intermediate_size
+        if "up" in component_type or "gate" in component_type:
+            return self.intermediate_size, self.hidden_size
+        return self.hidden_size, self.hidden_size
+
+
+class ModelKnowledgeBase:
+    """
+    Model configs indexed by a trie over normalized names.
+
+    Lookups walk the trie once, so they cost O(name length) however many models are
+    listed, and fall back to the longest listed prefix ("Falcon-40B-Instruct" finds
+    Falcon-40B) unless the rest of the name continues a number ("GPT-3" is not "GPT-35").
+    """
+
+    def __init__(self, configs: Iterable[ModelConfig], defaults: Iterable[str] = (), version: str = "0") -> None:
+        self.version = version
+        self._trie: Dict[str, Any] = {}
+        self._size = 0
+        for config in configs:
+            node = self._trie
+            for ch in normalize_model_name(config.name):
+                node = node.setdefault(ch, {})
+            self._size += _END not in node
+            node[_END] = config
+        self._defaults: Dict[str, ModelConfig] = {}
+        for name in defaults:
+            config = self.lookup(name)
+            if config is not None:
+                self._defaults[config.family] = config
+
+    def __len__(self) -> int:
+        return self._size
+
+    def lookup(self, name: str) -> Optional[ModelConfig]:
+        """
+        Find the config for a model name.
+
+        Args:
+            name: Model name in any case or punctuation, e.g. "Llama-13B" or "gpt2-xl"
+
+        Returns:
+            The exact match, else the longest listed prefix not followed by a digit, else None
+        """
+        key = normalize_model_name(name)
+        node = self._trie
+        best: Optional[ModelConfig] = None
+        for i, ch in enumerate(key):
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node and (i + 1 == len(key) or not (key[i + 1].isdigit() or key[i + 1] == ".")):
+                best = node[_END]
+        return best
+
+    def family_default(self, family: str) -> Optional[ModelConfig]:
+        """
+        Config assumed for a family when a paper does not give the size.
+
+        Args:
+            family: Family key, e.g. "llama"
+
+        Returns:
+            The family's default config, or None for unknown families
+        """
+        return self._defaults.get(family.lower())
+
+
+def _parse_knowledge_base(lines: Iterable[str]) -> ModelKnowledgeBase:
+    """Build a knowledge base from the lines of a model configs file."""
+    configs: List[ModelConfig] = []
+    defaults: List[str] = []
+    version = "0"
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.startswith("#"):
+            match = re.match(r"#\s*version:\s*(\S+)", line)
+            if match:
+                version = match.group(1)
+            continue
+        if not line.strip():
+            continue
+        fields = line.split("\t")
+        name, layers, hidden, intermediate, heads = fields[:5]
+        configs.append(ModelConfig(name, int(layers), int(hidden), int(intermediate), int(heads)))
+        if len(fields) > 5 and fields[5].strip() == "*":
+            defaults.append(name)
+    return ModelKnowledgeBase(configs, defaults, version)
+
+
+@lru_cache(maxsize=4)
+def load_knowledge_base(path: str | Path | None = None) -> ModelKnowledgeBase:
+    """
+    Load (once per path) the model knowledge base.
+
+    Args:
+        path: Model configs file (default: the bundled ``model_configs.tsv``)
+
+    Returns:
+        Knowledge base; empty if the file cannot be read
+    """
+    path = Path(path) if path else MODEL_CONFIGS_PATH
+    try:
+        with open(path, encoding="utf-8") as fh:
+            knowledge_base = _parse_knowledge_base(fh)
+    except (OSError, ValueError) as e:
+        get_logger().warning(f"Failed to load model knowledge base from {path}: {e}")
+        return ModelKnowledgeBase([])
+    get_logger().debug(f"Loaded {len(knowledge_base)} model configs (version {knowledge_base.version})")
+    return knowledge_base
+
+
+def lookup_model(name: str) -> Optional[ModelConfig]:
+    """Look a model name up in the bundled knowledge base (loaded on first use)."""
+    return load_knowledge_base().lookup(name)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+from typing import List, Optional, Set, Tuple
+
+from .corpus_index import tokenize
+
+# Words per shingle
+SHINGLE_WORDS = 5
+
+# MinHash slots. One-permutation hashing: each shingle is hashed once and lands in one slot,
+# which keeps the minimum; empty slots borrow from the next filled one
+NUM_SLOTS = 128
+_SLOT_BITS = 7
+_VALUE_BITS = 50
+_EMPTY = 1 << _VALUE_BITS
+
+# LSH: 16 bands of 8 slots. Papers sharing any band are compared; a pair with Jaccard
+# similarity 0.8 shares one with probability 0.95, a pair at 0.5 with probability 0.06
+_BAND_ROWS = 8
+
+_SKETCH = struct.Struct(f"<{NUM_SLOTS}Q")
+
+Sketch = Tuple[int, ...]
+
+
+def shingles(text: str) -> Set[str]:
+    """
+    Overlapping runs of ``SHINGLE_WORDS`` lowercase words, ignoring punctuation and markup symbols.
+
+    Args:
+        text: Paper text (plain, TeX or HTML)
+
+    Returns:
+        Set of shingles; a text shorter than one shingle gives a single shingle of all its words
+    """
+    words = tokenize(text)
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> Optional[Sketch]:
+    """
+    Compute the MinHash sketch of a text's shingles.
+
+    The fraction of equal slots in two sketches estimates the Jaccard similarity of the
+    texts' shingle sets.
+
+    Args:
+        text: Paper text
+
+    Returns:
+        ``NUM_SLOTS`` values, or None for a text without words
+    """
+    mins = [_EMPTY] * NUM_SLOTS
+    for shingle in shingles(text):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        slot = value & (NUM_SLOTS - 1)
+        value = (value >> _SLOT_BITS) & (_EMPTY - 1)
+        if value < mins[slot]:
+            mins[slot] = value
+    filled = [slot for slot, value in enumerate(mins) if value != _EMPTY]
+    if not filled:
+        return None
+    if len(filled) < NUM_SLOTS:
+        # Densify: an empty slot takes the next filled slot's value, offset by the distance
+        sketch = list(mins)
+        for slot in range(NUM_SLOTS):
+            if mins[slot] == _EMPTY:
+                distance = next(d for d in range(1, NUM_SLOTS) if mins[(slot + d) % NUM_SLOTS] != _EMPTY)
+                sketch[slot] = mins[(slot + distance) % NUM_SLOTS] + distance * _EMPTY
+        mins = sketch
+    return tuple(mins)
+
+
+def similarity(a: Sketch, b: Sketch) -> float:
+    """Estimated Jaccard similarity of two sketches (fraction of equal slots)."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_SLOTS
+
+
+def lsh_buckets(sketch: Sketch) -> List[str]:
+    """
+    LSH bucket keys of a sketch, one per band.
+
+    Args:
+        sketch: Output of ``minhash``
+
+    Returns:
+        Keys "band:digest"; papers sharing a key are near-duplicate candidates
+    """
+    packed = pack_sketch(sketch)
+    width = _BAND_ROWS * 8
+    return [
+        f"{band}:{hashlib.blake2b(packed[band * width:(band + 1) * width], digest_size=8).hexdigest()}"
+        for band in range(NUM_SLOTS // _BAND_ROWS)
+    ]
+
+
+def pack_sketch(sketch: Sketch) -> bytes:
+    """Serialize a sketch for storage."""
+    return _SKETCH.pack(*sketch)
+
+
+def unpack_sketch(data: bytes) -> Sketch:
+    """Read a sketch written by ``pack_sketch``."""
+    return _SKETCH.unpack(data)
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Dict, Any, Iterable, Optional
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, TextIO, Tuple
 
-from .io_utils import read_text_from_source, write_jsonl
+from .io_utils import is_url, read_text_from_source, write_jsonl
 from .types import SuperWeightPrediction
-from .cache import CacheManager
-from .selector import select_relevant
+from .cache import AnalysisStore, CacheManager, ChunkMemo, SelectionCache, content_hash, file_content_stats
+from .corpus_index import CorpusIndex, load_corpus_index
+from .selector import (
+    CHUNKER_NAMES,
+    SLIDING_CHUNKER,
+    budget_chars,
+    SCORING_MODES,
+    SELECTOR_VERSION,
+    QueryHints,
+    SelectedText,
+    normalize_query_hints,
+    select_relevant,
+    select_relevant_batch,
+    select_relevant_stream,
+)
 from .logging_config import get_logger
+from .model import PREDICTION_VERSION
+from .semantic_analyzer import PaperAnalysis
+from .text_index import TextIndex
+
+
+# Local files at least this large are streamed through selection instead of read whole
+STREAM_SELECTION_MIN_BYTES = 32 * 1024 * 1024
+
+# Papers read and selected together by predict_batch
+SELECTION_BATCH_SIZE = 64
+
+# Streamed predictions up to this top_k are also written to the prediction cache
+STREAM_CACHE_MAX_TOP_K = 10_000
+
+# Query hints after ``normalize_query_hints``
+HintSet = Tuple[Tuple[str, float], ...]
 
 
 class Predictor:
@@ -22,6 +51,15 @@ class Predictor:
         selection_keep_ratio: float = 1.0,
         backend: str = "dummy",  # placeholder for future backends
         cache_dir: str | Path | None = None,
+        selection_chunker: str = "fixed",
+        selection_scoring: str = "keywords",
+        corpus_index_path: str | Path | None = None,
+        selection_max_chars: int | None = None,
+        selection_max_tokens: int | None = None,
+        analysis_workers: int | None = 1,
+        analysis_early_stop: bool = False,
+        analysis_time_budget: float | None = None,
+        near_duplicate_threshold: float | None = None,
     ) -> None:
         """
         Initialize the predictor.
@@ -34,6 +72,19 @@ class Predictor:
             selection_keep_ratio: Ratio of text to keep during selection
             backend: Backend identifier
             cache_dir: Directory for cache files
+            selection_chunker: Chunking strategy for selection ("fixed", "structured", "content" or "sliding")
+            selection_scoring: Chunk scoring for selection ("keywords" or "bm25")
+            corpus_index_path: Corpus index used by BM25 scoring (default: ~/.cache/paper2sw/corpus.idx)
+            selection_max_chars: Hard cap on selected characters (overrides selection_keep_ratio)
+            selection_max_tokens: Hard cap on selected tokens, estimated from characters
+            analysis_workers: Processes used to analyze very long papers (None for one per CPU)
+            analysis_early_stop: Analyze sections in priority order and skip the rest once
+                the architecture is resolved (predictions may differ from a full read)
+            analysis_time_budget: Seconds allowed to analyze one paper (None for no limit);
+                analysis stops when it runs out and predicts from what was read, and those
+                predictions are not cached
+            near_duplicate_threshold: Reuse the stored analysis of a near-duplicate paper (another
+                version or format) at least this similar, e.g. 0.8 (None always analyzes)
             
         Raises:
             ValueError: If parameters are invalid
@@ -58,25 +109,81 @@ class Predictor:
         if not isinstance(backend, str):
             raise ValueError("backend must be a string")
             
+        if selection_chunker not in CHUNKER_NAMES:
+            raise ValueError(f"selection_chunker must be one of {list(CHUNKER_NAMES)}")
+            
+        if selection_scoring not in SCORING_MODES:
+            raise ValueError(f"selection_scoring must be one of {list(SCORING_MODES)}")
+            
+        if selection_chunker == SLIDING_CHUNKER and selection_scoring != "keywords":
+            raise ValueError("sliding-window selection supports keyword scoring only")
+            
+        self.selection_budget = budget_chars(selection_max_chars, selection_max_tokens)
+            
         self.model_id = model_id
+        try:
+            self.chunk_memo = ChunkMemo(cache_dir=cache_dir, enabled=enable_cache)
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize chunk memo: {e}")
+            self.chunk_memo = ChunkMemo(cache_dir=cache_dir, enabled=False)
+            
+        try:
+            self.analysis_store = AnalysisStore(cache_dir=cache_dir, enabled=enable_cache)
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize analysis store: {e}")
+            self.analysis_store = AnalysisStore(cache_dir=cache_dir, enabled=False)
+            
         try:
             # Try to import the semantic model first, fall back to dummy if needed
             try:
                 from .model import SemanticDiffusionModel
-                self.model = SemanticDiffusionModel(model_id=model_id, device=device, precision=precision)
+                self.model = SemanticDiffusionModel(
+                    model_id=model_id,
+                    device=device,
+                    precision=precision,
+                    chunk_memo=self.chunk_memo,
+                    analysis_workers=analysis_workers,
+                    analysis_early_stop=analysis_early_stop,
+                    analysis_time_budget=analysis_time_budget,
+                    analysis_store=self.analysis_store,
+                    near_duplicate_threshold=near_duplicate_threshold,
+                )
             except ImportError:
                 from .model import DummyDiffusionModel
                 self.model = DummyDiffusionModel(model_id=model_id, device=device, precision=precision)
         except Exception as e:
             raise ValueError(f"Failed to initialize model: {e}")
             
+        # Predictions change with the generator, the analyzer and knowledge base (and early stopping),
+        # and with reused analyses, so each of these gets its own cache entries. An analysis that
+        # finished within its time budget equals an unlimited one; predictions from one that ran
+        # out are never cached (see _cacheable)
+        version_salt = f"{model_id}:{precision}:{PREDICTION_VERSION}:{self.model.analyzer.signature()}"
+        if near_duplicate_threshold is not None:
+            version_salt += f":near-duplicates={near_duplicate_threshold}"
         try:
-            self.cache = CacheManager(cache_dir=cache_dir, enabled=enable_cache, version_salt=f"{model_id}:{precision}")
+            self.cache = CacheManager(cache_dir=cache_dir, enabled=enable_cache, version_salt=version_salt)
         except Exception as e:
             self.logger.warning(f"Failed to initialize cache: {e}")
-            self.cache = CacheManager(cache_dir=cache_dir, enabled=False, version_salt=f"{model_id}:{precision}")
+            self.cache = CacheManager(cache_dir=cache_dir, enabled=False, version_salt=version_salt)
+            
+        try:
+            self.selection_cache = SelectionCache(cache_dir=cache_dir, enabled=enable_cache)
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize selection cache: {e}")
+            self.selection_cache = SelectionCache(cache_dir=cache_dir, enabled=False)
             
         self.selection_keep_ratio = float(selection_keep_ratio)
+        self.selection_max_chars = selection_max_chars
+        self.selection_max_tokens = selection_max_tokens
+        self.selection_chunker = selection_chunker
+        self.selection_scoring = selection_scoring
+        self.corpus_index: CorpusIndex | None = None
+        if selection_scoring == "bm25":
+            try:
+                self.corpus_index = load_corpus_index(corpus_index_path)
+            except Exception as e:
+                raise ValueError(f"Failed to load corpus index for BM25 scoring: {e}")
         self.backend = backend
 
     @classmethod
@@ -89,6 +196,15 @@ class Predictor:
         selection_keep_ratio: float = 1.0,
         backend: str = "dummy",
         cache_dir: str | Path | None = None,
+        selection_chunker: str = "fixed",
+        selection_scoring: str = "keywords",
+        corpus_index_path: str | Path | None = None,
+        selection_max_chars: int | None = None,
+        selection_max_tokens: int | None = None,
+        analysis_workers: int | None = 1,
+        analysis_early_stop: bool = False,
+        analysis_time_budget: float | None = None,
+        near_duplicate_threshold: float | None = None,
     ) -> "Predictor":
         """
         Create a predictor from pretrained model settings.
@@ -101,6 +217,19 @@ class Predictor:
             selection_keep_ratio: Ratio of text to keep during selection
             backend: Backend identifier
             cache_dir: Directory for cache files
+            selection_chunker: Chunking strategy for selection ("fixed", "structured", "content" or "sliding")
+            selection_scoring: Chunk scoring for selection ("keywords" or "bm25")
+            corpus_index_path: Corpus index used by BM25 scoring (default: ~/.cache/paper2sw/corpus.idx)
+            selection_max_chars: Hard cap on selected characters (overrides selection_keep_ratio)
+            selection_max_tokens: Hard cap on selected tokens, estimated from characters
+            analysis_workers: Processes used to analyze very long papers (None for one per CPU)
+            analysis_early_stop: Analyze sections in priority order and skip the rest once
+                the architecture is resolved (predictions may differ from a full read)
+            analysis_time_budget: Seconds allowed to analyze one paper (None for no limit);
+                analysis stops when it runs out and predicts from what was read, and those
+                predictions are not cached
+            near_duplicate_threshold: Reuse the stored analysis of a near-duplicate paper (another
+                version or format) at least this similar, e.g. 0.8 (None always analyzes)
             
         Returns:
             Predictor instance
@@ -113,6 +242,15 @@ class Predictor:
             selection_keep_ratio=selection_keep_ratio,
             backend=backend,
             cache_dir=cache_dir,
+            selection_chunker=selection_chunker,
+            selection_scoring=selection_scoring,
+            corpus_index_path=corpus_index_path,
+            selection_max_chars=selection_max_chars,
+            selection_max_tokens=selection_max_tokens,
+            analysis_workers=analysis_workers,
+            analysis_early_stop=analysis_early_stop,
+            analysis_time_budget=analysis_time_budget,
+            near_duplicate_threshold=near_duplicate_threshold,
         )
 
     @classmethod
@@ -139,6 +277,15 @@ class Predictor:
         selection_keep_ratio = float(config.get("selection_keep_ratio", 1.0))
         backend = str(config.get("backend", "dummy"))
         cache_dir = config.get("cache_dir")
+        selection_chunker = str(config.get("selection_chunker", "fixed"))
+        selection_scoring = str(config.get("selection_scoring", "keywords"))
+        corpus_index_path = config.get("corpus_index_path")
+        selection_max_chars = config.get("selection_max_chars")
+        selection_max_tokens = config.get("selection_max_tokens")
+        analysis_workers = config.get("analysis_workers", 1)
+        analysis_early_stop = bool(config.get("analysis_early_stop", False))
+        analysis_time_budget = config.get("analysis_time_budget")
+        near_duplicate_threshold = config.get("near_duplicate_threshold")
         return cls(
             model_id=model_id,
             device=device,
@@ -147,37 +294,264 @@ class Predictor:
             selection_keep_ratio=selection_keep_ratio,
             backend=backend,
             cache_dir=cache_dir,
+            selection_chunker=selection_chunker,
+            selection_scoring=selection_scoring,
+            corpus_index_path=corpus_index_path,
+            selection_max_chars=selection_max_chars,
+            selection_max_tokens=selection_max_tokens,
+            analysis_workers=analysis_workers,
+            analysis_early_stop=analysis_early_stop,
+            analysis_time_budget=analysis_time_budget,
+            near_duplicate_threshold=near_duplicate_threshold,
+        )
+
+    def _selection_active(self) -> bool:
+        """Whether selection changes the text (a keep ratio below 1 or a budget is set)."""
+        return self.selection_keep_ratio < 0.999 or self.selection_budget is not None
+
+    def _selector_signature(self, chunker: str | None = None) -> str:
+        """Describe the selection settings that affect results, for selection cache keys."""
+        signature = f"{SELECTOR_VERSION}:{chunker or self.selection_chunker}:{self.selection_scoring}"
+        if self.selection_budget is not None:
+            signature += f":budget={self.selection_budget}"
+        if self.corpus_index is not None:
+            signature += f":{self.corpus_index.path}:{self.corpus_index.num_docs}:{self.corpus_index.num_terms}"
+        return signature
+
+    def _selection_key(self, digest: str, chunker: str | None = None, hints: HintSet = ()) -> str:
+        return self.selection_cache.key(
+            content_hash=digest,
+            keep_ratio=self.selection_keep_ratio,
+            query_hint=repr(hints) if hints else None,
+            selector=self._selector_signature(chunker),
+        )
+
+    def _lookup_selection(
+        self,
+        digest: str,
+        chunker: str | None = None,
+        hints: HintSet = (),
+        use_cache: Optional[bool] = None,
+    ) -> Optional[SelectedText]:
+        """
+        Look up a cached selection for some content.
+        
+        Args:
+            digest: Content hash of the raw paper text
+            chunker: Chunker actually used (None means the configured one)
+            hints: Normalized query hints used for selection
+            use_cache: Whether to use the selection cache (None uses default)
+            
+        Returns:
+            Cached SelectedText, or None on a miss or when the cache is disabled
+        """
+        if use_cache is False or not self.selection_cache.enabled:
+            return None
+        try:
+            return self.selection_cache.get(self._selection_key(digest, chunker, hints))
+        except Exception as e:
+            self.logger.warning(f"Failed to read from selection cache: {e}")
+            return None
+
+    def _store_selection(
+        self,
+        digest: str,
+        selected: SelectedText,
+        chunker: str | None = None,
+        hints: HintSet = (),
+        use_cache: Optional[bool] = None,
+    ) -> None:
+        if use_cache is False or not self.selection_cache.enabled:
+            return
+        try:
+            self.selection_cache.put(self._selection_key(digest, chunker, hints), selected)
+        except Exception as e:
+            self.logger.warning(f"Failed to write to selection cache: {e}")
+
+    def _cached_selection(
+        self,
+        digest: str,
+        compute: Callable[[], SelectedText],
+        chunker: str | None = None,
+        hints: HintSet = (),
+        use_cache: Optional[bool] = None,
+    ) -> SelectedText:
+        """
+        Return a cached selection for some content, computing and storing it on a miss.
+        
+        Args:
+            digest: Content hash of the raw paper text
+            compute: Callable producing the selection on a cache miss
+            chunker: Chunker actually used (None means the configured one)
+            hints: Normalized query hints used for selection
+            use_cache: Whether to use the selection cache (None uses default)
+            
+        Returns:
+            SelectedText for the content
+        """
+        selected = self._lookup_selection(digest, chunker, hints, use_cache)
+        if selected is None:
+            selected = compute()
+            self._store_selection(digest, selected, chunker, hints, use_cache)
+        return selected
+
+    def _select_stream(self, handle: TextIO, total_chars: int | None, hints: HintSet = ()) -> SelectedText:
+        return select_relevant_stream(
+            handle,
+            query_hint=hints,
+            keep_ratio=self.selection_keep_ratio,
+            total_chars=total_chars,
+            scoring=self.selection_scoring,
+            index=self.corpus_index,
+            max_chars=self.selection_budget,
         )
 
-    def _maybe_select(self, text: str) -> str:
+    def _maybe_select(
+        self,
+        text: str | TextIO,
+        total_chars: int | None = None,
+        query_hints: QueryHints = None,
+        text_index: TextIndex | None = None,
+        use_cache: Optional[bool] = None,
+    ) -> str:
         """
         Apply text selection if needed.
         
         Args:
-            text: Input text
+            text: Input text, or an open text handle to select from in streaming mode
+            total_chars: Expected length of a streamed input (used to size the budget)
+            query_hints: Optional weighted hints steering selection
+            text_index: Index of the text, shared with keyword scoring
+            use_cache: Whether to use the selection cache (None uses default)
             
         Returns:
             Selected text or original text
         """
-        if not isinstance(text, str):
-            raise TypeError("text must be a string")
+        if not isinstance(text, str) and not hasattr(text, "read"):
+            raise TypeError("text must be a string or a text file handle")
             
-        if self.selection_keep_ratio >= 0.999:
-            return text
+        if not self._selection_active():
+            return text if isinstance(text, str) else text.read()
+            
+        hints = normalize_query_hints(query_hints)
+        if not isinstance(text, str):
+            return self._select_stream(text, total_chars, hints).text
             
         try:
-            sel = select_relevant(text, keep_ratio=self.selection_keep_ratio)
+            sel = self._cached_selection(
+                content_hash(text),
+                lambda: select_relevant(
+                    text,
+                    query_hint=hints,
+                    keep_ratio=self.selection_keep_ratio,
+                    chunker=self.selection_chunker,
+                    scoring=self.selection_scoring,
+                    index=self.corpus_index,
+                    max_chars=self.selection_budget,
+                    memo=self.chunk_memo,
+                    text_index=text_index,
+                ),
+                hints=hints,
+                use_cache=use_cache,
+            )
             return sel.text
         except Exception as e:
             self.logger.warning(f"Failed to select text: {e}")
             return text
 
+    def _streamable_path(self, paper: str | Path) -> Optional[Path]:
+        """
+        Return the local path of a paper that should be selected in streaming mode.
+        
+        Args:
+            paper: URL or path to paper text
+            
+        Returns:
+            Path for large local files when selection is active, otherwise None
+        """
+        if not self._selection_active():
+            return None
+        if not isinstance(paper, Path) and is_url(str(paper)):
+            return None
+        path = Path(paper)
+        try:
+            if path.is_file() and path.stat().st_size >= STREAM_SELECTION_MIN_BYTES:
+                return path
+        except OSError:
+            return None
+        return None
+
+    def _read_selected(
+        self, paper: str | Path, query_hints: QueryHints = None, use_cache: Optional[bool] = None
+    ) -> str:
+        """
+        Read a paper and apply selection, streaming large local files.
+        
+        Args:
+            paper: URL or path to paper text
+            query_hints: Optional weighted hints steering selection
+            use_cache: Whether to use the selection cache (None uses default)
+            
+        Returns:
+            Selected text
+        """
+        return self._read_indexed(paper, query_hints, use_cache)[0]
+
+    def _read_indexed(
+        self, paper: str | Path, query_hints: QueryHints = None, use_cache: Optional[bool] = None
+    ) -> Tuple[str, Optional[TextIndex]]:
+        """
+        Read a paper and apply selection, indexing the text once for selection and analysis.
+        
+        Args:
+            paper: URL or path to paper text
+            query_hints: Optional weighted hints steering selection
+            use_cache: Whether to use the selection cache (None uses default)
+            
+        Returns:
+            Tuple of (selected text, its index); the index is None when selection changed
+            the text or the paper was streamed, and analysis then builds its own
+        """
+        hints = normalize_query_hints(query_hints)
+        path = self._streamable_path(paper)
+        if path is not None:
+            # Large files are never read whole: one pass hashes them and counts characters (the
+            # budget is sized in characters, which a byte count overstates for non-ASCII text),
+            # and a second streams them through selection on a cache miss
+            try:
+                digest, total_chars = file_content_stats(path)
+                with path.open("r", encoding="utf-8", errors="ignore") as handle:
+                    selected = self._cached_selection(
+                        digest,
+                        lambda: self._select_stream(handle, total_chars, hints),
+                        chunker="fixed",  # streams are always chunked at fixed offsets
+                        hints=hints,
+                        use_cache=use_cache,
+                    )
+            except (OSError, UnicodeError) as e:
+                raise IOError(f"Failed to read paper from {paper}: {e}")
+            return selected.text, None
+
+        try:
+            text = read_text_from_source(paper)
+        except Exception as e:
+            raise IOError(f"Failed to read paper from {paper}: {e}")
+            
+        text_index = TextIndex(text)
+        try:
+            selected = self._maybe_select(text, query_hints=hints, text_index=text_index, use_cache=use_cache)
+        except Exception as e:
+            self.logger.warning(f"Failed to select text: {e}")
+            selected = text
+        return selected, text_index if selected is text else None
+
     def predict(
         self,
         paper: str | Path,
         top_k: int = 5,
         seed: int | None = None,
         use_cache: Optional[bool] = None,
+        query_hints: QueryHints = None,
     ) -> List[SuperWeightPrediction]:
         """
         Predict super-weights from a paper.
@@ -187,6 +561,8 @@ class Predictor:
             top_k: Number of predictions to return
             seed: Random seed for reproducibility
             use_cache: Whether to use cache (None uses default)
+            query_hints: Extra selection keywords, e.g. ``{"down_proj": 10, "layer 2": 6}``
+                or a list of hints with the default weight; only used when selection is active
             
         Returns:
             List of SuperWeightPrediction objects
@@ -194,16 +570,96 @@ class Predictor:
         Raises:
             Exception: If prediction fails
         """
+        text, text_index = self._read_indexed(paper, query_hints, use_cache)
+        return self._predict_text(text, top_k=top_k, seed=seed, use_cache=use_cache, text_index=text_index)
+
+    def iter_predict(
+        self,
+        paper: str | Path,
+        top_k: int = 5,
+        seed: int | None = None,
+        use_cache: Optional[bool] = None,
+        query_hints: QueryHints = None,
+    ) -> Iterator[SuperWeightPrediction]:
+        """
+        Predict super-weights lazily, e.g. to write a top_k of 10^6 to disk in constant memory.
+        
+        The paper is read, selected and analyzed when this is called; predictions are then drawn
+        block by block as they are consumed (see ``SemanticDiffusionModel.iter_predict``) and
+        equal ``predict``'s. A cached result is replayed; a new one is only written to the cache
+        for a top_k of at most ``STREAM_CACHE_MAX_TOP_K``, which keeps larger runs out of memory.
+        
+        Args:
+            paper: URL or path to paper text
+            top_k: Number of predictions to return
+            seed: Random seed for reproducibility
+            use_cache: Whether to use cache (None uses default)
+            query_hints: Extra selection keywords (see ``predict``)
+            
+        Returns:
+            Iterator over SuperWeightPrediction objects
+            
+        Raises:
+            Exception: If prediction fails
+        """
+        text, text_index = self._read_indexed(paper, query_hints, use_cache)
+        cache_enabled = use_cache if use_cache is not None else self.cache.enabled
+        if cache_enabled:
+            try:
+                cached = self.cache.get(model_id=self.model_id, text=text, top_k=top_k, seed=seed)
+                if cached is not None:
+                    return iter(cached)
+            except Exception as e:
+                self.logger.warning(f"Failed to read from cache: {e}")
+                
+        analysis = self._analyze(text, text_index)
         try:
-            text = read_text_from_source(paper)
+            preds = self.model.iter_predict(
+                text=text, top_k=top_k, seed=seed, text_index=text_index, analysis=analysis
+            )
         except Exception as e:
-            raise IOError(f"Failed to read paper from {paper}: {e}")
+            raise RuntimeError(f"Failed to generate predictions: {e}")
             
+        if cache_enabled and top_k <= STREAM_CACHE_MAX_TOP_K and self._cacheable(analysis):
+            return self._cache_when_done(preds, text, top_k, seed)
+        return preds
+
+    def _cache_when_done(
+        self, preds: Iterator[SuperWeightPrediction], text: str, top_k: int, seed: int | None
+    ) -> Iterator[SuperWeightPrediction]:
+        """Pass streamed predictions through, writing them to the cache once all are drawn."""
+        drawn = []
+        for prediction in preds:
+            drawn.append(prediction)
+            yield prediction
         try:
-            text = self._maybe_select(text)
+            self.cache.put(model_id=self.model_id, text=text, top_k=top_k, seed=seed, predictions=drawn)
         except Exception as e:
-            self.logger.warning(f"Failed to select text: {e}")
+            self.logger.warning(f"Failed to write to cache: {e}")
+
+    def _predict_text(
+        self,
+        text: str,
+        top_k: int,
+        seed: int | None,
+        use_cache: Optional[bool],
+        text_index: TextIndex | None = None,
+        analysis: PaperAnalysis | None = None,
+    ) -> List[SuperWeightPrediction]:
+        """
+        Predict super-weights from already selected text, going through the cache.
+        
+        Args:
+            text: Selected paper text
+            top_k: Number of predictions to return
+            seed: Random seed for reproducibility
+            use_cache: Whether to use cache (None uses default)
+            text_index: Index of the text built during reading, reused by analysis
+            analysis: Analysis of the text already looked up in the analysis store
             
+        Returns:
+            List of SuperWeightPrediction objects
+        """
         cache_enabled = use_cache if use_cache is not None else self.cache.enabled
         if cache_enabled:
             try:
@@ -213,12 +669,14 @@ class Predictor:
             except Exception as e:
                 self.logger.warning(f"Failed to read from cache: {e}")
                 
+        if analysis is None:
+            analysis = self._analyze(text, text_index)
         try:
-            preds = self.model.predict(text=text, top_k=top_k, seed=seed)
+            preds = self.model.predict(text=text, top_k=top_k, seed=seed, text_index=text_index, analysis=analysis)
         except Exception as e:
             raise RuntimeError(f"Failed to generate predictions: {e}")
             
-        if cache_enabled:
+        if cache_enabled and self._cacheable(analysis):
             try:
                 self.cache.put(model_id=self.model_id, text=text, top_k=top_k, seed=seed, predictions=preds)
             except Exception as e:
@@ -226,12 +684,35 @@ class Predictor:
                 
         return preds
 
+    def _analyze(self, text: str, text_index: TextIndex | None = None) -> Optional[PaperAnalysis]:
+        """
+        Analyze selected text through the model, reusing its cached and stored analyses.
+        
+        Args:
+            text: Selected paper text
+            text_index: Index of the text built during reading
+            
+        Returns:
+            PaperAnalysis, or None if analysis failed (the model then predicts heuristically)
+        """
+        try:
+            return self.model.analyze(text, text_index)
+        except Exception as e:
+            self.logger.warning(f"Failed to analyze paper semantically: {e}")
+            return None
+
+    @staticmethod
+    def _cacheable(analysis: Optional[PaperAnalysis]) -> bool:
+        """Whether predictions drawn from an analysis may be cached: not when it ran out of its time budget."""
+        return analysis is None or not analysis.architecture.budget_exceeded
+
     def predict_batch(
         self,
         papers: Iterable[str | Path],
         top_k: int = 5,
         seed: int | None = None,
         use_cache: Optional[bool] = None,
+        query_hints: QueryHints = None,
     ) -> List[List[SuperWeightPrediction]]:
         """
         Predict super-weights for multiple papers.
@@ -241,6 +722,7 @@ class Predictor:
             top_k: Number of predictions to return per paper
             seed: Random seed for reproducibility
             use_cache: Whether to use cache (None uses default)
+            query_hints: Extra selection keywords shared by every paper (see ``predict``)
             
         Returns:
             List of lists of SuperWeightPrediction objects
@@ -248,25 +730,186 @@ class Predictor:
         if not hasattr(papers, '__iter__'):
             raise TypeError("papers must be iterable")
             
+        hints = normalize_query_hints(query_hints)
         results: List[List[SuperWeightPrediction]] = []
-        for i, item in enumerate(papers):
+        group: List[str | Path] = []
+        for item in papers:
+            group.append(item)
+            if len(group) >= SELECTION_BATCH_SIZE:
+                results.extend(self._predict_group(group, len(results), top_k, seed, use_cache, hints))
+                group = []
+        if group:
+            results.extend(self._predict_group(group, len(results), top_k, seed, use_cache, hints))
+        return results
+
+    def _predict_group(
+        self,
+        papers: List[str | Path],
+        start: int,
+        top_k: int,
+        seed: int | None,
+        use_cache: Optional[bool],
+        hints: HintSet = (),
+    ) -> List[List[SuperWeightPrediction]]:
+        """
+        Predict for a group of papers, selecting text for the whole group at once.
+        
+        Args:
+            papers: Papers in this group
+            start: Index of the first paper in the overall batch (for log messages)
+            top_k: Number of predictions to return per paper
+            seed: Random seed for reproducibility
+            use_cache: Whether to use cache (None uses default)
+            hints: Normalized query hints used for selection
+            
+        Returns:
+            List of lists of SuperWeightPrediction objects (empty for failed papers)
+        """
+        texts = self._read_selected_many(papers, hints, use_cache)
+        analyses = self._stored_analyses(texts)
+        cache_enabled = use_cache if use_cache is not None else self.cache.enabled
+        results: List[List[SuperWeightPrediction]] = [[] for _ in papers]
+        pending: List[int] = []
+        for i, (item, text) in enumerate(zip(papers, texts)):
+            if isinstance(text, Exception):
+                self.logger.error(f"Failed to predict for paper {start + i} ({item}): {text}")
+                continue
+            if cache_enabled:
+                try:
+                    cached = self.cache.get(model_id=self.model_id, text=text, top_k=top_k, seed=seed)
+                    if cached is not None:
+                        results[i] = cached
+                        continue
+                except Exception as e:
+                    self.logger.warning(f"Failed to read from cache: {e}")
+            pending.append(i)
+        if not pending:
+            return results
+            
+        # Papers missing from the cache are analyzed and predicted as one batch
+        try:
+            found = self.model.analyze_many([texts[i] for i in pending], [analyses[i] for i in pending])
+            for i, analysis in zip(pending, found):
+                analyses[i] = analysis
+        except Exception as e:
+            self.logger.warning(f"Failed to analyze papers as a batch: {e}")
+        try:
+            batch = self.model.predict_many(
+                [texts[i] for i in pending], top_k=top_k, seeds=seed, analyses=[analyses[i] for i in pending]
+            )
+        except Exception as e:
+            self.logger.warning(f"Batch prediction failed, predicting papers one at a time: {e}")
+            for i in pending:
+                try:
+                    results[i] = self._predict_text(
+                        texts[i], top_k=top_k, seed=seed, use_cache=use_cache, analysis=analyses[i]
+                    )
+                except Exception as e:
+                    self.logger.error(f"Failed to predict for paper {start + i} ({papers[i]}): {e}")
+            return results
+        for i, columns in zip(pending, batch):
+            results[i] = columns.to_predictions()
+            if cache_enabled and self._cacheable(analyses[i]):
+                try:
+                    self.cache.put(model_id=self.model_id, text=texts[i], top_k=top_k, seed=seed, predictions=results[i])
+                except Exception as e:
+                    self.logger.warning(f"Failed to write to cache: {e}")
+        return results
+
+    def _stored_analyses(self, texts: List[str | Exception]) -> List[Optional[PaperAnalysis]]:
+        """
+        Look a group of papers up in the analysis store with one query.
+        
+        Args:
+            texts: Selected text per paper, or the exception raised while reading it
+            
+        Returns:
+            Stored analysis per paper (None for papers to analyze, or that failed to read)
+        """
+        readable = [i for i, text in enumerate(texts) if isinstance(text, str)]
+        analyses: List[Optional[PaperAnalysis]] = [None] * len(texts)
+        try:
+            found = self.model.stored_analyses([texts[i] for i in readable])
+        except Exception as e:
+            self.logger.warning(f"Failed to read from analysis store: {e}")
+            return analyses
+        for i, analysis in zip(readable, found):
+            analyses[i] = analysis
+        return analyses
+
+    def _read_selected_many(
+        self, papers: List[str | Path], hints: HintSet = (), use_cache: Optional[bool] = None
+    ) -> List[str | Exception]:
+        """
+        Read several papers and apply selection to them as one batch.
+        
+        Keyword scoring over in-memory texts goes through ``select_relevant_batch`` (which
+        uses NumPy when installed); large local files and BM25 scoring use the per-paper path.
+        
+        Args:
+            papers: URLs or paths to paper texts
+            hints: Normalized query hints used for selection
+            use_cache: Whether to use the selection cache (None uses default)
+            
+        Returns:
+            Selected text per paper, or the exception raised while reading it
+        """
+        texts: List[str | Exception] = []
+        batched: List[int] = []
+        for paper in papers:
             try:
-                result = self.predict(paper=item, top_k=top_k, seed=seed, use_cache=use_cache)
-                results.append(result)
+                if self.selection_scoring != "keywords" or self._streamable_path(paper) is not None:
+                    texts.append(self._read_selected(paper, hints, use_cache))
+                    continue
+                try:
+                    texts.append(read_text_from_source(paper))
+                except Exception as e:
+                    raise IOError(f"Failed to read paper from {paper}: {e}")
+                batched.append(len(texts) - 1)
             except Exception as e:
-                self.logger.error(f"Failed to predict for paper {i} ({item}): {e}")
-                results.append([])  # Return empty list for failed predictions
-        return results
+                texts.append(e)
+
+        if not batched or not self._selection_active():
+            return texts
 
-    def save_jsonl(self, predictions: List[SuperWeightPrediction], path: str | Path) -> None:
+        misses: List[int] = []
+        digests: Dict[int, str] = {}
+        for i in batched:
+            digests[i] = content_hash(texts[i])
+            cached = self._lookup_selection(digests[i], hints=hints, use_cache=use_cache)
+            if cached is not None:
+                texts[i] = cached.text
+            else:
+                misses.append(i)
+
+        if misses:
+            try:
+                selected = select_relevant_batch(
+                    [texts[i] for i in misses],
+                    query_hint=hints,
+                    keep_ratio=self.selection_keep_ratio,
+                    chunker=self.selection_chunker,
+                    max_chars=self.selection_budget,
+                )
+                for i, sel in zip(misses, selected):
+                    self._store_selection(digests[i], sel, hints=hints, use_cache=use_cache)
+                    texts[i] = sel.text
+            except Exception as e:
+                self.logger.warning(f"Failed to select text: {e}")
+        return texts
+
+    def save_jsonl(self, predictions: Iterable[SuperWeightPrediction], path: str | Path) -> int:
         """
-        Save predictions to a JSONL file.
+        Save predictions to a JSONL file, writing each row as it is produced.
         
         Args:
-            predictions: List of predictions to save
+            predictions: Predictions to save, e.g. a list or ``iter_predict(...)``
             path: Path to save to
+            
+        Returns:
+            Number of predictions written
         """
         try:
-            write_jsonl(predictions, path)
+            return write_jsonl(predictions, path)
         except Exception as e:
             raise IOError(f"Failed to save predictions to {path}: {e}")
\ No newline at end of file
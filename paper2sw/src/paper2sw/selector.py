@@ -1,9 +1,26 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
+import heapq
+import math
+import re
+import zlib
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, TextIO, Tuple, Union
 
+from .corpus_index import BM25Scorer, CorpusIndex, load_corpus_index
 from .logging_config import get_logger
+from .text_index import TextIndex
+
+if TYPE_CHECKING:
+    from .cache import ChunkMemo
+
+
+# Bump when chunking or scoring changes what gets selected (invalidates cached selections)
+SELECTOR_VERSION = "1"
 
 
 @dataclass
@@ -14,6 +31,300 @@ class SelectedText:
     num_chunks: int
 
 
+# Enhanced scoring for super-weight analysis; prefer sections likely to describe architecture
+# Weighted keywords based on importance for super-weight identification
+_KEYWORD_WEIGHTS: Dict[str, int] = {
+    # High importance keywords
+    "down.proj": 10,
+    "mlp.down_proj": 10,
+    "super.weight": 10,
+    "superweight": 10,
+    "outlier": 8,
+    "critical": 8,
+    "important": 8,
+    "early.layer": 8,
+    "first.layer": 8,
+    "stop.word": 7,
+    "logit": 7,
+    "activation": 7,
+
+    # Medium importance keywords
+    "architecture": 6,
+    "method": 5,
+    "model": 5,
+    "layer": 5,
+    "attention": 5,
+    "ffn": 5,
+    "mlp": 5,
+    "feed.forward": 5,
+    "up.proj": 4,
+    "gate.proj": 4,
+    "q.proj": 4,
+    "k.proj": 4,
+    "v.proj": 4,
+    "o.proj": 4,
+    "projection": 4,
+    "matrix": 4,
+    "weight": 4,
+    "parameter": 4,
+
+    # Lower importance keywords
+    "results": 3,
+    "implementation": 3,
+    "experiment": 2,
+    "evaluation": 2,
+}
+
+# str.count runs in C, so one call per keyword beats a pure-Python automaton pass until
+# the table gets large (many query hints); measured crossover is around 150 keywords.
+_AUTOMATON_MIN_KEYWORDS = 150
+
+
+class KeywordScorer:
+    """
+    Weighted keyword scorer compiled once per keyword/weight table.
+
+    Occurrences are counted with ``str.count`` semantics: matches of the same keyword never
+    overlap, while different keywords are counted independently. Large tables are matched
+    with an Aho-Corasick automaton in a single scan of the text.
+    """
+
+    def __init__(self, keyword_weights: Mapping[str, float], use_automaton: bool | None = None) -> None:
+        """
+        Compile a scorer.
+
+        Args:
+            keyword_weights: Mapping of lowercase keyword to weight
+            use_automaton: Force (True) or disable (False) the automaton; None picks by table size
+        """
+        items = [(kw, weight) for kw, weight in keyword_weights.items() if kw]
+        self.keywords: List[str] = [kw for kw, _ in items]
+        self.weights: List[float] = [weight for _, weight in items]
+        # Identifies the keyword table in persistent memos of chunk scores
+        self.signature = hashlib.blake2b(repr(items).encode("utf-8"), digest_size=16).hexdigest()
+        if use_automaton is None:
+            use_automaton = len(self.keywords) >= _AUTOMATON_MIN_KEYWORDS
+        self.use_automaton = use_automaton
+        if use_automaton:
+            self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append([])
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].append(index)
+
+        # Fold failure links into a full transition table so the scan is one lookup per char
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs = [out or None for out in outputs]
+        self._lengths = [len(kw) for kw in self.keywords]
+
+    def counts(self, lower: str) -> List[int]:
+        """
+        Count every keyword in already-lowercased text.
+
+        Args:
+            lower: Lowercased text
+
+        Returns:
+            Occurrence count per keyword, aligned with ``self.keywords``
+        """
+        if not self.use_automaton:
+            return [lower.count(kw) for kw in self.keywords]
+
+        delta, outputs, lengths = self._delta, self._outputs, self._lengths
+        counts = [0] * len(self.keywords)
+        last_end = [0] * len(self.keywords)
+        state = 0
+        for pos, ch in enumerate(lower, 1):
+            state = delta[state].get(ch, 0)
+            matched = outputs[state]
+            if matched:
+                for index in matched:
+                    if pos - lengths[index] >= last_end[index]:
+                        last_end[index] = pos
+                        counts[index] += 1
+        return counts
+
+    def matches(self, lower: str) -> List[Tuple[int, int]]:
+        """
+        Locate every keyword occurrence in already-lowercased text.
+
+        Args:
+            lower: Lowercased text
+
+        Returns:
+            (start offset, keyword index) pairs; occurrences of one keyword never overlap,
+            as in ``counts``
+        """
+        found: List[Tuple[int, int]] = []
+        if not self.use_automaton:
+            for index, kw in enumerate(self.keywords):
+                pos = lower.find(kw)
+                while pos >= 0:
+                    found.append((pos, index))
+                    pos = lower.find(kw, pos + len(kw))
+            return found
+
+        delta, outputs, lengths = self._delta, self._outputs, self._lengths
+        last_end = [0] * len(self.keywords)
+        state = 0
+        for pos, ch in enumerate(lower, 1):
+            state = delta[state].get(ch, 0)
+            matched = outputs[state]
+            if matched:
+                for index in matched:
+                    if pos - lengths[index] >= last_end[index]:
+                        last_end[index] = pos
+                        found.append((pos - lengths[index], index))
+        return found
+
+    def score(self, chunk: str) -> float:
+        """
+        Score a chunk of text.
+
+        Args:
+            chunk: Text to score
+
+        Returns:
+            Weighted keyword score (0 for non-string input)
+        """
+        if not isinstance(chunk, str):
+            return 0
+        return sum(c * w for c, w in zip(self.counts(chunk.lower()), self.weights) if c)
+
+    def score_span(self, index: TextIndex, start: int, end: int) -> float:
+        """
+        Score a span of an indexed document without copying or lowercasing it.
+
+        Args:
+            index: Index of the document
+            start: Span start offset
+            end: Span end offset
+
+        Returns:
+            Weighted keyword score of ``index.text[start:end]``
+        """
+        if self.use_automaton:
+            counts = self.counts(index.lower[start:end])
+        else:
+            counts = [index.count(kw, start, end) for kw in self.keywords]
+        return sum(c * w for c, w in zip(counts, self.weights) if c)
+
+
+@lru_cache(maxsize=32)
+def _compile_scorer(items: Tuple[Tuple[str, float], ...]) -> KeywordScorer:
+    return KeywordScorer(dict(items))
+
+
+def get_keyword_scorer(keyword_weights: Mapping[str, float] | None = None) -> KeywordScorer:
+    """
+    Return a cached scorer for a keyword/weight table.
+
+    Args:
+        keyword_weights: Mapping of keyword to weight (None uses the default table)
+
+    Returns:
+        Compiled KeywordScorer, shared between calls with the same table
+    """
+    if keyword_weights is None:
+        keyword_weights = _KEYWORD_WEIGHTS
+    return _compile_scorer(tuple(keyword_weights.items()))
+
+
+SCORING_MODES = ("keywords", "bm25")
+
+# Weight of a query hint given without an explicit weight
+DEFAULT_HINT_WEIGHT = 9
+
+# A hint string, a mapping of hint to weight, or an iterable of hints / (hint, weight) pairs
+QueryHints = Union[str, Mapping[str, float], Iterable[Union[str, Tuple[str, float]]], None]
+
+
+def normalize_query_hints(query_hints: QueryHints) -> Tuple[Tuple[str, float], ...]:
+    """
+    Canonicalize query hints into a hashable form used to cache compiled scorers.
+
+    Args:
+        query_hints: A hint string, a mapping of hint to weight, or an iterable of hints
+            (bare strings get ``DEFAULT_HINT_WEIGHT``) or ``(hint, weight)`` pairs
+
+    Returns:
+        Sorted tuple of (lowercase hint, weight) pairs; empty hints are dropped and a
+        repeated hint keeps its last weight
+
+    Raises:
+        TypeError: If a hint is not a string or a weight is not a number
+    """
+    if not query_hints:
+        return ()
+    if isinstance(query_hints, str):
+        items: Iterable = [(query_hints, DEFAULT_HINT_WEIGHT)]
+    elif isinstance(query_hints, Mapping):
+        items = query_hints.items()
+    else:
+        items = [(h, DEFAULT_HINT_WEIGHT) if isinstance(h, str) else tuple(h) for h in query_hints]
+
+    merged: Dict[str, float] = {}
+    for hint, weight in items:
+        if not isinstance(hint, str):
+            raise TypeError("query hints must be strings")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            raise TypeError(f"weight for query hint '{hint}' must be a number")
+        hint = hint.strip().lower()
+        if hint:
+            merged[hint] = weight
+    return tuple(sorted(merged.items()))
+
+
+@lru_cache(maxsize=64)
+def _compile_hint_scorer(hints: Tuple[Tuple[str, float], ...]) -> KeywordScorer:
+    keyword_weights = dict(_KEYWORD_WEIGHTS)
+    keyword_weights.update(hints)
+    return get_keyword_scorer(keyword_weights)
+
+
+@lru_cache(maxsize=64)
+def _compile_bm25_scorer(index: CorpusIndex, hints: Tuple[Tuple[str, float], ...]) -> BM25Scorer:
+    keyword_weights = dict(_KEYWORD_WEIGHTS)
+    keyword_weights.update(hints)
+    return BM25Scorer(index, keyword_weights)
+
+
+def _chunk_scorer(
+    query_hint: QueryHints,
+    scoring: str = "keywords",
+    index: CorpusIndex | None = None,
+) -> KeywordScorer | BM25Scorer:
+    """Return the compiled scorer for a hint set, shared between calls with the same hints."""
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode '{scoring}', expected one of {list(SCORING_MODES)}")
+    hints = normalize_query_hints(query_hint)
+    if scoring == "bm25":
+        return _compile_bm25_scorer(index if index is not None else load_corpus_index(), hints)
+    return _compile_hint_scorer(hints)
+
+
 def _simple_chunks(text: str, max_chars: int = 2000) -> List[str]:
     """
     Split text into chunks of approximately max_chars length.
@@ -41,21 +352,315 @@ def _simple_chunks(text: str, max_chars: int = 2000) -> List[str]:
     return chunks
 
 
-def select_relevant(text: str, query_hint: str | None = None, keep_ratio: float = 0.2) -> SelectedText:
+# Section starts: LaTeX sectioning commands, Markdown ATX headings and HTML headings
+_SECTION_RE = re.compile(
+    r"^[ \t]*(?:\\(?:part|chapter|section|subsection|subsubsection|paragraph)\*?\s*[\[{]|#{1,6}[ \t])"
+    r"|<h[1-6][\s>]",
+    re.MULTILINE | re.IGNORECASE,
+)
+_PARAGRAPH_RE = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _split_spans(text: str, start: int, end: int, pattern: re.Pattern, at_match_start: bool) -> List[Tuple[int, int]]:
+    """Split text[start:end] into contiguous spans at pattern matches."""
+    cuts = [start]
+    for match in pattern.finditer(text, start, end):
+        cut = match.start() if at_match_start else match.end()
+        if start < cut < end and cut > cuts[-1]:
+            cuts.append(cut)
+    cuts.append(end)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _bounded_pieces(text: str, start: int, end: int, max_chars: int) -> Iterator[Tuple[int, int]]:
+    """Yield spans of at most max_chars, preferring paragraph, then sentence, then word breaks."""
+    levels = (_PARAGRAPH_RE, _SENTENCE_RE, _WHITESPACE_RE)
+
+    def split(s: int, e: int, level: int) -> Iterator[Tuple[int, int]]:
+        if e - s <= max_chars:
+            yield s, e
+            return
+        if level == len(levels):
+            for cut in range(s, e, max_chars):
+                yield cut, min(cut + max_chars, e)
+            return
+        for span in _split_spans(text, s, e, levels[level], at_match_start=False):
+            yield from split(span[0], span[1], level + 1)
+
+    for span in _split_spans(text, start, end, _PARAGRAPH_RE, at_match_start=False):
+        yield from split(span[0], span[1], 1)
+
+
+def _structured_chunks(text: str, target_chars: int = 1500, max_chars: int = 2000) -> List[str]:
+    """
+    Split text into chunks along section, paragraph and sentence boundaries.
+    
+    Paragraphs are packed into chunks of about target_chars; a section heading starts a new
+    chunk unless the current one is still small. Oversized paragraphs fall back to sentence
+    and then word boundaries, so no chunk exceeds max_chars. Concatenating the chunks gives
+    back the original text.
+    
+    Args:
+        text: Text to chunk
+        target_chars: Preferred chunk size
+        max_chars: Hard maximum characters per chunk
+        
+    Returns:
+        List of text chunks
+    """
+    if not isinstance(text, str):
+        raise TypeError("Text must be a string")
+    
+    if max_chars <= 0 or target_chars <= 0:
+        raise ValueError("target_chars and max_chars must be positive")
+    target_chars = min(target_chars, max_chars)
+    min_section_chars = target_chars // 4
+        
+    chunks: List[str] = []
+    chunk_start = chunk_end = 0
+    for section_start, section_end in _split_spans(text, 0, len(text), _SECTION_RE, at_match_start=True):
+        if chunk_end > chunk_start and chunk_end - chunk_start >= min_section_chars:
+            chunks.append(text[chunk_start:chunk_end])
+            chunk_start = chunk_end
+        for piece_start, piece_end in _bounded_pieces(text, section_start, section_end, max_chars):
+            if chunk_end > chunk_start and piece_end - chunk_start > target_chars:
+                chunks.append(text[chunk_start:chunk_end])
+                chunk_start = piece_start
+            chunk_end = piece_end
+    if chunk_end > chunk_start:
+        chunks.append(text[chunk_start:chunk_end])
+    return chunks
+
+
+# Characters hashed on each side of a candidate boundary in content-defined chunking
+_CDC_WINDOW = 32
+
+
+def _content_defined_spans(
+    text: str,
+    target_chars: int,
+    min_chars: int,
+    max_chars: int | None = None,
+) -> List[Tuple[int, int]]:
+    """
+    Split text into spans whose boundaries are chosen by content rather than offset.
+
+    Candidate boundaries sit just after each newline. A candidate at least ``min_chars``
+    into the current span becomes a boundary when the CRC-32 of the ``_CDC_WINDOW``
+    characters on either side falls under a threshold proportional to the distance from the
+    previous newline, which gives spans of about ``target_chars`` on average. The decision
+    only looks at nearby text, so inserting a sentence moves the boundaries next to it and
+    leaves the other spans unchanged.
+
+    Args:
+        text: Text to split
+        target_chars: Desired average span length
+        min_chars: Minimum span length (except for the last span)
+        max_chars: Optional hard limit; a longer span is cut at its last space
+
+    Returns:
+        (start, end) offsets covering the text
+    """
+    spans: List[Tuple[int, int]] = []
+    n = len(text)
+    spread = max(1, target_chars - min_chars)
+    start = prev = 0
+    pos = text.find("\n")
+    while True:
+        candidate = pos + 1 if pos >= 0 else n
+        while max_chars is not None and candidate - start > max_chars:
+            limit = start + max_chars
+            space = text.rfind(" ", start + max(min_chars, 1), limit)
+            cut = space + 1 if space >= 0 else limit
+            spans.append((start, cut))
+            start = cut
+        if pos < 0:
+            break
+        if candidate - start >= min_chars:
+            window = text[max(candidate - _CDC_WINDOW, 0):candidate + _CDC_WINDOW].encode("utf-8", "surrogatepass")
+            if zlib.crc32(window) * spread < (candidate - prev) << 32:
+                spans.append((start, candidate))
+                start = candidate
+        prev = candidate
+        pos = text.find("\n", candidate)
+    if start < n:
+        spans.append((start, n))
+    return spans
+
+
+def _content_defined_chunks(text: str, max_chars: int = 2000) -> List[str]:
+    """
+    Split text into content-defined chunks of at most max_chars.
+    
+    Chunks end at newlines picked by a hash of the surrounding text (see
+    ``_content_defined_spans``), so a revised paper shares most chunks with the previous
+    version and their memoized scores can be reused.
+    
+    Args:
+        text: Text to chunk
+        max_chars: Maximum characters per chunk
+        
+    Returns:
+        List of text chunks (exact slices covering the text)
+    """
+    if not isinstance(text, str):
+        raise TypeError("Text must be a string")
+    
+    if max_chars <= 0:
+        raise ValueError("max_chars must be positive")
+        
+    spans = _content_defined_spans(text, target_chars=max_chars * 3 // 4, min_chars=max_chars // 4, max_chars=max_chars)
+    return [text[start:end] for start, end in spans]
+
+
+CHUNKERS = {
+    "fixed": _simple_chunks,
+    "structured": _structured_chunks,
+    "content": _content_defined_chunks,
+}
+
+# Overlapping windows rather than a partition of the text; handled by select_relevant_windows
+SLIDING_CHUNKER = "sliding"
+CHUNKER_NAMES = (*CHUNKERS, SLIDING_CHUNKER)
+
+
+# Rough characters-per-token ratio used to turn token budgets into character budgets
+CHARS_PER_TOKEN = 4
+
+# Selected chunks are joined with this separator, which counts against a budget
+_JOIN = "\n\n"
+
+# Knapsack resolution: capacity is quantized into at most this many units
+_KNAPSACK_UNITS = 512
+
+
+def budget_chars(max_chars: int | None = None, max_tokens: int | None = None) -> int | None:
+    """
+    Combine character and token budgets into one character budget.
+    
+    Args:
+        max_chars: Maximum characters of selected text
+        max_tokens: Maximum tokens of selected text (estimated at ``CHARS_PER_TOKEN`` chars each)
+        
+    Returns:
+        The tighter of the two budgets in characters, or None if neither is set
+        
+    Raises:
+        ValueError: If a budget is not a positive integer
+    """
+    budgets = []
+    for name, value, scale in (("max_chars", max_chars, 1), ("max_tokens", max_tokens, CHARS_PER_TOKEN)):
+        if value is None:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+            raise ValueError(f"{name} must be a positive integer")
+        budgets.append(value * scale)
+    return min(budgets) if budgets else None
+
+
+def _knapsack_select(chunks: List[str], scores: List[float], capacity: int) -> List[int]:
+    """
+    Pick chunk indices maximizing total score within a character budget.
+    
+    The most valuable candidates are solved exactly as a 0/1 knapsack over quantized
+    lengths (rounded up, so the budget is never exceeded); remaining room is then filled
+    greedily by score.
+    
+    Args:
+        chunks: Candidate chunks
+        scores: Score per chunk
+        capacity: Budget in characters, including join separators
+        
+    Returns:
+        Indices of kept chunks, ordered by score (descending) then position
+    """
+    room = capacity + len(_JOIN)
+    costs = [len(c) + len(_JOIN) for c in chunks]
+    by_score = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+
+    # Candidate pool: enough top chunks to fill the budget several times over
+    pool: List[int] = []
+    filled = 0
+    for i in by_score:
+        if scores[i] <= 0 or costs[i] > room:
+            continue
+        pool.append(i)
+        filled += costs[i]
+        if filled >= 4 * room and len(pool) >= 8:
+            break
+
+    chosen: set = set()
+    if pool:
+        unit = max(1, -(-room // _KNAPSACK_UNITS))
+        cap = room // unit
+        weights = [-(-costs[i] // unit) for i in pool]
+        best = [0.0] * (cap + 1)
+        take = [[False] * (cap + 1) for _ in pool]
+        for p, i in enumerate(pool):
+            w, v = weights[p], scores[i]
+            for c in range(cap, w - 1, -1):
+                if best[c - w] + v > best[c]:
+                    best[c] = best[c - w] + v
+                    take[p][c] = True
+        c = cap
+        for p in range(len(pool) - 1, -1, -1):
+            if take[p][c]:
+                chosen.add(pool[p])
+                c -= weights[p]
+
+    used = sum(costs[i] for i in chosen)
+    for i in by_score:
+        if i not in chosen and used + costs[i] <= room:
+            chosen.add(i)
+            used += costs[i]
+    return sorted(chosen, key=lambda i: (-scores[i], i))
+
+
+def select_relevant(
+    text: str,
+    query_hint: QueryHints = None,
+    keep_ratio: float = 0.2,
+    chunker: str = "fixed",
+    scoring: str = "keywords",
+    index: CorpusIndex | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+    memo: ChunkMemo | None = None,
+    text_index: TextIndex | None = None,
+) -> SelectedText:
     """
     Select the most relevant portions of text based on keyword scoring.
     
+    With a character or token budget, keep_ratio is ignored and the budget is filled with
+    the highest-value chunks (a knapsack over chunk length and score); the selected text
+    never exceeds the budget.
+    
     Args:
         text: Input text to select from
-        query_hint: Optional hint for additional keywords
+        query_hint: Optional hint string, or several weighted hints (see ``normalize_query_hints``)
         keep_ratio: Fraction of chunks to keep (0.0 to 1.0)
+        chunker: Chunking strategy: "fixed", "structured", "content" (content-defined) or
+            "sliding" (see ``select_relevant_windows``; keyword scoring only)
+        scoring: "keywords" for weighted keyword counts, "bm25" for BM25 with corpus IDF
+        index: Corpus index for BM25 (None loads the default index)
+        max_chars: Optional hard cap on selected characters
+        max_tokens: Optional hard cap on selected tokens (estimated)
+        memo: Optional persistent chunk memo; chunks scored before (e.g. unchanged
+            paragraphs of a revised paper) reuse their stored scores. Sliding windows are
+            scored incrementally, which costs less than hashing every window, and skip it
+        text_index: Index of ``text`` shared with later stages; keyword scoring then counts
+            keywords from its cached positions instead of lowercasing every chunk
         
     Returns:
         SelectedText object with the relevant text
         
     Raises:
         TypeError: If text is not a string
-        ValueError: If keep_ratio is not between 0 and 1
+        ValueError: If keep_ratio is not between 0 and 1, chunker/scoring is unknown,
+            a budget is not a positive integer, or text_index was built for another text
+        FileNotFoundError: If BM25 scoring is requested and no corpus index exists
     """
     logger = get_logger()
     
@@ -65,73 +670,48 @@ def select_relevant(text: str, query_hint: str | None = None, keep_ratio: float
     if not 0.0 <= keep_ratio <= 1.0:
         raise ValueError("keep_ratio must be between 0.0 and 1.0")
         
+    if text_index is not None and text_index.text is not text and text_index.text != text:
+        raise ValueError("text_index was built for a different text")
+        
+    if chunker == SLIDING_CHUNKER:
+        if scoring != "keywords":
+            raise ValueError("sliding-window selection supports keyword scoring only")
+        return select_relevant_windows(
+            text,
+            query_hint=query_hint,
+            keep_ratio=keep_ratio,
+            max_chars=max_chars,
+            max_tokens=max_tokens,
+            text_index=text_index,
+        )
+        
+    if chunker not in CHUNKERS:
+        raise ValueError(f"Unknown chunker '{chunker}', expected one of {list(CHUNKER_NAMES)}")
+        
+    scorer = _chunk_scorer(query_hint, scoring, index)
+    budget = budget_chars(max_chars, max_tokens)
+        
+    if budget is not None and len(text) <= budget:
+        return SelectedText(text=text, kept_fraction=1.0, num_chunks=1)
+        
     try:
-        chunks = _simple_chunks(text)
+        if budget is not None and budget < 2000:
+            # Keep at least one chunk within reach of a small budget
+            chunks = CHUNKERS[chunker](text, max_chars=budget)
+        else:
+            chunks = CHUNKERS[chunker](text)
     except Exception as e:
         logger.warning(f"Failed to chunk text: {e}")
         return SelectedText(text=text, kept_fraction=1.0, num_chunks=1)
         
-    if len(chunks) <= 1:
+    if len(chunks) <= 1 and budget is None:
         return SelectedText(text=text, kept_fraction=1.0, num_chunks=len(chunks))
 
-    # Enhanced scoring for super-weight analysis; prefer sections likely to describe architecture
-    # Weighted keywords based on importance for super-weight identification
-    keyword_weights = {
-        # High importance keywords
-        "down.proj": 10,
-        "mlp.down_proj": 10,
-        "super.weight": 10,
-        "superweight": 10,
-        "outlier": 8,
-        "critical": 8,
-        "important": 8,
-        "early.layer": 8,
-        "first.layer": 8,
-        "stop.word": 7,
-        "logit": 7,
-        "activation": 7,
-        
-        # Medium importance keywords
-        "architecture": 6,
-        "method": 5,
-        "model": 5,
-        "layer": 5,
-        "attention": 5,
-        "ffn": 5,
-        "mlp": 5,
-        "feed.forward": 5,
-        "up.proj": 4,
-        "gate.proj": 4,
-        "q.proj": 4,
-        "k.proj": 4,
-        "v.proj": 4,
-        "o.proj": 4,
-        "projection": 4,
-        "matrix": 4,
-        "weight": 4,
-        "parameter": 4,
-        
-        # Lower importance keywords
-        "results": 3,
-        "implementation": 3,
-        "experiment": 2,
-        "evaluation": 2,
-    }
-    
-    if query_hint:
-        keyword_weights[query_hint.lower()] = 9
-
-    def score(chunk: str) -> int:
-        if not isinstance(chunk, str):
-            return 0
-        lower = chunk.lower()
-        s = 0
-        for kw, weight in keyword_weights.items():
-            s += lower.count(kw) * weight
-        return s
+    if budget is not None:
+        return _select_within_budget(chunks, _score_chunks(scorer, chunks, memo, text_index), budget)
 
     try:
-        scored = sorted(((score(c), c) for c in chunks), key=lambda x: x[0], reverse=True)
+        scored = sorted(zip(_score_chunks(scorer, chunks, memo, text_index), chunks), key=lambda x: x[0], reverse=True)
         k = max(1, int(len(chunks) * keep_ratio))
         kept = [c for _, c in scored[:k]]
         joined = "\n\n".join(kept)
@@ -140,4 +720,396 @@ def select_relevant(text: str, query_hint: str | None = None, keep_ratio: float
         return result
     except Exception as e:
         logger.warning(f"Failed to select relevant text: {e}")
-        return SelectedText(text=text, kept_fraction=1.0, num_chunks=len(chunks))
\ No newline at end of file
+        return SelectedText(text=text, kept_fraction=1.0, num_chunks=len(chunks))
+
+
+def _score_chunks(
+    scorer: KeywordScorer | BM25Scorer,
+    chunks: List[str],
+    memo: ChunkMemo | None = None,
+    text_index: TextIndex | None = None,
+) -> List[float]:
+    score = scorer.score
+    if text_index is not None and isinstance(scorer, KeywordScorer):
+        spans = _chunk_spans(text_index.text, chunks)
+        if spans is not None:
+            def score(chunk: str) -> float:
+                return scorer.score_span(text_index, *spans[chunk])
+    if memo is None:
+        return [score(c) for c in chunks]
+    return memo.memoize(chunks, f"score:{SELECTOR_VERSION}:{scorer.signature}", score)
+
+
+def _chunk_spans(text: str, chunks: List[str]) -> Dict[str, Tuple[int, int]] | None:
+    """Locate chunks taken from text in order, or None if one is not a slice of it."""
+    spans: Dict[str, Tuple[int, int]] = {}
+    pos = 0
+    for chunk in chunks:
+        start = pos if text.startswith(chunk, pos) else text.find(chunk, pos)
+        if start < 0:
+            return None
+        pos = start + len(chunk)
+        spans.setdefault(chunk, (start, pos))
+    return spans
+
+
+def _select_within_budget(chunks: List[str], scores: List[float], budget: int) -> SelectedText:
+    logger = get_logger()
+    kept = _knapsack_select(chunks, scores, budget)
+    joined = _JOIN.join(chunks[i] for i in kept)
+    result = SelectedText(text=joined, kept_fraction=len(kept) / len(chunks), num_chunks=len(kept))
+    logger.info(f"Selected {len(kept)} out of {len(chunks)} chunks within {budget} chars ({len(joined)} used)")
+    return result
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    """Return the numpy module, or None when it is not installed."""
+    try:
+        import numpy  # type: ignore
+        return numpy
+    except ImportError:
+        return None
+
+
+def _top_k_indices(np, scores, k: int):
+    """Indices of the k best scores, ordered like a stable descending sort."""
+    n = len(scores)
+    if k >= n:
+        candidates = np.arange(n)
+    else:
+        threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[: k - len(above)]
+        candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def select_relevant_batch(
+    texts: Iterable[str],
+    query_hint: QueryHints = None,
+    keep_ratio: float = 0.2,
+    chunker: str = "fixed",
+    use_numpy: bool | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> List[SelectedText]:
+    """
+    Select relevant text for a batch of documents with keyword scoring.
+    
+    When NumPy is available, keyword counts for every chunk of every document are stacked
+    into one (chunks x keywords) matrix, scored with a single matrix-vector product and
+    cut with ``argpartition``. Results are identical to calling ``select_relevant`` on each
+    text. Without NumPy, with non-integer weights where float summation order could
+    change rankings, with a budget or with sliding windows, it falls back to
+    ``select_relevant`` per document.
+    
+    Args:
+        texts: Input texts
+        query_hint: Optional hint string, or several weighted hints (see ``normalize_query_hints``)
+        keep_ratio: Fraction of chunks to keep (0.0 to 1.0)
+        chunker: Chunking strategy, one of ``CHUNKER_NAMES``
+        use_numpy: Force (True) or disable (False) the NumPy engine; None uses it if installed
+        max_chars: Optional hard cap on selected characters per document
+        max_tokens: Optional hard cap on selected tokens per document (estimated)
+        
+    Returns:
+        One SelectedText per input text, in order
+        
+    Raises:
+        TypeError: If any text is not a string
+        ValueError: If keep_ratio is not between 0 and 1 or chunker is unknown
+        ImportError: If use_numpy is True and NumPy is not installed
+    """
+    logger = get_logger()
+    texts = list(texts)
+    
+    if not all(isinstance(t, str) for t in texts):
+        raise TypeError("Text must be a string")
+        
+    if not 0.0 <= keep_ratio <= 1.0:
+        raise ValueError("keep_ratio must be between 0.0 and 1.0")
+        
+    if chunker not in CHUNKER_NAMES:
+        raise ValueError(f"Unknown chunker '{chunker}', expected one of {list(CHUNKER_NAMES)}")
+        
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True")
+        
+    query_hint = normalize_query_hints(query_hint)  # may be a one-shot iterable
+    scorer = _chunk_scorer(query_hint)
+    budget = budget_chars(max_chars, max_tokens)
+    if (
+        np is None
+        or budget is not None
+        or chunker == SLIDING_CHUNKER
+        or not all(float(w).is_integer() for w in scorer.weights)
+    ):
+        return [
+            select_relevant(t, query_hint=query_hint, keep_ratio=keep_ratio, chunker=chunker, max_chars=budget)
+            for t in texts
+        ]
+
+    results: List[SelectedText | None] = [None] * len(texts)
+    chunked: List[Tuple[int, List[str]]] = []
+    rows: List[List[int]] = []
+    for i, text in enumerate(texts):
+        try:
+            chunks = CHUNKERS[chunker](text)
+        except Exception as e:
+            logger.warning(f"Failed to chunk text: {e}")
+            results[i] = SelectedText(text=text, kept_fraction=1.0, num_chunks=1)
+            continue
+        if len(chunks) <= 1:
+            results[i] = SelectedText(text=text, kept_fraction=1.0, num_chunks=len(chunks))
+            continue
+        chunked.append((i, chunks))
+        rows.extend(scorer.counts(c.lower()) for c in chunks)
+
+    if rows:
+        counts = np.array(rows, dtype=np.int64).reshape(len(rows), len(scorer.keywords))
+        scores = counts @ np.array([int(w) for w in scorer.weights], dtype=np.int64)
+        offset = 0
+        for i, chunks in chunked:
+            doc_scores = scores[offset:offset + len(chunks)]
+            offset += len(chunks)
+            k = max(1, int(len(chunks) * keep_ratio))
+            kept = [chunks[j] for j in _top_k_indices(np, doc_scores, k)]
+            results[i] = SelectedText(text="\n\n".join(kept), kept_fraction=k / len(chunks), num_chunks=k)
+
+    logger.info(f"Selected text for {len(texts)} documents ({len(rows)} chunks scored in one batch)")
+    return [r for r in results if r is not None]
+
+
+def _iter_chunks(source: Iterable[str] | TextIO, max_chars: int = 2000) -> Iterator[str]:
+    """
+    Yield chunks of max_chars characters from a file handle or an iterable of strings.
+
+    Chunk boundaries match ``_simple_chunks`` applied to the concatenated input.
+
+    Args:
+        source: Text file handle or iterable of text pieces
+        max_chars: Maximum characters per chunk
+
+    Yields:
+        Text chunks
+    """
+    if max_chars <= 0:
+        raise ValueError("max_chars must be positive")
+
+    if hasattr(source, "read"):
+        while True:
+            piece = source.read(max_chars)  # type: ignore[union-attr]
+            if not piece:
+                return
+            yield piece
+
+    buffer = ""
+    for piece in source:
+        if not isinstance(piece, str):
+            raise TypeError("source must yield strings")
+        buffer += piece
+        while len(buffer) >= max_chars:
+            yield buffer[:max_chars]
+            buffer = buffer[max_chars:]
+    if buffer:
+        yield buffer
+
+
+def select_relevant_stream(
+    source: Iterable[str] | TextIO,
+    query_hint: QueryHints = None,
+    keep_ratio: float = 0.2,
+    total_chars: int | None = None,
+    max_chunks: int | None = None,
+    scoring: str = "keywords",
+    index: CorpusIndex | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> SelectedText:
+    """
+    Select the most relevant chunks from a stream using bounded memory.
+
+    Chunks are scored as they arrive and only the best candidates are kept in a heap, so
+    memory depends on the kept budget rather than the input size. Streams always use the
+    fixed-size chunker; results match ``select_relevant`` on the same text when the budget
+    is the same.
+
+    Args:
+        source: Text file handle or iterable of text pieces
+        query_hint: Optional hint string, or several weighted hints (see ``normalize_query_hints``)
+        keep_ratio: Fraction of chunks to keep (0.0 to 1.0), used with total_chars
+        total_chars: Expected input length, used to turn keep_ratio into a chunk budget
+        max_chunks: Explicit chunk budget (overrides keep_ratio/total_chars)
+        scoring: "keywords" or "bm25", as in ``select_relevant``
+        index: Corpus index for BM25 (None loads the default index)
+        max_chars: Optional hard cap on selected characters; fixed-size chunks make the
+            knapsack a plain top-k, so this sets the chunk budget and truncates the result
+        max_tokens: Optional hard cap on selected tokens (estimated)
+
+    Returns:
+        SelectedText object with the relevant text
+
+    Raises:
+        ValueError: If keep_ratio is out of range or no budget can be derived
+    """
+    logger = get_logger()
+
+    if not 0.0 <= keep_ratio <= 1.0:
+        raise ValueError("keep_ratio must be between 0.0 and 1.0")
+
+    budget = budget_chars(max_chars, max_tokens)
+    if budget is not None:
+        budget_chunks = max(1, (budget + len(_JOIN)) // (2000 + len(_JOIN)))
+        max_chunks = budget_chunks if max_chunks is None else min(max_chunks, budget_chunks)
+    if max_chunks is None:
+        if total_chars is None:
+            raise ValueError("either total_chars or max_chunks is required for streaming selection")
+        max_chunks = max(1, int(math.ceil(total_chars / 2000) * keep_ratio))
+    if max_chunks <= 0:
+        raise ValueError("max_chunks must be positive")
+
+    scorer = _chunk_scorer(query_hint, scoring, index)
+
+    # Min-heap on (score, -index): the root is the weakest kept chunk, and among equal
+    # scores the later chunk is evicted first, matching the stable sort in select_relevant.
+    heap: List[Tuple[float, int, str]] = []
+    total = 0
+    for index, chunk in enumerate(_iter_chunks(source)):
+        total += 1
+        entry = (scorer.score(chunk), -index, chunk)
+        if len(heap) < max_chunks:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    if total == 0:
+        return SelectedText(text="", kept_fraction=1.0, num_chunks=0)
+
+    kept = sorted(heap, key=lambda e: (e[0], e[1]), reverse=True)
+    joined = _JOIN.join(chunk for _, _, chunk in kept)
+    if budget is not None:
+        joined = joined[:budget]
+    result = SelectedText(text=joined, kept_fraction=len(kept) / total, num_chunks=len(kept))
+    logger.info(f"Selected {len(kept)} out of {total} streamed chunks ({result.kept_fraction:.2%})")
+    return result
+
+
+def select_relevant_windows(
+    text: str,
+    query_hint: QueryHints = None,
+    keep_ratio: float = 0.2,
+    window_chars: int = 2000,
+    stride_chars: int = 500,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+    text_index: TextIndex | None = None,
+) -> SelectedText:
+    """
+    Select the best non-overlapping windows out of overlapping sliding windows.
+
+    Fixed chunks can cut a dense passage in two; windows starting every ``stride_chars``
+    keep such a passage whole in at least one of them. Keyword occurrences are located once
+    over the whole text, and each window's score is updated from the previous one by adding
+    the occurrences that enter on the right and dropping those that leave on the left, so
+    the overlap costs almost nothing. Windows are then kept greedily by score, skipping any
+    that overlap a window already kept, up to the same number of chunks ``select_relevant``
+    would keep.
+
+    Args:
+        text: Input text to select from
+        query_hint: Optional hint string, or several weighted hints (see ``normalize_query_hints``)
+        keep_ratio: Fraction of the text (in windows) to keep (0.0 to 1.0)
+        window_chars: Window length
+        stride_chars: Distance between consecutive window starts
+        max_chars: Optional hard cap on selected characters
+        max_tokens: Optional hard cap on selected tokens (estimated)
+        text_index: Index of ``text`` shared with later stages; keyword positions are taken
+            from its case-folded buffer, whose offsets match ``text`` (None builds one)
+
+    Returns:
+        SelectedText object with the kept windows, best first
+
+    Raises:
+        TypeError: If text is not a string
+        ValueError: If keep_ratio is out of range, the window/stride sizes are invalid,
+            a budget is not a positive integer, or text_index was built for another text
+    """
+    logger = get_logger()
+
+    if not isinstance(text, str):
+        raise TypeError("Text must be a string")
+
+    if not 0.0 <= keep_ratio <= 1.0:
+        raise ValueError("keep_ratio must be between 0.0 and 1.0")
+
+    if window_chars <= 0 or not 0 < stride_chars <= window_chars:
+        raise ValueError("window_chars must be positive and stride_chars between 1 and window_chars")
+
+    if text_index is not None and text_index.text is not text and text_index.text != text:
+        raise ValueError("text_index was built for a different text")
+
+    scorer = _chunk_scorer(query_hint)
+    budget = budget_chars(max_chars, max_tokens)
+    n = len(text)
+
+    if budget is not None:
+        if n <= budget:
+            return SelectedText(text=text, kept_fraction=1.0, num_chunks=1)
+        window_chars = min(window_chars, budget)
+        stride_chars = min(stride_chars, window_chars)
+        max_windows = max(1, (budget + len(_JOIN)) // (window_chars + len(_JOIN)))
+    else:
+        max_windows = max(1, int(math.ceil(n / window_chars) * keep_ratio))
+
+    num_chunks = math.ceil(n / window_chars)
+    if num_chunks <= 1 and budget is None:
+        return SelectedText(text=text, kept_fraction=1.0, num_chunks=num_chunks)
+
+    starts = range(0, max(n - window_chars, 0) + stride_chars, stride_chars)
+    if text_index is None:
+        text_index = TextIndex(text)
+    weights = scorer.weights
+    lengths = [len(kw) for kw in scorer.keywords]
+    if scorer.use_automaton:
+        found = scorer.matches(text_index.lower)
+    else:
+        # The index caches each keyword's positions, so later stages asking again skip the scan
+        found = [(pos, i) for i, kw in enumerate(scorer.keywords) for pos in text_index.positions(kw)]
+    found = [(start, i) for start, i in found if lengths[i] <= window_chars]
+    entering = sorted((start + lengths[i], i) for start, i in found)
+    leaving = sorted(found)
+    scores: List[float] = []
+    score = 0
+    added = dropped = 0
+    for start in starts:
+        end = start + window_chars
+        while added < len(entering) and entering[added][0] <= end:
+            score += weights[entering[added][1]]
+            added += 1
+        while dropped < len(leaving) and leaving[dropped][0] < start:
+            score -= weights[leaving[dropped][1]]
+            dropped += 1
+        scores.append(score)
+
+    kept: List[int] = []
+    taken: List[int] = []  # sorted starts of kept windows
+    for i in sorted(range(len(starts)), key=lambda i: (-scores[i], i)):
+        start = starts[i]
+        pos = bisect.bisect_left(taken, start)
+        if pos > 0 and taken[pos - 1] + window_chars > start:
+            continue
+        if pos < len(taken) and start + window_chars > taken[pos]:
+            continue
+        bisect.insort(taken, start)
+        kept.append(start)
+        if len(kept) >= max_windows:
+            break
+
+    joined = _JOIN.join(text[start:start + window_chars] for start in kept)
+    if budget is not None:
+        joined = joined[:budget]
+    result = SelectedText(text=joined, kept_fraction=min(1.0, len(kept) / num_chunks), num_chunks=len(kept))
+    logger.info(f"Selected {len(kept)} of {len(starts)} sliding windows ({result.kept_fraction:.2%})")
+    return result
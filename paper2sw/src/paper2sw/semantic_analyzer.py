@@ -1,11 +1,442 @@
 from __future__ import annotations
 
+import bisect
+import os
 import re
-from dataclasses import dataclass
-from typing import List, Dict, Tuple, Set
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Dict, Optional, Sequence, Tuple, Set
 from collections import defaultdict
 
+from .config_tables import extract_config_fields
 from .logging_config import get_logger
+from .model_configs import load_knowledge_base, lookup_model
+from .selector import _SECTION_RE, _content_defined_spans
+from .text_index import TextIndex
+
+if TYPE_CHECKING:
+    from .cache import ChunkMemo
+
+
+# Bump when extraction changes what is found in a chunk (invalidates memoized chunk features)
+ANALYZER_VERSION = "5"
+
+# Content-defined chunks used to memoize features. Boundaries fall only after newlines,
+# which none of the extraction patterns cross, so merged chunk features match whole-text
+# extraction exactly.
+_FEATURE_CHUNK_TARGET = 4000
+_FEATURE_CHUNK_MIN = 1000
+
+# Texts (or memo misses) at least this long are analyzed in a process pool when workers > 1
+PARALLEL_MIN_CHARS = 1 << 20
+
+# Feature chunks per pool task: enough text to amortize pickling, small enough to balance load
+_CHUNKS_PER_TASK = 64
+
+# Extraction regexes scan at most _SCAN_WINDOW characters per call. Consecutive windows overlap
+# by _SCAN_OVERLAP characters, so only a match longer than that (a phrase no paper writes) can be
+# cut short at a window edge; the time budget is checked between windows.
+_SCAN_WINDOW = 1 << 16
+_SCAN_OVERLAP = 1 << 10
+
+# Family key -> (name pattern, whether the variant is a version like "GPT-2" rather than a size
+# like "Llama-13B"). Order breaks ties between equally frequent families; the size assumed when a
+# paper gives none comes from the model knowledge base.
+_MODEL_FAMILIES: Dict[str, Tuple[str, bool]] = {
+    "llama": (r"llama", False),
+    "mistral": (r"mistral", False),
+    "gemma": (r"gemma", False),
+    "phi": (r"phi(?=[ -]?[123](?!\d))", True),
+    "mixtral": (r"mixtral", False),
+    "olmo": (r"olmo", False),
+    "gpt": (r"gpt(?=[ -]?[234])", True),
+    "bert": (r"bert", False),
+    "t5": (r"t5", False),
+    "bart": (r"bart", False),
+    "opt": (r"opt", False),
+    "bloom": (r"bloom", False),
+    "falcon": (r"falcon", False),
+    "mpt": (r"mpt", False),
+    "starcoder": (r"star[ -]*coder", False),
+}
+
+# Families whose name is also an English word ("we opt to", "bloom filters"): a bare mention
+# only counts when a model word follows it, as in "OPT models"; one with a size always counts
+_AMBIGUOUS_FAMILIES = frozenset({"opt", "bloom"})
+_MODEL_CONTEXT = re.compile(r"[ -]*(?:(?:language[ -]*)?models?|lms?|checkpoints?|baselines?|family|series)\b")
+
+# Parameter counts ("13b", "8x7b", "125m", BLOOM's "7b1") and named sizes ("base", "xl")
+_NAMED_SIZES = r"base|large|medium|small|xxl|xl"
+_SIZE_PATTERN = rf"\d+(?:\.\d+)?(?:x\d+(?:\.\d+)?)?[bm]\d*|{_NAMED_SIZES}"
+
+# Patterns for common architectural parameters, matched case-insensitively
+# Every pattern matches within one line and has at most _NUMBER_CONTEXT characters other than
+# spaces and hyphens before its number and _NUMBER_SUFFIX after it, so matches are only looked
+# for that close to a number
+_NUMERIC_PATTERNS: Dict[str, List[str]] = {
+    "layers": [
+        r"(\d+)[ -]*(?:transformer[ -]*)?layers?",
+        r"num[ -]*layers?[ =:]?(\d+)",
+        r"depth[ =:]?(\d+)",
+        r"uses (\d+) transformer layers"
+    ],
+    "hidden_size": [
+        r"hidden[ -]*(?:size|dimension)[ =:]?(\d+)",
+        r"d[ _]?model[ =:]?(\d+)",
+        r"model[ -]*dimension[ =:]?(\d+)",
+        r"hidden (?:size|dimension) of (\d+)"
+    ],
+    "mlp_expansion": [
+        r"mlp[ -]*expansion[ =:]?(\d+)",
+        r"feed[ -]*forward[ -]*expansion[ =:]?(\d+)",
+        r"ffn[ -]*expansion[ =:]?(\d+)",
+        r"expansion[ -]*factor[ =:]?(\d+)",
+        r"MLP expansion of (\d+)",
+        r"MLP expansion factor is (\d+)"
+    ],
+    "attention_heads": [
+        r"attention[ -]*heads?[ =:]?(\d+)",
+        r"num[ -]*heads?[ =:]?(\d+)",
+        r"multi[ -]*head[ =:]?(\d+)",
+        r"(\d+)[ -]*heads?",
+        r"grouped[ -]*query[ -]*attention.{0,100}?(\d+)[ -]*heads?",
+        r"with (\d+) heads",
+        r"use (\d+) attention heads"
+    ]
+}
+
+_NUMBER_CONTEXT = 128
+_NUMBER_SUFFIX = 24
+_WIDEN_STEPS = 8
+
+# Layer mentions collected as components, matched on case-folded text; each needs "layer" or "block"
+_LAYER_PATTERNS = [
+    re.compile(r"(?:layer|block)[ -]*(\d+)"),
+    re.compile(r"early[ -]*(?:layer|block)[s]?[ -]*(?:\d+(?:[ ,-]*\d+)*)?"),
+    re.compile(r"first[ -]*(?:\d+)[ -]*(?:layer|block)[s]?"),
+]
+# "down_proj", "down proj", "down-projection", ...
+_DOWN_PROJ = re.compile(r"down[ -]*proj")
+
+# Plausible value ranges; anything outside is treated as a false positive
+_NUMERIC_RANGES: Dict[str, Tuple[int, int]] = {
+    "layers": (5, 100),
+    "hidden_size": (64, 16384),
+    "mlp_expansion": (2, 16),
+    "attention_heads": (1, 128),
+}
+
+# Section ranks for early-stopping analysis, most informative first, by heading keyword.
+# Text before the first heading (title and abstract) ranks first; unmatched headings rank
+# _OTHER_SECTION_RANK; appendix and back matter come last.
+_SECTION_RANKS: Tuple[Tuple[int, Tuple[str, ...]], ...] = (
+    (0, ("abstract",)),
+    (1, ("model", "architecture", "method", "approach", "setup", "implementation", "configuration",
+         "hyperparameter")),
+    (2, ("experiment", "training", "evaluation", "result", "ablation")),
+)
+_OTHER_SECTION_RANK = 3
+_APPENDIX_RANK = 4
+_BACK_MATTER_RANK = 5
+_APPENDIX_KEYWORDS = ("appendix", "supplementary")
+_BACK_MATTER_KEYWORDS = ("reference", "bibliography", "acknowledg")
+_APPENDIX_COMMAND = re.compile(r"^[ \t]*\\appendix\b", re.MULTILINE)
+_HEADING_TITLE = re.compile(
+    r"[ \t]*(?:\\[a-z]+\*?\s*(?:\[[^\]\n]*\]\s*)?\{([^}\n]*)|#{1,6}[ \t]+([^\n]*)|<h[1-6][^>]*>([^<\n]*))",
+    re.IGNORECASE,
+)
+
+# Early stopping needs these parameters, down_proj evidence, and a family named with a size
+# or mentioned at least _EARLY_STOP_FAMILY_MENTIONS times
+_EARLY_STOP_PARAMS = ("layers", "hidden_size", "attention_heads")
+_EARLY_STOP_FAMILY_MENTIONS = 2
+
+
+@dataclass(frozen=True)
+class _NumericExtractor:
+    """All numeric patterns compiled into one single-pass regex."""
+    regex: re.Pattern[str]
+    # First character -> (pattern index, span group, value group, value starts at match)
+    by_first_char: Dict[str, Tuple[Tuple[int, int, int, bool], ...]]
+    digit_entries: Tuple[Tuple[int, int, int, bool], ...]
+    # Pattern index -> parameter name, in _NUMERIC_PATTERNS order
+    params: Tuple[str, ...]
+
+
+@lru_cache(maxsize=16)
+def _numeric_extractor(params: Tuple[str, ...] = tuple(_NUMERIC_PATTERNS)) -> _NumericExtractor:
+    """
+    Compile ``_NUMERIC_PATTERNS`` into one regex that reports every pattern matching at a position.
+    
+    Each alternative consumes only a first character; the rest of every pattern sharing
+    that character sits in an optional lookahead with its own named groups, and a
+    conditional rejects positions where none matched. Patterns are lowercased and run
+    case-sensitively on case-folded text, which keeps the literal fast scan that
+    ``re.IGNORECASE`` disables. Digit-first patterns can only match with the whole run of
+    digits (nothing after it is a digit), so they are tried at the start of a run only;
+    trying every digit would rescan the rest of the run each time, quadratic in its length.
+    
+    Args:
+        params: Parameters to extract, as ``_NUMERIC_PATTERNS`` keys
+        
+    Returns:
+        Compiled extractor
+    """
+    pattern_params: List[str] = []
+    groups: Dict[str, List[Tuple[int, str]]] = {}
+    for param_name in params:
+        for pattern in _NUMERIC_PATTERNS[param_name]:
+            i = len(pattern_params)
+            pattern_params.append(param_name)
+            lowered = pattern.lower()
+            if lowered.startswith(r"(\d+)"):
+                # The first digit is consumed by the alternative; the group holds the rest
+                groups.setdefault(r"\d", []).append((i, f"(?P<v{i}>\\d*)" + lowered[len(r"(\d+)"):]))
+            else:
+                rest = lowered[1:].replace(r"(\d+)", f"(?P<v{i}>\\d+)", 1)
+                groups.setdefault(lowered[0], []).append((i, rest))
+
+    branches = []
+    for first, items in groups.items():
+        lookaheads = "".join(f"(?:(?=(?P<p{i}>{rest}))|)" for i, rest in items)
+        condition = "(?!)"
+        for i, _ in reversed(items):
+            condition = f"(?(p{i})|{condition})"
+        start = r"(?<!\d)\d" if first == r"\d" else first
+        branches.append(start + lookaheads + condition)
+    regex = re.compile("|".join(branches))
+
+    index = regex.groupindex
+    by_first_char: Dict[str, Tuple[Tuple[int, int, int, bool], ...]] = {}
+    digit_entries: Tuple[Tuple[int, int, int, bool], ...] = ()
+    for first, items in groups.items():
+        entries = tuple((i, index[f"p{i}"], index[f"v{i}"], first == r"\d") for i, _ in items)
+        if first == r"\d":
+            digit_entries = entries
+            by_first_char.update(dict.fromkeys(string.digits, entries))
+        else:
+            by_first_char[first] = entries
+    return _NumericExtractor(regex, by_first_char, digit_entries, tuple(pattern_params))
+
+
+def _scan(
+    regex: re.Pattern[str], text: str, start: int = 0, end: int | None = None, deadline: float | None = None
+) -> Iterator[re.Match[str]]:
+    """
+    Yield the matches of ``regex.finditer(text, start, end)``, one bounded window at a time.
+    
+    Windows are at most ``_SCAN_WINDOW`` characters. Matches starting in the last
+    ``_SCAN_OVERLAP`` characters of a window are left to the next one, which starts there
+    (or after the last match reported), so every match up to ``_SCAN_OVERLAP`` characters
+    long is reported exactly once.
+    
+    Args:
+        regex: Compiled pattern
+        text: Text to scan
+        start: Start offset
+        end: End offset (None for the end of the text)
+        deadline: ``time.monotonic()`` value after which no further window is scanned
+        
+    Yields:
+        Matches in text order
+    """
+    if end is None:
+        end = len(text)
+    while start < end:
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        window_end = min(start + _SCAN_WINDOW, end)
+        report_end = end if window_end == end else window_end - _SCAN_OVERLAP
+        next_start = report_end
+        for match in regex.finditer(text, start, window_end):
+            if match.start() >= report_end:
+                break
+            yield match
+            next_start = max(next_start, match.end())
+        start = next_start
+
+
+def _number_windows(
+    index: TextIndex, start: int, end: int, deadline: float | None = None
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Stretches of text around numbers that a numeric pattern match can start in and extend to.
+    
+    A match starts at most ``_NUMBER_CONTEXT`` characters other than spaces and hyphens
+    before a number on the same line, and not after the number begins; it ends at most
+    ``_NUMBER_SUFFIX`` such characters after the number. Where numbers are dense (a table,
+    a list of values) the windows would cover the lines anyway, so those lines are
+    returned whole, which keeps the work linear in their length; a window may then
+    span several lines.
+    
+    Args:
+        index: Index of the text
+        start: Span start offset
+        end: Span end offset
+        deadline: ``time.monotonic()`` value after which no further window is returned
+        
+    Yields:
+        (first, last, stop): matches start in ``[first, last]`` and end by ``stop``, in text order
+    """
+    lower, numbers = index.lower, index.numbers
+    reach = _NUMBER_CONTEXT + _NUMBER_SUFFIX
+    window: Optional[Tuple[int, int, int]] = None
+    for line_start, line_end in index.number_lines(start, end):
+        i = bisect.bisect_left(numbers, (line_start, -1))
+        j = bisect.bisect_left(numbers, (line_end, -1), i)
+        if (j - i) * reach >= line_end - line_start:
+            lines: Iterable[Tuple[int, int, int, int]] = [(line_start, line_end, i, j)]
+        else:
+            lines = _lines_with_numbers(lower, numbers, line_start, line_end, i)
+        for line_begin, line_stop, i, j in lines:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            if (j - i) * reach >= line_stop - line_begin:
+                spans: Iterable[Tuple[int, int, int]] = [(line_begin, numbers[j - 1][0], line_stop)]
+            else:
+                spans = (
+                    (
+                        _widen(lower, number_start, -_NUMBER_CONTEXT, line_begin),
+                        number_start,
+                        _widen(lower, min(number_end, line_stop), _NUMBER_SUFFIX, line_stop),
+                    )
+                    for number_start, number_end in numbers[i:j]
+                )
+            for first, last, stop in spans:
+                if window is not None and first <= window[1] + 1:
+                    window = (window[0], last, stop)
+                else:
+                    if window is not None:
+                        yield window
+                    window = (first, last, stop)
+    if window is not None:
+        yield window
+
+
+def _lines_with_numbers(
+    lower: str, numbers: List[Tuple[int, int]], start: int, end: int, i: int
+) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Split lines ``lower[start:end]`` that each hold a number into single lines.
+    
+    Args:
+        lower: Lowercased text
+        numbers: Digit runs of the text (see ``TextIndex.numbers``)
+        start: Start of the first line
+        end: End of the last line
+        i: Index of the first number at or after start
+        
+    Yields:
+        (line start, line end, first number index, number index past the line)
+    """
+    while start < end:
+        newline = lower.find("\n", start, end)
+        stop = end if newline == -1 else newline + 1
+        j = bisect.bisect_left(numbers, (stop, -1), i)
+        if j > i:
+            yield start, stop, i, j
+        start, i = stop, j
+
+
+def _widen(text: str, pos: int, count: int, limit: int) -> int:
+    """Move from pos by ``count`` characters other than spaces and hyphens (backwards if negative), up to limit."""
+    target = pos + count
+    # Converges in a few steps on prose; text that is mostly spaces or hyphens goes to the limit
+    for _ in range(_WIDEN_STEPS):
+        if not ((target > limit) if count < 0 else (target < limit)):
+            break
+        lo, hi = (target, pos) if count < 0 else (pos, target)
+        skipped = text.count(" ", lo, hi) + text.count("-", lo, hi)
+        widened = pos + count - skipped if count < 0 else pos + count + skipped
+        if widened == target:
+            break
+        target = widened
+    else:
+        return limit
+    return max(target, limit) if count < 0 else min(target, limit)
+
+
+@lru_cache(maxsize=1)
+def _family_matcher() -> re.Pattern[str]:
+    """
+    Compile one word-bounded regex for every family mention and its optional version/size.
+    
+    Matches "llama-2 13b", "llama-13b", "mixtral 8x7b" or "bert-base" on lowercased text,
+    capturing ``name``, ``version`` and ``size``. The leading boundary is a consumed ``\\W``
+    (search ``" " + text``) rather than ``\\b``, which would disable the first-character scan.
+    
+    Returns:
+        Compiled matcher
+    """
+    names = "|".join(pattern for pattern, _ in _MODEL_FAMILIES.values())
+    return re.compile(
+        rf"\W(?P<name>{names})"
+        rf"(?:[ -]*(?P<size>{_SIZE_PATTERN})\b"
+        rf"|[ -]?(?P<version>\d(?:\.\d)?)(?:[ -]*(?P<version_size>{_SIZE_PATTERN}))?\b"
+        rf"|\b)"
+    )
+
+
+def _format_variant(variant: str) -> str:
+    """Format a size or version for display, e.g. "13b" -> "13B", "8x7b" -> "8x7B", "7b1" -> "7B1", "xl" -> "XL"."""
+    if variant[:1].isdigit():
+        return variant.upper().replace("X", "x")
+    return variant.upper() if len(variant) <= 3 else variant.capitalize()
+
+
+def _paper_sections(text: str, deadline: float | None = None) -> List[Tuple[str, int, int, int]]:
+    """
+    Split a paper at its headings and rank the sections for early-stopping analysis.
+
+    Args:
+        text: Paper text
+        deadline: ``time.monotonic()`` value after which splitting stops; the sections
+            found by then are returned, and the last one runs to the end of the text
+
+    Returns:
+        (title, rank, start, end) per section in text order; sections start at line starts,
+        and the text before the first heading is titled "preamble"
+    """
+    cuts = [0]
+    for match in _SECTION_RE.finditer(text):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        # HTML headings may start mid-line; cut at the line start so no pattern spans a cut
+        cut = text.rfind("\n", 0, match.start()) + 1
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    cuts.append(len(text))
+    appendix = _APPENDIX_COMMAND.search(text)
+    appendix_start = appendix.start() if appendix else len(text) + 1
+
+    sections = []
+    for start, end in zip(cuts[:-1], cuts[1:]):
+        if deadline is not None and time.monotonic() >= deadline and sections:
+            sections[-1] = sections[-1][:3] + (len(text),)
+            break
+        match = _HEADING_TITLE.match(text, start) if start or _SECTION_RE.match(text) else None
+        if match is None:
+            title = "preamble" if start == 0 else text[start:end].strip().partition("\n")[0][:60]
+        else:
+            title = next(group for group in match.groups() if group is not None).strip() or "untitled"
+        key = title.lower()
+        if any(keyword in key for keyword in _BACK_MATTER_KEYWORDS):
+            rank = _BACK_MATTER_RANK
+        elif start >= appendix_start or any(keyword in key for keyword in _APPENDIX_KEYWORDS):
+            rank = _APPENDIX_RANK
+            appendix_start = min(appendix_start, start)
+        elif title == "preamble":
+            rank = 0
+        else:
+            rank = next((rank for rank, keywords in _SECTION_RANKS if any(k in key for k in keywords)),
+                        _OTHER_SECTION_RANK)
+        sections.append((title, rank, start, end))
+    return sections
 
 
 @dataclass
@@ -19,6 +450,10 @@ class ModelArchitecture:
     key_components: List[str]
     mentioned_layers: List[str]
     parameter_constraints: Dict[str, str]
+    # Titles of sections left unread by early-stopping analysis, in text order
+    skipped_sections: List[str] = field(default_factory=list)
+    # Whether analysis ran out of its time budget, so some text may not have been read
+    budget_exceeded: bool = False
 
 
 @dataclass
@@ -32,29 +467,44 @@ class SuperWeightCandidate:
     evidence: List[str]
 
 
+@dataclass
+class PaperAnalysis:
+    """Architecture and super-weight candidates from a single analysis of a paper."""
+    architecture: ModelArchitecture
+    candidates: List[SuperWeightCandidate]
+
+
 class SemanticAnalyzer:
     """Analyzes technical papers to extract architectural information and predict super-weight locations."""
     
-    def __init__(self) -> None:
-        """Initialize the semantic analyzer."""
+    def __init__(
+        self, workers: int | None = 1, early_stop: bool = False, time_budget: float | None = None
+    ) -> None:
+        """
+        Initialize the semantic analyzer.
+        
+        Args:
+            workers: Processes used to analyze long texts (None for one per CPU)
+            early_stop: Read sections in priority order (abstract, model, experiments, the
+                rest, appendix) and stop once the architecture is resolved
+            time_budget: Seconds allowed per document (None for no limit); extraction stops
+                when it runs out and the architecture is built from what was read
+            
+        Raises:
+            ValueError: If workers, early_stop or time_budget is invalid
+        """
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise ValueError("workers must be a positive integer or None")
+        if not isinstance(early_stop, bool):
+            raise ValueError("early_stop must be a boolean")
+        if time_budget is not None and (
+            isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) or time_budget <= 0
+        ):
+            raise ValueError("time_budget must be a positive number of seconds or None")
         self.logger = get_logger()
-        self.model_patterns = {
-            "llama": [r"llama", r"llama2", r"llama-2", r"llama3", r"llama-3"],
-            "mistral": [r"mistral"],
-            "gemma": [r"gemma"],
-            "phi": [r"phi[ -]?(1|2|3)"],
-            "mixtral": [r"mixtral"],
-            "olmo": [r"olmo"],
-            "gpt": [r"gpt[ -]?(2|3|4)"],
-            "bert": [r"bert"],
-            "t5": [r"t5"],
-            "bart": [r"bart"],
-            "opt": [r"opt"],
-            "bloom": [r"bloom"],
-            "falcon": [r"falcon"],
-            "mpt": [r"mpt"],
-            "starcoder": [r"starcoder", r"star[ -]*coder"],
-        }
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.early_stop = early_stop
+        self.time_budget = time_budget
         
         # Key architectural components we're looking for
         self.architecture_keywords = [
@@ -71,6 +521,11 @@ class SemanticAnalyzer:
             "stop word", "logit", "activation"
         ]
 
+    def signature(self) -> str:
+        """Describe the settings that affect analysis results, for keys of stored analyses."""
+        signature = f"{ANALYZER_VERSION}:{load_knowledge_base().version}"
+        return signature + (":early-stop" if self.early_stop else "")
+
     def _infer_model_family(self, text: str) -> str:
         """
         Infer the model family from text content.
@@ -84,117 +539,489 @@ class SemanticAnalyzer:
         if not isinstance(text, str):
             return "Unknown-Model"
             
-        lowered = text.lower()
-        for family, patterns in self.model_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, lowered):
-                    # Capitalize first letter
-                    return family.capitalize() + "-7B" if family in ["llama", "mistral", "olmo"] else family.capitalize()
-        return "Unknown-Model"
+        return self._rank_families(self._family_mentions(text))
 
-    def _extract_numerical_values(self, text: str) -> Dict[str, List[int]]:
+    @staticmethod
+    def _format_family(family: str, variant: str = "") -> str:
+        # Capitalize first letter and append the size or version, if known
+        if not variant:
+            default = load_knowledge_base().family_default(family)
+            variant = default.variant if default else ""
+        return f"{family.capitalize()}-{variant}" if variant else family.capitalize()
+
+    def _family_mentions(
+        self,
+        text: str,
+        index: TextIndex | None = None,
+        start: int = 0,
+        end: int | None = None,
+        deadline: float | None = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count model family mentions in text, by variant.
+        
+        Args:
+            text: Input text
+            index: Index of the text, if already built
+            start: With an index, count only within ``[start:end]`` of the indexed text
+            end: Span end (None for the end of the text)
+            deadline: ``time.monotonic()`` value after which scanning stops
+            
+        Returns:
+            Family key -> formatted variant ("" when none was given) -> number of mentions,
+            with variants in order of first mention
+        """
+        if index is None:
+            index, start, end = TextIndex(text), 0, None
+        mentions: Dict[str, Dict[str, int]] = {}
+        for match in _scan(_family_matcher(), " " + index.lower[start:end], deadline=deadline):
+            self._count_family_mention(mentions, match)
+        return mentions
+
+    @staticmethod
+    def _count_family_mention(mentions: Dict[str, Dict[str, int]], match: re.Match[str]) -> None:
+        """Add one ``_family_matcher`` match to the counts of ``_family_mentions``."""
+        family = re.sub(r"[ -]", "", match.group("name"))
+        version, version_size = match.group("version"), match.group("version_size")
+        if _MODEL_FAMILIES[family][1]:
+            # A named size extends the version ("GPT-2 XL" -> "2-XL"); a parameter count would
+            # not ("GPT-3 175B" is GPT-3, and "gpt3175b" is no knowledge-base name)
+            if version_size and not re.fullmatch(_NAMED_SIZES, version_size):
+                version_size = None
+            parts = [version, version_size] if version else []
+        else:
+            parts = [match.group("size") or version_size]
+        variant = "-".join(_format_variant(part) for part in parts if part)
+        if not variant and family in _AMBIGUOUS_FAMILIES and not _MODEL_CONTEXT.match(match.string, match.end()):
+            return
+        counts = mentions.setdefault(family, {})
+        counts[variant] = counts.get(variant, 0) + 1
+
+    def _rank_families(self, mentions: Dict[str, Dict[str, int]]) -> str:
+        """
+        Pick the most mentioned family and its most mentioned variant.
+        
+        Args:
+            mentions: Output of ``_family_mentions``
+            
+        Returns:
+            Formatted model family, e.g. "Llama-13B", or "Unknown-Model"
+        """
+        return self._top_family(mentions)[0]
+
+    def _top_family(self, mentions: Dict[str, Dict[str, int]]) -> Tuple[str, bool]:
+        """
+        Pick the most mentioned family and its most mentioned variant, noting whether the paper named one.
+        
+        Args:
+            mentions: Output of ``_family_mentions``
+            
+        Returns:
+            Tuple of (formatted model family as in ``_rank_families``, whether the paper named
+            its size or version rather than the knowledge base's default being assumed)
+        """
+        if not mentions:
+            return "Unknown-Model", False
+        order = list(_MODEL_FAMILIES)
+        family = max(mentions, key=lambda key: (sum(mentions[key].values()), -order.index(key)))
+        variants = {variant: count for variant, count in mentions[family].items() if variant}
+        # max() keeps the first of equally frequent variants
+        variant = max(variants, key=variants.__getitem__) if variants else ""
+        return self._format_family(family, variant), bool(variant)
+
+    def _extract_numerical_values(
+        self,
+        text: str,
+        params: Tuple[str, ...] = tuple(_NUMERIC_PATTERNS),
+        index: TextIndex | None = None,
+        deadline: float | None = None,
+    ) -> Dict[str, List[int]]:
         """
         Extract numerical values that might represent architectural parameters.
         
         Args:
             text: Input text
+            params: Parameters to look for (default: all)
+            index: Index of the text, if already built
+            deadline: ``time.monotonic()`` value after which scanning stops
             
         Returns:
             Dictionary mapping parameter names to lists of values
         """
-        results: Dict[str, List[int]] = defaultdict(list)
-        
-        # Patterns for common architectural parameters
-        patterns = {
-            "layers": [
-                r"(\d+)[ -]*(?:transformer[ -]*)?layers?",
-                r"num[ -]*layers?[ =:]?(\d+)",
-                r"depth[ =:]?(\d+)",
-                r"uses (\d+) transformer layers"
-            ],
-            "hidden_size": [
-                r"hidden[ -]*(?:size|dimension)[ =:]?(\d+)",
-                r"d[ _]?model[ =:]?(\d+)",
-                r"model[ -]*dimension[ =:]?(\d+)",
-                r"hidden (?:size|dimension) of (\d+)"
-            ],
-            "mlp_expansion": [
-                r"mlp[ -]*expansion[ =:]?(\d+)",
-                r"feed[ -]*forward[ -]*expansion[ =:]?(\d+)",
-                r"ffn[ -]*expansion[ =:]?(\d+)",
-                r"expansion[ -]*factor[ =:]?(\d+)",
-                r"MLP expansion of (\d+)",
-                r"MLP expansion factor is (\d+)"
-            ],
-            "attention_heads": [
-                r"attention[ -]*heads?[ =:]?(\d+)",
-                r"num[ -]*heads?[ =:]?(\d+)",
-                r"multi[ -]*head[ =:]?(\d+)",
-                r"(\d+)[ -]*heads?",
-                r"grouped[ -]*query[ -]*attention.*?(\d+)[ -]*heads?",
-                r"with (\d+) heads",
-                r"use (\d+) attention heads"
-            ]
-        }
+        results: Dict[str, List[int]] = {}
+        for param_name, per_pattern in self._numeric_matches(text, params, index=index, deadline=deadline).items():
+            values = [value for matches in per_pattern for value in matches]
+            if values:
+                results[param_name] = values
+        return results
+
+    def _numeric_matches(
+        self,
+        text: str,
+        params: Tuple[str, ...] = tuple(_NUMERIC_PATTERNS),
+        index: TextIndex | None = None,
+        start: int = 0,
+        end: int | None = None,
+        deadline: float | None = None,
+    ) -> Dict[str, List[List[int]]]:
+        """
+        Extract plausible architectural values, grouped by parameter and pattern.
         
-        for param_name, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        value = int(match)
-                        # Apply reasonable constraints to filter out false positives
-                        if param_name == "layers" and 5 <= value <= 100:
-                            results[param_name].append(value)
-                        elif param_name == "hidden_size" and 64 <= value <= 16384:
-                            results[param_name].append(value)
-                        elif param_name == "mlp_expansion" and 2 <= value <= 16:
-                            results[param_name].append(value)
-                        elif param_name == "attention_heads" and 1 <= value <= 128:
-                            results[param_name].append(value)
-                    except ValueError:
+        Every pattern matches within one line and contains a number, so only the stretches
+        of lines shortly before a number are scanned (see ``_number_windows``).
+        
+        Args:
+            text: Input text
+            params: Parameters to look for (default: all)
+            index: Index of the text, if already built
+            start: With an index, scan only ``[start:end]`` of the indexed text
+            end: Span end (None for the end of the text)
+            deadline: ``time.monotonic()`` value after which scanning stops
+            
+        Returns:
+            Dictionary mapping parameter names to one list of values per pattern
+        """
+        if index is None:
+            index, start, end = TextIndex(text), 0, None
+        return self._numeric_matches_many(index, [(start, len(index) if end is None else end)], params, deadline)[0]
+
+    def _numeric_matches_many(
+        self,
+        index: TextIndex,
+        spans: List[Tuple[int, int]],
+        params: Tuple[str, ...] = tuple(_NUMERIC_PATTERNS),
+        deadline: float | None = None,
+    ) -> List[Dict[str, List[List[int]]]]:
+        """
+        ``_numeric_matches`` for consecutive spans of one index, in a single pass.
+        
+        Args:
+            index: Index of the text
+            spans: (start, end) spans in text order; spans after the first start at line starts
+            params: Parameters to look for (default: all)
+            deadline: ``time.monotonic()`` value after which scanning stops
+            
+        Returns:
+            ``_numeric_matches`` of each span
+        """
+        if not spans:
+            return []
+        extractor = _numeric_extractor(params)
+        text = index.lower
+        starts = [start for start, _ in spans]
+        # Emulates re.findall per pattern: a pattern resumes only after its previous match.
+        # No match crosses a line, so one position per pattern serves every span
+        resume_at = [0] * len(extractor.params)
+        per_span: List[List[List[int]]] = [[[] for _ in extractor.params] for _ in spans]
+        for first, last, stop in _number_windows(index, spans[0][0], spans[-1][1], deadline):
+            for match in _scan(extractor.regex, text, first, stop, deadline):
+                pos = match.start()
+                if pos > last:
+                    break
+                per_pattern = per_span[bisect.bisect_right(starts, pos) - 1]
+                regs = match.regs
+                entries = extractor.by_first_char.get(text[pos], extractor.digit_entries)
+                for i, span_group, value_group, from_start in entries:
+                    span_start, span_end = regs[span_group]
+                    if span_start < 0 or pos < resume_at[i]:
                         continue
-                        
-        return dict(results)
+                    resume_at[i] = span_end
+                    value_start = pos if from_start else regs[value_group][0]
+                    value = int(text[value_start:regs[value_group][1]])
+                    # Apply reasonable constraints to filter out false positives
+                    low, high = _NUMERIC_RANGES[extractor.params[i]]
+                    if low <= value <= high:
+                        per_pattern[i].append(value)
 
-    def _extract_architecture_components(self, text: str) -> Tuple[List[str], List[str]]:
+        results = []
+        for per_pattern in per_span:
+            grouped: Dict[str, List[List[int]]] = defaultdict(list)
+            for param_name, values in zip(extractor.params, per_pattern):
+                grouped[param_name].append(values)
+            results.append(dict(grouped))
+        return results
+
+    def _config_values(self, text: str, model_family: str, deadline: float | None = None) -> Dict[str, int]:
+        """
+        Read architecture parameters from tables and config blocks, within the plausible ranges.
+        
+        Args:
+            text: Input text
+            model_family: Detected family; its size picks the matching row of multi-model tables
+            deadline: ``time.monotonic()`` value after which reading stops
+            
+        Returns:
+            Dictionary mapping parameter names to values
+        """
+        variant = model_family.partition("-")[2]
+        fields = extract_config_fields(text, variant if any(ch.isdigit() for ch in variant) else "", deadline)
+        return {
+            param_name: fields[param_name]
+            for param_name, (low, high) in _NUMERIC_RANGES.items()
+            if param_name in fields and low <= fields[param_name] <= high
+        }
+
+    def _extract_architecture_components(
+        self,
+        text: str,
+        index: TextIndex | None = None,
+        start: int = 0,
+        end: int | None = None,
+        deadline: float | None = None,
+    ) -> Tuple[List[str], List[str]]:
         """
         Extract mentioned architectural components and layers.
         
         Args:
             text: Input text
+            index: Index of the text, if already built
+            start: With an index, look only within ``[start:end]`` of the indexed text
+            end: Span end (None for the end of the text)
+            deadline: ``time.monotonic()`` value after which scanning stops
             
         Returns:
             Tuple of (key_components, mentioned_layers)
         """
+        if index is None:
+            index = TextIndex(text)
+        if end is None:
+            end = len(index)
         key_components: Set[str] = set()
         mentioned_layers: Set[str] = set()
         
         # Look for architectural components
         for keyword in self.architecture_keywords:
-            if re.search(r"\b" + re.escape(keyword) + r"\b", text, re.IGNORECASE):
+            if index.has_word(keyword, start, end):
                 key_components.add(keyword)
                 
-        # Look for layer mentions (especially early layers)
-        layer_patterns = [
-            r"(?:layer|block)[ -]*(\d+)",
-            r"early[ -]*(?:layer|block)[s]?[ -]*(?:\d+(?:[ ,-]*\d+)*)?",
-            r"first[ -]*(?:\d+)[ -]*(?:layer|block)[s]?",
-        ]
-        
-        for pattern in layer_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                mentioned_layers.add(match if isinstance(match, str) else str(match))
+        # Look for layer mentions (especially early layers), as written in the original text
+        if index.contains("layer", start, end) or index.contains("block", start, end):
+            for pattern in _LAYER_PATTERNS:
+                for match in _scan(pattern, index.lower, start, end, deadline):
+                    mentioned_layers.add(match.group(1) if pattern.groups else index.text[match.start():match.end()])
                 
         # Special handling for down_proj which might be written differently
-        if re.search(r"down[ -]*proj", text, re.IGNORECASE):
-            key_components.add("down.proj")
-        if re.search(r"down[ -]*projection", text, re.IGNORECASE):
+        if next(_scan(_DOWN_PROJ, index.lower, start, end, deadline), None) is not None:
             key_components.add("down.proj")
                 
         return list(key_components), list(mentioned_layers)
 
+    def _chunk_features(
+        self, chunk: str, index: TextIndex | None = None, start: int = 0, deadline: float | None = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract everything ``analyze_paper`` needs from one chunk, in a mergeable form.
+        
+        Args:
+            chunk: Chunk of paper text ending at a newline (or at the end of the text)
+            index: Index of the whole text the chunk was taken from, if already built
+            start: Offset of the chunk in the indexed text
+            deadline: ``time.monotonic()`` value after which scanning stops
+            
+        Returns:
+            JSON-serializable features: family mention counts, per-pattern numeric values,
+            key components and mentioned layers; None if the deadline passed before the
+            chunk was fully scanned
+        """
+        if index is None:
+            index, start = TextIndex(chunk), 0
+        end = start + len(chunk)
+        key_components, mentioned_layers = self._extract_architecture_components(chunk, index, start, end, deadline)
+        features = {
+            "families": self._family_mentions(chunk, index, start, end, deadline),
+            "numbers": self._numeric_matches(chunk, index=index, start=start, end=end, deadline=deadline),
+            "components": sorted(key_components),
+            "layers": sorted(mentioned_layers),
+        }
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return features
+
+    def _features_for_chunks(
+        self,
+        chunks: List[str],
+        index: TextIndex | None = None,
+        starts: Dict[str, int] | None = None,
+        deadline: float | None = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract ``_chunk_features`` for every chunk, in a process pool when there is enough text.
+        
+        Args:
+            chunks: Consecutive chunks of paper text
+            index: Index of the whole text, used when the chunks are analyzed in this process
+            starts: Offset of each chunk in the indexed text
+            deadline: ``time.monotonic()`` value after which scanning stops
+            
+        Returns:
+            Features per chunk (None for chunks cut short by the deadline), in chunk order
+        """
+        if self.workers > 1 and sum(map(len, chunks)) >= PARALLEL_MIN_CHARS:
+            batches = [chunks[i:i + _CHUNKS_PER_TASK] for i in range(0, len(chunks), _CHUNKS_PER_TASK)]
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+                    return [features for batch in pool.map(_chunk_features_batch, batches, repeat(deadline)) for features in batch]
+            except (OSError, BrokenProcessPool) as e:
+                self.logger.warning(f"Parallel analysis failed, analyzing serially: {e}")
+        if index is not None and starts is not None:
+            return [self._chunk_features(chunk, index, starts[chunk], deadline) for chunk in chunks]
+        return [self._chunk_features(chunk, deadline=deadline) for chunk in chunks]
+
+    def _merge_chunk_features(
+        self, features: List[Optional[Dict[str, Any]]]
+    ) -> Tuple[str, Dict[str, List[int]], List[str], List[str], bool]:
+        """
+        Combine per-chunk features into what whole-text extraction would have found.
+        
+        Args:
+            features: Output of ``_chunk_features`` for consecutive chunks, in text order;
+                chunks cut short by the time budget (None) are left out
+            
+        Returns:
+            Tuple of (model_family, numerical_values, key_components, mentioned_layers,
+            whether the family's size or version was named)
+        """
+        families: Dict[str, Dict[str, int]] = {}
+        per_pattern: Dict[str, List[List[int]]] = {}
+        key_components: Set[str] = set()
+        mentioned_layers: Set[str] = set()
+        for chunk in features:
+            if chunk is None:
+                continue
+            for family, counts in chunk["families"].items():
+                merged_counts = families.setdefault(family, {})
+                for variant, count in counts.items():
+                    merged_counts[variant] = merged_counts.get(variant, 0) + count
+            for param_name, matches in chunk["numbers"].items():
+                merged = per_pattern.setdefault(param_name, [[] for _ in matches])
+                for values, found in zip(merged, matches):
+                    values.extend(found)
+            key_components.update(chunk["components"])
+            mentioned_layers.update(chunk["layers"])
+
+        model_family, variant_named = self._top_family(families)
+        numerical_values: Dict[str, List[int]] = {}
+        for param_name, matches in per_pattern.items():
+            values = [value for found in matches for value in found]
+            if values:
+                numerical_values[param_name] = values
+        return model_family, numerical_values, list(key_components), list(mentioned_layers), variant_named
+
+    def _prioritized_section_features(
+        self,
+        text: str,
+        memo: ChunkMemo | None = None,
+        index: TextIndex | None = None,
+        deadline: float | None = None,
+    ) -> Tuple[List[Tuple[int, int]], List[Dict[str, Any]], List[str]]:
+        """
+        Extract ``_chunk_features`` section by section in priority order until the architecture is resolved.
+        
+        Resolved means a family named with a size (or mentioned repeatedly), layers, hidden
+        size and heads from free text or a table, and down_proj evidence.
+        
+        Args:
+            text: Input paper text
+            memo: Optional persistent chunk memo, keyed by section content
+            index: Index of the text, if already built
+            deadline: ``time.monotonic()`` value after which the remaining sections are skipped
+            
+        Returns:
+            Tuple of (analyzed spans, their features, skipped section titles), all in text order
+        """
+        if index is None:
+            index = TextIndex(text)
+        sections = _paper_sections(text, deadline)
+        order = sorted(range(len(sections)), key=lambda i: (sections[i][1], i))
+        kind = f"features:{ANALYZER_VERSION}"
+        analyzed: Dict[int, Dict[str, Any]] = {}
+        mentions: Dict[str, int] = {}
+        sized: Set[str] = set()
+        found: Set[str] = set()
+        components: Set[str] = set()
+        resolved = False
+        for i in order:
+            _, _, start, end = sections[i]
+            section = text[start:end]
+            if memo is not None:
+                features = memo.memoize(
+                    [section], kind, lambda chunk: self._chunk_features(chunk, index, start, deadline)
+                )[0]
+            else:
+                features = self._chunk_features(section, index, start, deadline)
+            if features is None:
+                break
+            analyzed[i] = features
+
+            for family, counts in features["families"].items():
+                mentions[family] = mentions.get(family, 0) + sum(counts.values())
+                if any(counts):
+                    sized.add(family)
+            found.update(param_name for param_name, matches in features["numbers"].items() if any(matches))
+            found.update(self._config_values(section, "", deadline))
+            components.update(features["components"])
+            family_resolved = bool(sized) or any(count >= _EARLY_STOP_FAMILY_MENTIONS for count in mentions.values())
+            if family_resolved and found.issuperset(_EARLY_STOP_PARAMS) and "down.proj" in components:
+                resolved = True
+                break
+
+        spans = [(sections[i][2], sections[i][3]) for i in sorted(analyzed)]
+        skipped = [sections[i][0] for i in range(len(sections)) if i not in analyzed]
+        if skipped and resolved:
+            self.logger.info(
+                f"Architecture resolved after {len(analyzed)} of {len(sections)} sections; skipped: {', '.join(skipped)}"
+            )
+        return spans, [analyzed[i] for i in sorted(analyzed)], skipped
+
+    def _batch_features(self, index: TextIndex, spans: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """
+        Extract ``_chunk_features`` for many documents indexed as one newline-separated text.
+        
+        No pattern matches across a newline, so each family, layer and down_proj pattern and
+        each architecture keyword is scanned once over the whole text and its matches are
+        assigned to the document they fall in.
+        
+        Args:
+            index: Index of the documents joined by newlines
+            spans: (start, end) of each document in the indexed text, in text order
+            
+        Returns:
+            Features per document, equal to ``_chunk_features`` of each document on its own
+        """
+        lower, text = index.lower, index.text
+        starts = [start for start, _ in spans]
+        features: List[Dict[str, Any]] = [
+            {"families": {}, "numbers": numbers} for numbers in self._numeric_matches_many(index, spans)
+        ]
+        components: List[Set[str]] = [set() for _ in spans]
+        layers: List[Set[str]] = [set() for _ in spans]
+
+        # Match offsets in " " + lower are one past the text's, so a match's leading \W is
+        # the newline before its document (or the space, for the first)
+        for match in _scan(_family_matcher(), " " + lower):
+            self._count_family_mention(features[bisect.bisect_right(starts, match.start()) - 1]["families"], match)
+
+        for keyword in self.architecture_keywords:
+            step = len(keyword)
+            for pos in index._occurrences(keyword, 0, len(lower)):
+                doc = bisect.bisect_right(starts, pos) - 1
+                start, end = spans[doc]
+                before = lower[pos - 1] if pos > start else " "
+                after = lower[pos + step] if pos + step < end else " "
+                if not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_"):
+                    components[doc].add(keyword)
+        for pattern in _LAYER_PATTERNS:
+            for match in _scan(pattern, lower):
+                doc = bisect.bisect_right(starts, match.start()) - 1
+                layers[doc].add(match.group(1) if pattern.groups else text[match.start():match.end()])
+        for match in _scan(_DOWN_PROJ, lower):
+            components[bisect.bisect_right(starts, match.start()) - 1].add("down.proj")
+
+        for doc_features, doc_components, doc_layers in zip(features, components, layers):
+            doc_features["components"] = sorted(doc_components)
+            doc_features["layers"] = sorted(doc_layers)
+        return features
+
     def _identify_superweight_candidates(self, architecture: ModelArchitecture) -> List[SuperWeightCandidate]:
         """
         Identify candidate super-weight locations based on architecture.
@@ -268,36 +1095,56 @@ class SemanticAnalyzer:
                 
         return candidates
 
-    def analyze_paper(self, text: str) -> ModelArchitecture:
+    def _build_architecture(
+        self,
+        model_family: str,
+        numerical_values: Dict[str, List[int]],
+        config_values: Dict[str, int],
+        key_components: List[str],
+        mentioned_layers: List[str],
+        skipped_sections: List[str] | None = None,
+        budget_exceeded: bool = False,
+        lookup: Callable[[str], Any] = lookup_model,
+        variant_named: bool = False,
+    ) -> ModelArchitecture:
         """
-        Analyze a paper to extract model architecture information.
+        Resolve extracted values into a ModelArchitecture.
         
         Args:
-            text: Input paper text
+            model_family: Detected family
+            numerical_values: Free-text values per parameter, in text order (updated in place)
+            config_values: Values from tables and config blocks
+            key_components: Mentioned components
+            mentioned_layers: Mentioned layers
+            skipped_sections: Sections left out by early stopping
+            budget_exceeded: Whether the time budget ran out
+            lookup: Knowledge-base lookup, e.g. one memoized across a batch
+            variant_named: Whether the paper named the family's size or version; only then is
+                the published config of that model used to fill in missing values
             
         Returns:
-            ModelArchitecture with extracted information
+            ModelArchitecture
         """
-        if not isinstance(text, str):
-            raise TypeError("text must be a string")
+        # Values from a table or config block beat the last free-text mention
+        for param_name, value in config_values.items():
+            numerical_values[param_name] = [value]
             
-        self.logger.info("Analyzing paper for architectural information")
-        
-        # Infer model family
-        model_family = self._infer_model_family(text)
-        
-        # Extract numerical values
-        numerical_values = self._extract_numerical_values(text)
-        
-        # Extract architecture components
-        key_components, mentioned_layers = self._extract_architecture_components(text)
+        # Published config of the named model fills in whatever the paper does not state. A family
+        # named without a size says nothing about its shape, so its default size is not used here
+        known = lookup(model_family) if variant_named else None
+        if known is not None:
+            numerical_values.setdefault("layers", [known.num_layers])
+            numerical_values.setdefault("hidden_size", [known.hidden_size])
+            numerical_values.setdefault("attention_heads", [known.attention_heads])
+            if known.intermediate_size % known.hidden_size == 0:
+                numerical_values.setdefault("mlp_expansion", [known.intermediate_size // known.hidden_size])
         
         # Look for parameter constraints
         parameter_constraints: Dict[str, str] = {}
         if "down.proj" in " ".join(key_components).lower():
             parameter_constraints["down_proj"] = "super-weight candidate"
             
-        architecture = ModelArchitecture(
+        return ModelArchitecture(
             model_family=model_family,
             num_layers=numerical_values.get("layers", [None])[-1] if numerical_values.get("layers") else None,
             hidden_size=numerical_values.get("hidden_size", [None])[-1] if numerical_values.get("hidden_size") else None,
@@ -305,18 +1152,203 @@ class SemanticAnalyzer:
             attention_heads=numerical_values.get("attention_heads", [None])[-1] if numerical_values.get("attention_heads") else None,
             key_components=key_components,
             mentioned_layers=mentioned_layers,
-            parameter_constraints=parameter_constraints
+            parameter_constraints=parameter_constraints,
+            skipped_sections=skipped_sections or [],
+            budget_exceeded=budget_exceeded,
+        )
+
+    def analyze_paper(
+        self, text: str, memo: ChunkMemo | None = None, text_index: TextIndex | None = None
+    ) -> ModelArchitecture:
+        """
+        Analyze a paper to extract model architecture information.
+        
+        Layer count, hidden size, heads and MLP expansion come from architecture tables and
+        config blocks when the paper has them; free-text patterns fill in the rest.
+        
+        Texts of ``PARALLEL_MIN_CHARS`` or more are split into the same chunks the memo
+        uses and analyzed across ``workers`` processes; the merged result is identical.
+        
+        With ``early_stop``, sections are read one at a time in priority order and the rest
+        are skipped once the architecture is resolved; the result is what analyzing only the
+        read sections gives, and ``skipped_sections`` lists the others.
+        
+        Every extraction pattern runs in linear time over bounded windows. With a
+        ``time_budget``, scanning stops when it runs out (chunks and sections cut short
+        are left out, and never memoized) and ``budget_exceeded`` is set on the result.
+        
+        Args:
+            text: Input paper text
+            memo: Optional persistent chunk memo; the text is split into content-defined
+                chunks and only chunks not seen before are analyzed (same result)
+            text_index: Index of the text already built by the caller (e.g. for selection);
+                chunks and sections are analyzed as spans of it (pool workers excepted)
+            
+        Returns:
+            ModelArchitecture with extracted information
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        if text_index is not None and text_index.text is not text and text_index.text != text:
+            raise ValueError("text_index was built for a different text")
+            
+        self.logger.info("Analyzing paper for architectural information")
+        deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        
+        skipped_sections: List[str] = []
+        if self.early_stop:
+            spans, features, skipped_sections = self._prioritized_section_features(text, memo, text_index, deadline)
+            merged = self._merge_chunk_features(features)
+            model_family, numerical_values, key_components, mentioned_layers, variant_named = merged
+            config_values = self._config_values(
+                "".join(text[start:end] for start, end in spans), model_family, deadline
+            )
+        elif memo is not None or (self.workers > 1 and len(text) >= PARALLEL_MIN_CHARS):
+            spans = _content_defined_spans(text, _FEATURE_CHUNK_TARGET, _FEATURE_CHUNK_MIN)
+            chunks = [text[start:end] for start, end in spans]
+            # Chunks are analyzed as spans of one index; features depend only on chunk content
+            index = text_index if text_index is not None else TextIndex(text)
+            starts = {chunk: start for chunk, (start, _) in zip(chunks, spans)}
+            if memo is not None:
+                features = memo.memoize(
+                    chunks,
+                    f"features:{ANALYZER_VERSION}",
+                    lambda chunk: self._chunk_features(chunk, index, starts[chunk], deadline),
+                    lambda missing: self._features_for_chunks(missing, index, starts, deadline),
+                )
+            else:
+                features = self._features_for_chunks(chunks, index, starts, deadline)
+            merged = self._merge_chunk_features(features)
+            model_family, numerical_values, key_components, mentioned_layers, variant_named = merged
+            config_values = self._config_values(text, model_family, deadline)
+        else:
+            index = text_index if text_index is not None else TextIndex(text)
+            
+            # Infer model family
+            model_family, variant_named = self._top_family(self._family_mentions(text, index, deadline=deadline))
+            
+            # Architecture tables and config blocks first; scan free text only for what they lack
+            config_values = self._config_values(text, model_family, deadline)
+            missing = tuple(param_name for param_name in _NUMERIC_PATTERNS if param_name not in config_values)
+            numerical_values = self._extract_numerical_values(text, missing, index, deadline) if missing else {}
+            
+            # Extract architecture components
+            key_components, mentioned_layers = self._extract_architecture_components(text, index, deadline=deadline)
+        
+        budget_exceeded = deadline is not None and time.monotonic() >= deadline
+        if budget_exceeded:
+            self.logger.warning(
+                f"Analysis ran out of its {self.time_budget}s time budget; the architecture may be incomplete"
+            )
+        
+        architecture = self._build_architecture(
+            model_family,
+            numerical_values,
+            config_values,
+            key_components,
+            mentioned_layers,
+            skipped_sections=skipped_sections,
+            budget_exceeded=budget_exceeded,
+            variant_named=variant_named,
         )
         
         self.logger.info(f"Extracted architecture: {architecture.model_family} with {len(key_components)} key components")
         return architecture
 
-    def predict_superweight_candidates(self, text: str) -> List[SuperWeightCandidate]:
+    def analyze(
+        self, text: str, memo: ChunkMemo | None = None, text_index: TextIndex | None = None
+    ) -> PaperAnalysis:
+        """
+        Extract the architecture and super-weight candidates in one pass over the text.
+        
+        Args:
+            text: Input paper text
+            memo: Optional persistent chunk memo (see ``analyze_paper``)
+            text_index: Index of the text, if already built (see ``analyze_paper``)
+            
+        Returns:
+            PaperAnalysis with the architecture and its candidates
+        """
+        architecture = self.analyze_paper(text, memo, text_index)
+        candidates = self._identify_superweight_candidates(architecture)
+        self.logger.info(f"Identified {len(candidates)} super-weight candidates")
+        return PaperAnalysis(architecture=architecture, candidates=candidates)
+
+    def analyze_many(self, texts: Sequence[str], memo: ChunkMemo | None = None) -> List[PaperAnalysis]:
+        """
+        Analyze many papers, e.g. thousands of abstracts, with shared work.
+        
+        Papers shorter than one feature chunk are lowercased and indexed as one text, each
+        pattern scans them all at once, and knowledge-base lookups and candidate lists are
+        shared between papers of the same family and shape. Longer papers, and every paper
+        with ``early_stop`` or a ``time_budget``, go through ``analyze``. Results equal
+        ``analyze`` on each paper.
+        
+        Args:
+            texts: Paper texts
+            memo: Optional persistent chunk memo, used for the papers analyzed one by one
+            
+        Returns:
+            PaperAnalysis per text, in order
+            
+        Raises:
+            TypeError: If a text is not a string
+        """
+        if not all(isinstance(text, str) for text in texts):
+            raise TypeError("text must be a string")
+            
+        results: List[Optional[PaperAnalysis]] = [None] * len(texts)
+        batched: List[int] = []
+        for i, text in enumerate(texts):
+            if self.early_stop or self.time_budget is not None or len(text) >= _FEATURE_CHUNK_TARGET:
+                results[i] = self.analyze(text, memo)
+            else:
+                batched.append(i)
+        if not batched:
+            return results
+            
+        self.logger.info(f"Analyzing {len(batched)} papers in one batch")
+        spans: List[Tuple[int, int]] = []
+        offset = 0
+        for i in batched:
+            spans.append((offset, offset + len(texts[i])))
+            offset += len(texts[i]) + 1
+        index = TextIndex("\n".join(texts[i] for i in batched))
+        known: Dict[str, Any] = {}
+
+        def lookup(family: str) -> Any:
+            if family not in known:
+                known[family] = lookup_model(family)
+            return known[family]
+
+        candidates: Dict[Tuple[Any, ...], List[SuperWeightCandidate]] = {}
+        for i, features in zip(batched, self._batch_features(index, spans)):
+            merged = self._merge_chunk_features([features])
+            model_family, numerical_values, key_components, mentioned_layers, variant_named = merged
+            config_values = self._config_values(texts[i], model_family)
+            architecture = self._build_architecture(
+                model_family,
+                numerical_values,
+                config_values,
+                key_components,
+                mentioned_layers,
+                lookup=lookup,
+                variant_named=variant_named,
+            )
+            # Candidates depend only on the layer count and the components
+            key = (architecture.num_layers, tuple(sorted(key_components)))
+            if key not in candidates:
+                candidates[key] = self._identify_superweight_candidates(architecture)
+            results[i] = PaperAnalysis(architecture=architecture, candidates=list(candidates[key]))
+        return results
+
+    def predict_superweight_candidates(self, text: str, memo: ChunkMemo | None = None) -> List[SuperWeightCandidate]:
         """
         Predict super-weight candidates from paper text.
         
         Args:
             text: Input paper text
+            memo: Optional persistent chunk memo (see ``analyze_paper``)
             
         Returns:
             List of super-weight candidates
@@ -325,12 +1357,16 @@ class SemanticAnalyzer:
             raise TypeError("text must be a string")
             
         self.logger.info("Predicting super-weight candidates")
-        
-        # Analyze the paper
-        architecture = self.analyze_paper(text)
-        
-        # Identify candidates
-        candidates = self._identify_superweight_candidates(architecture)
-        
-        self.logger.info(f"Identified {len(candidates)} super-weight candidates")
-        return candidates
\ No newline at end of file
+        return self.analyze(text, memo).candidates
+
+
+@lru_cache(maxsize=1)
+def _worker_analyzer() -> SemanticAnalyzer:
+    """The analyzer used by pool workers, created once per process."""
+    return SemanticAnalyzer()
+
+
+def _chunk_features_batch(chunks: List[str], deadline: float | None = None) -> List[Optional[Dict[str, Any]]]:
+    """Process-pool task: features for a batch of consecutive chunks."""
+    analyzer = _worker_analyzer()
+    return [analyzer._chunk_features(chunk, deadline=deadline) for chunk in chunks]
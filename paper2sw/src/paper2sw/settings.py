@@ -30,6 +30,20 @@ class SettingsScreen(ModalScreen[dict]):
                     value=str(self.settings.get("keep_ratio", 1.0))
                 )
                 
+                yield Label("Max Chars (optional):")
+                yield Input(
+                    placeholder="Hard cap on selected characters",
+                    id="max_chars_input",
+                    value=str(self.settings.get("max_chars") or "")
+                )
+                
+                yield Label("Max Tokens (optional):")
+                yield Input(
+                    placeholder="Hard cap on selected tokens",
+                    id="max_tokens_input",
+                    value=str(self.settings.get("max_tokens") or "")
+                )
+                
                 yield Checkbox(
                     "Enable Cache",
                     id="cache_checkbox",
@@ -54,12 +68,20 @@ class SettingsScreen(ModalScreen[dict]):
             try:
                 top_k = int(self.query_one("#top_k_input", Input).value or "5")
                 keep_ratio = float(self.query_one("#keep_ratio_input", Input).value or "1.0")
+                max_chars_value = self.query_one("#max_chars_input", Input).value.strip()
+                max_tokens_value = self.query_one("#max_tokens_input", Input).value.strip()
+                max_chars = int(max_chars_value) if max_chars_value else None
+                max_tokens = int(max_tokens_value) if max_tokens_value else None
+                if (max_chars is not None and max_chars <= 0) or (max_tokens is not None and max_tokens <= 0):
+                    raise ValueError("budgets must be positive")
                 enable_cache = self.query_one("#cache_checkbox", Checkbox).value
                 model_id = self.query_one("#model_id_input", Input).value or "paper2sw/paper2sw-diff-semantic"
                 
                 settings = {
                     "top_k": top_k,
                     "keep_ratio": keep_ratio,
+                    "max_chars": max_chars,
+                    "max_tokens": max_tokens,
                     "enable_cache": enable_cache,
                     "model_id": model_id
                 }
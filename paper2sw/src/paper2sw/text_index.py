@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Characters that IGNORECASE matches against ASCII letters but str.lower() leaves alone
+# (or, for U+0130, lowers to two characters)
+_CASE_FOLD_FIXES = {"\u0130": "i", "\u0131": "i", "\u017f": "s"}
+_CASE_FOLD_TABLE = str.maketrans(_CASE_FOLD_FIXES)
+
+_NUMBER = re.compile(r"\d+")
+
+
+def _case_fold(text: str) -> str:
+    """Lowercase text so case-sensitive matching agrees with ``re.IGNORECASE``, keeping offsets."""
+    if not text.isascii() and any(ch in text for ch in _CASE_FOLD_FIXES):
+        text = text.translate(_CASE_FOLD_TABLE)
+    return text.lower()
+
+
+def _has_border(keyword: str) -> bool:
+    """Whether a keyword can overlap itself ("aba" in "ababa"), so occurrences are not all countable."""
+    return any(keyword[:i] == keyword[-i:] for i in range(1, len(keyword)))
+
+
+class TextIndex:
+    """
+    Case-folded view of one document with lookups shared by selection and analysis.
+
+    The document is lowercased once (offsets match the original text); keyword positions
+    and number positions are found on first use and cached, so each is one scan of the
+    document however many chunks or stages ask for it.
+    """
+
+    def __init__(self, text: str) -> None:
+        """
+        Index a document.
+
+        Args:
+            text: Document text
+
+        Raises:
+            TypeError: If text is not a string
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        self.text = text
+        self.lower = _case_fold(text)
+        self._positions: Dict[str, List[int]] = {}
+        self._numbers: Optional[List[Tuple[int, int]]] = None
+        self._number_lines: Optional[List[Tuple[int, int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def positions(self, keyword: str) -> List[int]:
+        """
+        Start offsets of a lowercase keyword, non-overlapping like ``str.count``.
+
+        Args:
+            keyword: Lowercase keyword
+
+        Returns:
+            Sorted start offsets (shared; do not modify)
+        """
+        found = self._positions.get(keyword)
+        if found is None:
+            found = []
+            if keyword:
+                lower, step = self.lower, len(keyword)
+                pos = lower.find(keyword)
+                while pos >= 0:
+                    found.append(pos)
+                    pos = lower.find(keyword, pos + step)
+            self._positions[keyword] = found
+        return found
+
+    def count(self, keyword: str, start: int = 0, end: int | None = None) -> int:
+        """
+        Count a lowercase keyword in ``lower[start:end]``, as ``str.count`` on that slice would.
+
+        Args:
+            keyword: Lowercase keyword
+            start: Start offset
+            end: End offset (None for the end of the document)
+
+        Returns:
+            Number of non-overlapping occurrences within the span
+        """
+        # Counting in place on the shared buffer beats bisecting cached positions: it runs
+        # in C and needs no slice copy
+        return self.lower.count(keyword, start, len(self.lower) if end is None else end)
+
+    def _occurrences(self, keyword: str, start: int, end: int) -> List[int]:
+        """Start offsets of every occurrence within ``lower[start:end]``, overlapping ones included."""
+        if not _has_border(keyword):
+            # Occurrences of a keyword that cannot overlap itself are exactly its cached positions
+            found = self.positions(keyword)
+            return found[bisect.bisect_left(found, start):bisect.bisect_right(found, end - len(keyword))]
+        found = []
+        pos = self.lower.find(keyword, start, end)
+        while pos >= 0:
+            found.append(pos)
+            pos = self.lower.find(keyword, pos + 1, end)
+        return found
+
+    def contains(self, keyword: str, start: int = 0, end: int | None = None) -> bool:
+        """Whether a lowercase keyword occurs within ``lower[start:end]``."""
+        return bool(self._occurrences(keyword, start, len(self.lower) if end is None else end))
+
+    def has_word(self, keyword: str, start: int = 0, end: int | None = None) -> bool:
+        """
+        Whether a lowercase keyword occurs as a whole word, as ``\\bkeyword\\b`` would match.
+
+        Args:
+            keyword: Lowercase keyword starting and ending with a word character
+            start: Span start offset; the span is matched as if it were the whole text
+            end: Span end offset (None for the end of the document)
+
+        Returns:
+            True if some occurrence is not preceded or followed by a word character
+        """
+        lower, step = self.lower, len(keyword)
+        if end is None:
+            end = len(lower)
+        for pos in self._occurrences(keyword, start, end):
+            before = lower[pos - 1] if pos > start else " "
+            after = lower[pos + step] if pos + step < end else " "
+            if not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_"):
+                return True
+        return False
+
+    @property
+    def numbers(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of every run of digits, in text order."""
+        if self._numbers is None:
+            self._numbers = [match.span() for match in _NUMBER.finditer(self.lower)]
+        return self._numbers
+
+    def number_lines(self, start: int = 0, end: int | None = None) -> List[Tuple[int, int]]:
+        """
+        Spans of consecutive lines that contain a number.
+
+        Args:
+            start: Only report lines within ``lower[start:end]``, clipped to it
+            end: End offset (None for the end of the document)
+
+        Returns:
+            (start, end) spans in text order; each starts at a line start and ends after a
+            newline or at the end of the document (or the requested span)
+        """
+        if self._number_lines is None:
+            lower = self.lower
+            spans: List[Tuple[int, int]] = []
+            line_end = -1
+            for number_start, _ in self.numbers:
+                if number_start < line_end:
+                    continue
+                line_start = lower.rfind("\n", 0, number_start) + 1
+                line_end = lower.find("\n", number_start) + 1 or len(lower)
+                if spans and spans[-1][1] == line_start:
+                    spans[-1] = (spans[-1][0], line_end)
+                else:
+                    spans.append((line_start, line_end))
+            self._number_lines = spans
+        if start == 0 and end is None:
+            return self._number_lines
+        if end is None:
+            end = len(self.lower)
+        spans = self._number_lines
+        first = bisect.bisect_right(spans, (start, end))
+        if first and spans[first - 1][1] > start:
+            first -= 1
+        clipped = []
+        for line_start, line_end in spans[first:]:
+            if line_start >= end:
+                break
+            clipped.append((max(line_start, start), min(line_end, end)))
+        return clipped
@@ -78,6 +78,14 @@ class Paper2SWTUI(App):
 
     def __init__(self):
         super().__init__()
+        self.settings = {
+            "top_k": 10,
+            "keep_ratio": 1.0,
+            "max_chars": None,
+            "max_tokens": None,
+            "enable_cache": True,
+            "model_id": "paper2sw/paper2sw-diff-semantic",
+        }
         self.predictor = Predictor.from_pretrained()
         self.predictions = []
         self.current_directory = "."
@@ -155,7 +163,7 @@ class Paper2SWTUI(App):
             progress_bar.update(total=100, progress=20)
             
             # Perform prediction
-            predictions = self.predictor.predict(paper_path, top_k=10)
+            predictions = self.predictor.predict(paper_path, top_k=self.settings["top_k"])
             self.predictions = predictions
             
             progress_bar.update(total=100, progress=80)
@@ -224,21 +232,24 @@ class Paper2SWTUI(App):
 
     def action_settings(self) -> None:
         """Open settings dialog."""
-        # Current settings
-        current_settings = {
-            "top_k": 10,  # Default value
-            "keep_ratio": 1.0,  # Default value
-            "enable_cache": True,  # Default value
-            "model_id": "paper2sw/paper2sw-diff-semantic"  # Default value
-        }
-        
         def handle_settings_change(new_settings: dict | None) -> None:
             if new_settings is not None:
-                # Apply new settings
+                # Apply new settings by rebuilding the predictor
+                try:
+                    self.predictor = Predictor.from_pretrained(
+                        model_id=new_settings["model_id"],
+                        enable_cache=new_settings["enable_cache"],
+                        selection_keep_ratio=new_settings["keep_ratio"],
+                        selection_max_chars=new_settings["max_chars"],
+                        selection_max_tokens=new_settings["max_tokens"],
+                    )
+                except ValueError as e:
+                    self.notify(f"Invalid settings: {e}", severity="error")
+                    return
+                self.settings = new_settings
                 self.notify(f"Settings updated: {new_settings}", severity="information")
-                # In a full implementation, you would update the predictor with new settings
         
-        self.push_screen(SettingsScreen(current_settings), handle_settings_change)
+        self.push_screen(SettingsScreen(dict(self.settings)), handle_settings_change)
 
     def action_export(self) -> None:
         """Export predictions to a file."""
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, asdict
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
 
 
 @dataclass
@@ -39,4 +39,66 @@ class SuperWeightPrediction:
             },
             "required": ["model_family", "layer", "row", "col", "value"],
             "additionalProperties": True,
-        }
\ No newline at end of file
+        }
+
+
+@dataclass
+class PredictionColumns:
+    """Predictions for one paper stored column-wise, which is compact for large top_k."""
+
+    model_family: str
+    layer: List[int]
+    row: List[int]
+    col: List[int]
+    value: List[float]
+
+    def __len__(self) -> int:
+        return len(self.layer)
+
+    def __iter__(self) -> Iterator[SuperWeightPrediction]:
+        family = self.model_family
+        for layer, row, col, value in zip(self.layer, self.row, self.col, self.value):
+            yield SuperWeightPrediction(family, layer, row, col, value)
+
+    def to_predictions(self) -> List[SuperWeightPrediction]:
+        return list(self)
+
+
+@dataclass
+class PredictionBatch:
+    """Predictions for many papers in shared columns; paper i owns entries ``offsets[i]:offsets[i + 1]``."""
+
+    model_family: List[str]
+    offsets: List[int]
+    layer: List[int]
+    row: List[int]
+    col: List[int]
+    value: List[float]
+
+    def __len__(self) -> int:
+        return len(self.model_family)
+
+    def __getitem__(self, i: int) -> PredictionColumns:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("paper index out of range")
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return PredictionColumns(
+            self.model_family[i], self.layer[start:end], self.row[start:end], self.col[start:end], self.value[start:end]
+        )
+
+    def __iter__(self) -> Iterator[PredictionColumns]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, columns: PredictionColumns) -> None:
+        self.model_family.append(columns.model_family)
+        self.layer.extend(columns.layer)
+        self.row.extend(columns.row)
+        self.col.extend(columns.col)
+        self.value.extend(columns.value)
+        self.offsets.append(len(self.layer))
+
+    def to_lists(self) -> List[List[SuperWeightPrediction]]:
+        return [columns.to_predictions() for columns in self]
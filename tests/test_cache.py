@@ -4,7 +4,8 @@ import pytest
 import tempfile
 import os
 from pathlib import Path
-from paper2sw.cache import CacheManager
+from paper2sw.cache import CacheManager, ChunkMemo, SelectionCache, content_hash, file_content_hash, file_content_stats
+from paper2sw.selector import SelectedText
 from paper2sw.types import SuperWeightPrediction
 
 
@@ -205,4 +206,169 @@ def test_cache_manager_different_parameters():
         
         assert cached_predictions2 is not None
         assert len(cached_predictions2) == 1
-        assert cached_predictions2[0].to_dict() == predictions2[0].to_dict()
\ No newline at end of file
+        assert cached_predictions2[0].to_dict() == predictions2[0].to_dict()
+
+
+def test_content_hashes():
+    """Test content hashing of text and files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "paper.txt"
+        path.write_bytes("Llama paper \u00e9".encode("utf-8"))
+
+        assert content_hash("Llama paper \u00e9") == file_content_hash(path)
+        assert content_hash("a") != content_hash("b")
+
+
+def test_file_content_stats_counts_characters_as_read():
+    """Test that one pass gives the file hash and the length a text handle reads."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "paper.txt"
+        path.write_bytes(("Überblick \u00e9 超级权重\r\n" * 50 + "\r").encode("utf-8") + b"\xff tail")
+        with path.open("r", encoding="utf-8", errors="ignore") as handle:
+            expected = len(handle.read())
+
+        for block_size in (1, 3, 7, 1 << 20):
+            assert file_content_stats(path, block_size=block_size) == (file_content_hash(path), expected)
+
+
+def test_selection_cache_memory_and_disk_tiers():
+    """Test that selections are served from memory and survive on disk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = SelectionCache(cache_dir=tmpdir, enabled=True, max_memory_entries=1)
+        selected = SelectedText(text="kept text", kept_fraction=0.5, num_chunks=2)
+        key = cache.key(content_hash=content_hash("paper"), keep_ratio=0.5, query_hint=None, selector="1:fixed")
+
+        assert cache.get(key) is None
+        cache.put(key, selected)
+        assert cache.get(key) is selected
+        assert (Path(tmpdir) / "selection" / f"{key}.json").exists()
+
+        other = cache.key(content_hash=content_hash("other"), keep_ratio=0.5, query_hint=None, selector="1:fixed")
+        cache.put(other, SelectedText(text="other", kept_fraction=1.0, num_chunks=1))
+        assert key not in cache._memory
+
+        fresh = SelectionCache(cache_dir=tmpdir, enabled=True)
+        assert fresh.get(key) == selected
+
+
+def test_selection_cache_keys_and_disabled():
+    """Test that settings change the key and a disabled cache stores nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = SelectionCache(cache_dir=tmpdir, enabled=False)
+        digest = content_hash("paper")
+        base = cache.key(content_hash=digest, keep_ratio=0.5, query_hint=None, selector="1:fixed")
+
+        assert base != cache.key(content_hash=digest, keep_ratio=0.4, query_hint=None, selector="1:fixed")
+        assert base != cache.key(content_hash=digest, keep_ratio=0.5, query_hint="mlp", selector="1:fixed")
+        assert base != cache.key(content_hash=digest, keep_ratio=0.5, query_hint=None, selector="1:structured")
+
+        cache.put(base, SelectedText(text="x", kept_fraction=1.0, num_chunks=1))
+        assert cache.get(base) is None
+        assert not list((Path(tmpdir) / "selection").iterdir())
+
+
+def test_selection_cache_concurrent_access():
+    """Test that concurrent gets and puts neither fail nor leave temp files behind."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = SelectionCache(cache_dir=tmpdir, enabled=True, max_memory_entries=4)
+        keys = [cache.key(content_hash=content_hash(str(i)), keep_ratio=0.5, query_hint=None, selector="1:fixed")
+                for i in range(8)]
+
+        def work(i):
+            key = keys[i % len(keys)]
+            selected = SelectedText(text=f"text {i % len(keys)}", kept_fraction=0.5, num_chunks=1)
+            cache.put(key, selected)
+            return cache.get(key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(work, range(400)))
+
+        assert [r.text for r in results] == [f"text {i % len(keys)}" for i in range(400)]
+        assert sorted(p.name for p in (Path(tmpdir) / "selection").iterdir()) == sorted(f"{k}.json" for k in keys)
+
+
+def test_chunk_memo_persists_and_computes_misses_only():
+    """Test that the chunk memo reuses stored results across instances and kinds stay separate."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        calls = []
+
+        def compute(chunk):
+            calls.append(chunk)
+            return {"length": len(chunk)}
+
+        memo = ChunkMemo(cache_dir=tmpdir)
+        assert memo.memoize(["a", "bb", "a"], "len", compute) == [{"length": 1}, {"length": 2}, {"length": 1}]
+        assert calls == ["a", "bb"]
+
+        fresh = ChunkMemo(cache_dir=tmpdir)
+        assert fresh.memoize(["bb", "ccc"], "len", compute) == [{"length": 2}, {"length": 3}]
+        assert calls == ["a", "bb", "ccc"]
+        assert fresh.memoize(["a"], "other", compute) == [{"length": 1}]
+        assert calls[-1] == "a"
+
+
+def test_chunk_memo_disabled():
+    """Test that a disabled chunk memo always computes and creates no database."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        memo = ChunkMemo(cache_dir=tmpdir, enabled=False)
+        assert memo.memoize(["x", "x"], "len", len) == [1, 1]
+        assert not memo.path.exists()
+
+
+def test_chunk_memo_computes_outside_the_lock():
+    """Test that one caller computing misses does not block another caller of the memo."""
+    import threading
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        memo = ChunkMemo(cache_dir=tmpdir)
+        computing = threading.Event()
+        other_done = threading.Event()
+        waited = []
+
+        def slow(chunk):
+            computing.set()
+            waited.append(other_done.wait(timeout=5))
+            return len(chunk)
+
+        worker = threading.Thread(target=lambda: memo.memoize(["slow chunk"], "len", slow))
+        worker.start()
+        assert computing.wait(timeout=5)
+        assert memo.memoize(["other", "slow chunk"], "len", len) == [5, 10]
+        other_done.set()
+        worker.join()
+
+        assert waited == [True]
+        assert memo.memoize(["slow chunk"], "len", lambda chunk: -1) == [10]
+
+
+def test_analysis_store_bulk_lookup_and_versions():
+    """Test that analyses persist by exact content and analyzer signature."""
+    from paper2sw.cache import AnalysisStore
+    from paper2sw.semantic_analyzer import SemanticAnalyzer
+
+    analyzer = SemanticAnalyzer()
+    text = "Llama-13B has 40 layers.\nThe super weight sits in an early mlp.down_proj."
+    analysis = analyzer.analyze(text)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = AnalysisStore(cache_dir=tmpdir)
+        assert store.get_many("v", []) == []
+        store.put_many(analyzer.signature(), [(text, analysis)])
+
+        fresh = AnalysisStore(cache_dir=tmpdir)
+        assert fresh.get_many(analyzer.signature(), [text, "Unseen paper", text]) == [analysis, None, analysis]
+        
+        # Extraction is line-sensitive, so rejoined lines are a different paper
+        wrapped = "Our model has hidden size\n5120 and we use 40\nlayers in total."
+        joined = wrapped.replace("\n", " ")
+        fresh.put(analyzer.signature(), wrapped, analyzer.analyze(wrapped))
+        assert analyzer.analyze(joined).architecture.num_layers == 40
+        assert fresh.get(analyzer.signature(), wrapped).architecture.num_layers is None
+        assert fresh.get(analyzer.signature(), joined) is None
+        assert fresh.get(SemanticAnalyzer(early_stop=True).signature(), text) is None
+
+        disabled = AnalysisStore(cache_dir=Path(tmpdir) / "off", enabled=False)
+        disabled.put("v", text, analysis)
+        assert disabled.get("v", text) is None
+        assert not disabled.path.exists()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from paper2sw.config_tables import extract_config_fields
+
+_LATEX_TABLE = r"""
+\begin{table}[t]
+\centering
+\begin{tabular}{@{}lccc@{}}
+\toprule
+Model & $n_{\text{layers}}$ & $d_{\text{model}}$ & $n_{\text{heads}}$ \\
+\midrule
+LLaMA-7B & 32 & 4{,}096 & 32 \\
+LLaMA-13B & \textbf{40} & 5,120 & 40 \\
+\bottomrule
+\end{tabular}
+\end{table}
+"""
+
+
+def test_latex_tabular_rows_per_model():
+    """Test a LaTeX tabular with one row per model, picking the detected size."""
+    assert extract_config_fields(_LATEX_TABLE) == {"layers": 32, "hidden_size": 4096, "attention_heads": 32}
+    assert extract_config_fields(_LATEX_TABLE, "13B") == {"layers": 40, "hidden_size": 5120, "attention_heads": 40}
+
+
+def test_markdown_key_value_table():
+    """Test a two-column Markdown table and the derived MLP expansion."""
+    text = """Training details follow.
+
+| Hyper-parameter | Value |
+|---|---|
+| Layers | 24 |
+| Hidden size | 2048 |
+| Intermediate size | 8192 |
+| Attention heads (per layer) | 16 |
+| Learning rate | 3e-4 |
+"""
+    assert extract_config_fields(text) == {
+        "layers": 24,
+        "hidden_size": 2048,
+        "intermediate_size": 8192,
+        "attention_heads": 16,
+        "mlp_expansion": 4,
+    }
+
+
+def test_transposed_latex_table_picks_model_column():
+    """Test a table with one row per field and one column per model."""
+    text = r"\begin{tabular}{l|cc} & 7B & 13B \\ \hline Layers & 32 & 40 \\ Heads & 32 & 40 \\ \end{tabular}"
+    assert extract_config_fields(text) == {"layers": 32, "attention_heads": 32}
+    assert extract_config_fields(text, "13B") == {"layers": 40, "attention_heads": 40}
+
+
+def test_config_blocks():
+    """Test JSON/YAML/Python style assignments and prose that only looks like one."""
+    config = 'config = {"num_hidden_layers": 28, "hidden_size": 3072, "num_attention_heads": 24, "intermediate_size": 11008}'
+    assert extract_config_fields(config) == {
+        "layers": 28, "hidden_size": 3072, "attention_heads": 24, "intermediate_size": 11008
+    }
+    text = "Table 3: 32 runs. We use a hidden size: 1024 and batch size: 512.\n- Number of layers: 12\nn_layers = 6\n"
+    assert extract_config_fields(text) == {"hidden_size": 1024, "layers": 12}
+    assert extract_config_fields("No configuration here | just pipes | in prose.") == {}
+
+
+def test_first_source_wins():
+    """Test that tables take precedence over later config blocks."""
+    text = _LATEX_TABLE + "\nhidden_size: 8192\nmlp_ratio: 4\n"
+    assert extract_config_fields(text) == {
+        "layers": 32, "hidden_size": 4096, "attention_heads": 32, "mlp_expansion": 4
+    }
+
+
+def test_deadline_stops_reading():
+    """Test that a passed deadline keeps only what was read before it."""
+    import time
+
+    text = _LATEX_TABLE + "\n| layers | 12 |\n| heads | 8 |\n" + "\nhidden_size: 8192\n"
+    assert extract_config_fields(text, deadline=time.monotonic() - 1) == {}
+    assert extract_config_fields(text, deadline=time.monotonic() + 60) == extract_config_fields(text)
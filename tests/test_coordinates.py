@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from paper2sw.coordinates import iter_coordinates, sample_coordinates
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_sample_coordinates_distinct_and_in_range(use_numpy):
+    """Test that coordinates are distinct, inside the shape, and capped at the space size."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    layers, rows, cols, values = sample_coordinates(1, 2, (12, 768, 3072), 5000, use_numpy)
+    triples = list(zip(layers, rows, cols))
+    assert len(set(triples)) == 5000
+    assert all(0 <= l < 12 and 0 <= r < 768 and 0 <= c < 3072 for l, r, c in triples)
+    assert all(isinstance(v, float) and -20.0 <= v < 20.0 for v in values)
+    
+    # A space smaller than k is drawn in full
+    layers, rows, cols, _ = sample_coordinates(3, 4, (2, 3, 4), 30, use_numpy)
+    assert sorted(zip(layers, rows, cols)) == [(l, r, c) for l in range(2) for r in range(3) for c in range(4)]
+    assert sample_coordinates(3, 4, (2, 3, 4), 0, use_numpy) == ([], [], [], [])
+
+
+def test_sample_coordinates_engines_identical():
+    """Test that the NumPy engine reproduces the scalar engine exactly."""
+    pytest.importorskip("numpy")
+    for shape in ((12, 768, 3072), (1, 5, 7), (80, 8192, 28672)):
+        for k in (1, 5, 35, 1000):
+            for keys in ((0, 0), (2**64 - 1, 12345), (987654321, 2**63)):
+                assert sample_coordinates(*keys, shape, k, True) == sample_coordinates(*keys, shape, k, False)
+    assert sample_coordinates(1, 2, (12, 768, 3072), 5) != sample_coordinates(3, 2, (12, 768, 3072), 5)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_iter_coordinates_blocks_concatenate_to_sample(use_numpy):
+    """Test that coordinate blocks are bounded and concatenate to sample_coordinates' columns."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    for shape, k in (((12, 768, 3072), 5000), ((2, 3, 4), 30), ((1, 5, 7), 35)):
+        blocks = list(iter_coordinates(5, 6, shape, k, 64, use_numpy))
+        assert all(0 < len(block[0]) <= 64 for block in blocks)
+        columns = tuple([value for block in blocks for value in block[i]] for i in range(4))
+        assert columns == sample_coordinates(5, 6, shape, k, use_numpy)
+    assert list(iter_coordinates(5, 6, (2, 3, 4), 0, use_numpy=use_numpy)) == []
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_coordinates_skip_excluded(use_numpy):
+    """Test that excluded coordinates are never drawn and both engines and block sizes agree."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    exclude = {(0, 1, 2), (1, 2, 3), (5, 0, 0)}  # the last lies outside the space
+    layers, rows, cols, _ = sample_coordinates(7, 8, (2, 3, 4), 30, use_numpy, exclude)
+    drawn = set(zip(layers, rows, cols))
+    assert len(drawn) == 22 and not drawn & exclude
+    
+    columns = sample_coordinates(7, 8, (12, 768, 3072), 2000, use_numpy, exclude)
+    assert columns == sample_coordinates(7, 8, (12, 768, 3072), 2000, not use_numpy, exclude)
+    blocks = list(iter_coordinates(7, 8, (2, 3, 4), 30, 5, use_numpy, exclude))
+    assert tuple([value for block in blocks for value in block[i]] for i in range(4)) == sample_coordinates(
+        7, 8, (2, 3, 4), 30, use_numpy, exclude
+    )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import math
+import tempfile
+from pathlib import Path
+
+import pytest
+from paper2sw.corpus_index import BM25Scorer, CorpusIndex, build_corpus_index, tokenize
+from paper2sw.selector import select_relevant
+
+
+def _write_corpus(root: Path) -> None:
+    (root / "a.md").write_text("The model uses mlp down_proj weights.")
+    (root / "b.tex").write_text("The model has attention layers.")
+    (root / "c.txt").write_text("The model is evaluated on benchmarks.")
+    (root / "ignored.bin").write_text("down_proj down_proj down_proj")
+
+
+def test_tokenize():
+    """Test the tokenizer."""
+    assert tokenize("MLP.down_proj, Layer-2") == ["mlp", "down", "proj", "layer", "2"]
+    assert tokenize("") == []
+
+
+def test_build_and_load_corpus_index():
+    """Test building an index and reading document frequencies back."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _write_corpus(root)
+        out = root / "corpus.idx"
+
+        index = build_corpus_index([root], out)
+
+        assert out.exists()
+        assert index.num_docs == 3
+        assert index.doc_freq("model") == 3
+        assert index.doc_freq("proj") == 1
+        assert index.doc_freq("unseen") == 0
+        assert index.idf("proj") > index.idf("model")
+        assert index.idf("unseen") == pytest.approx(math.log(1 + 3.5 / 0.5))
+
+        reopened = CorpusIndex(out)
+        assert reopened.doc_freq("attention") == 1
+
+
+def test_corpus_index_errors():
+    """Test error handling for missing or invalid indexes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        with pytest.raises(FileNotFoundError):
+            CorpusIndex(root / "missing.idx")
+
+        bogus = root / "bogus.idx"
+        bogus.write_bytes(b"not an index at all")
+        with pytest.raises(ValueError, match="Not a paper2sw corpus index"):
+            CorpusIndex(bogus)
+
+        empty = root / "empty"
+        empty.mkdir()
+        with pytest.raises(ValueError, match="No documents"):
+            build_corpus_index([empty], root / "out.idx")
+
+
+def test_bm25_downweights_common_terms():
+    """Test that BM25 prefers rare query terms over corpus-wide ones."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _write_corpus(root)
+        index = build_corpus_index([root], root / "corpus.idx")
+
+        scorer = BM25Scorer(index, {"model": 5, "down_proj": 5})
+        assert scorer.score("down_proj down_proj") > scorer.score("model model")
+        assert scorer.score("") == 0.0
+
+        text = "model " * 400 + "\n" + "filler " * 300 + "down_proj " * 3 + "filler " * 300
+        result = select_relevant(text, keep_ratio=0.2, scoring="bm25", index=index)
+        assert "down_proj" in result.text
+
+        with pytest.raises(ValueError, match="Unknown scoring mode"):
+            select_relevant(text, scoring="tfidf", index=index)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from paper2sw.model import SemanticDiffusionModel
 from paper2sw.types import SuperWeightPrediction
@@ -33,6 +36,169 @@ def test_semantic_diffusion_model_validation():
         SemanticDiffusionModel(model_id="test-model", device="cpu", precision=123)
 
 
+def test_matrix_dimension_for_detected_family():
+    """Test that detected family names (with size variants) resolve to their dimensions."""
+    model = SemanticDiffusionModel(model_id="test-model")
+    
+    assert model._get_matrix_dimension(model._infer_model_family("Llama-2 13B")) == 5120
+    assert model._get_matrix_dimension(model._infer_model_family("GPT-2 small")) == 768
+    assert model._get_matrix_dimension(model._infer_model_family("BERT-large")) == 1024
+    assert model._get_matrix_dimension(model._infer_model_family("no family here")) == 4096
+
+
+def test_predictions_fall_inside_real_matrix_shape():
+    """Test that coordinates respect the detected model's down_proj shape and layer count."""
+    model = SemanticDiffusionModel(model_id="test-model")
+    
+    predictions = model.predict("GPT-2 medium: the super weight in mlp.down_proj of an early layer.", top_k=20, seed=0)
+    assert predictions and all(p.model_family == "Gpt-2-Medium" for p in predictions)
+    assert all(p.layer < 24 and p.row < 1024 and p.col < 4096 for p in predictions)
+    
+    heuristic = model._generate_heuristic_predictions("BERT-base paper", top_k=50, seed=0)
+    assert all(p.layer < 12 and p.row < 768 and p.col < 3072 for p in heuristic)
+
+
+def test_heuristic_predictions_in_bulk():
+    """Test that large heuristic top_k gives distinct, reproducible coordinates with either engine."""
+    model = SemanticDiffusionModel(model_id="test-model")
+    
+    text = "BERT-base paper"
+    columns = model.predict_columns(text, top_k=20000, seed=3, use_numpy=False)
+    assert len(columns) == 20000 and columns.model_family == "Bert-Base"
+    assert all(l < 12 and r < 768 and c < 3072 for l, r, c in zip(columns.layer, columns.row, columns.col))
+    # Candidates come first and the rest are distinct heuristic coordinates
+    assert model.predict(text, top_k=5, seed=3) == columns.to_predictions()[:5]
+    assert len(set(zip(columns.layer[5:], columns.row[5:], columns.col[5:]))) == 20000 - 5
+    
+    heuristic = model._generate_heuristic_predictions(text, top_k=3000, seed=3)
+    assert len({(p.layer, p.row, p.col) for p in heuristic}) == 3000
+    assert model._generate_heuristic_predictions(text, top_k=10, seed=3) == heuristic[:10]
+    
+    pytest.importorskip("numpy")
+    assert model.predict_columns(text, top_k=20000, seed=3, use_numpy=True) == columns
+
+
+def test_candidates_and_heuristics_never_share_coordinates(monkeypatch):
+    """Test that a top_k past the candidates gives distinct coordinates, even in a tiny space."""
+    model = SemanticDiffusionModel(model_id="test-model")
+    monkeypatch.setattr(model, "_get_matrix_shape", lambda family, component, lookup=None: (2, 3))
+    text = "Llama-13B: the super weight sits in an early mlp.down_proj of layer 2."
+    assert len(model.analyze(text).candidates) == 15
+    
+    # 12 early layers of 2 x 3 matrices hold 72 coordinates, 15 of them the candidates'
+    columns = model.predict_columns(text, top_k=200, seed=1, use_numpy=False)
+    assert len(columns) == 72
+    assert len(set(zip(columns.layer, columns.row, columns.col))) == 72
+    blocks = list(model.iter_columns(text, top_k=200, seed=1, use_numpy=False, block_size=8))
+    assert [p for block in blocks for p in block] == columns.to_predictions()
+    
+    pytest.importorskip("numpy")
+    assert model.predict_columns(text, top_k=200, seed=1, use_numpy=True) == columns
+
+
+def test_iter_predict_matches_predict():
+    """Test that streamed predictions come in bounded blocks and equal predict's."""
+    model = SemanticDiffusionModel(model_id="test-model")
+    
+    for text in ("BERT-base paper", "A paper about nothing in particular."):
+        columns = model.predict_columns(text, top_k=3000, seed=4)
+        blocks = list(model.iter_columns(text, top_k=3000, seed=4, block_size=256))
+        assert all(len(block) <= 256 for block in blocks[1:])
+        assert [p for block in blocks for p in block] == columns.to_predictions()
+        assert list(model.iter_predict(text, top_k=7, seed=4, block_size=2)) == model.predict(text, top_k=7, seed=4)
+    assert list(model.iter_predict("BERT-base paper", top_k=0)) == []
+    
+    # Arguments are checked when the generator is created, not when it is first consumed
+    with pytest.raises(TypeError, match="text must be a string"):
+        model.iter_predict(123, top_k=5)
+    with pytest.raises(ValueError, match="block_size must be a positive integer"):
+        model.iter_predict("BERT-base paper", top_k=5, block_size=0)
+
+
+def test_semantic_diffusion_model_reuses_analysis(monkeypatch):
+    """Test that repeated predictions on a paper analyze it once, in a single pass."""
+    model = SemanticDiffusionModel(model_id="test-model", analysis_cache_size=2)
+    calls = []
+    analyze_paper = model.analyzer.analyze_paper
+    monkeypatch.setattr(model.analyzer, "analyze_paper", lambda text, memo=None, text_index=None: calls.append(text) or analyze_paper(text, memo, text_index))
+    
+    text = "Llama-2 13B has 40 layers; the super weight sits in an early mlp.down_proj."
+    first = model.predict(text, top_k=3, seed=1)
+    assert model.predict(text, top_k=3, seed=1) == first
+    assert len(model.predict(text, top_k=5, seed=2)) == 5
+    assert calls == [text]
+    
+    # Least recently used papers are evicted
+    model.predict("Mistral paper", top_k=1)
+    model.predict("Gemma paper", top_k=1)
+    model.predict(text, top_k=1)
+    assert calls == [text, "Mistral paper", "Gemma paper", text]
+    
+    with pytest.raises(ValueError, match="analysis_cache_size must be a non-negative integer"):
+        SemanticDiffusionModel(model_id="test-model", analysis_cache_size=-1)
+
+
+def test_seeded_predictions_reproducible_under_concurrency():
+    """Test that seeded predictions match sequential output however many run at once."""
+    model = SemanticDiffusionModel(model_id="test-model", analysis_cache_size=2)
+    texts = [
+        "Llama-2 13B has 40 layers; the super weight sits in an early mlp.down_proj.",
+        "GPT-2 medium: the super weight in mlp.down_proj of an early layer.",
+        "Mistral-7B uses grouped-query attention with 8 key-value heads.",
+        "A paper without any architecture details.",
+    ]
+    calls = [(texts[i % len(texts)], 1 + i % 7, i % 5) for i in range(400)]
+    sequential = [model.predict(text, top_k=top_k, seed=seed) for text, top_k, seed in calls]
+    
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        concurrent = list(pool.map(lambda call: model.predict(call[0], top_k=call[1], seed=call[2]), calls))
+    assert concurrent == sequential
+    
+    # A fresh model, and unrelated use of the global generator, give the same results
+    random.seed(0)
+    state = random.getstate()
+    assert SemanticDiffusionModel(model_id="test-model").predict(texts[0], top_k=3, seed=4) == sequential[44]
+    assert random.getstate() == state
+    
+    # The seed and the content both select the stream
+    assert model.predict(texts[0], top_k=3, seed=5) != sequential[44]
+    assert model.predict(texts[0] + " ", top_k=3, seed=4) != sequential[44]
+
+
+def test_predict_many_matches_predict(monkeypatch):
+    """Test that batched prediction gives each paper its own predictions and caches analyses."""
+    model = SemanticDiffusionModel(model_id="test-model", analysis_cache_size=8)
+    texts = [
+        "Llama-2 13B has 40 layers; the super weight sits in an early mlp.down_proj.",
+        "GPT-2 medium: the super weight in mlp.down_proj of an early layer.",
+        "A paper without any architecture details.",
+        "Mistral-7B uses grouped-query attention with 8 key-value heads.",
+    ]
+    batch = model.predict_many(texts, top_k=6, seeds=[1, 2, None, 4])
+    assert len(batch) == 4 and batch.offsets == [0, 6, 12, 18, 24]
+    assert [columns.model_family for columns in batch] == batch.model_family
+    assert [batch[i].to_predictions() for i in (0, 1, 3)] == [
+        model.predict(texts[i], top_k=6, seed=seed) for i, seed in ((0, 1), (1, 2), (3, 4))
+    ]
+    assert model.predict_many(texts, top_k=3, seeds=5).to_lists() == [model.predict(t, top_k=3, seed=5) for t in texts]
+    assert batch[-1] == batch[3] and batch[-4] == batch[0]
+    for i in (4, -5):
+        with pytest.raises(IndexError):
+            batch[i]
+    
+    # Analyses come from the in-memory cache the second time
+    monkeypatch.setattr(model.analyzer, "analyze_many", lambda *args: pytest.fail("papers should not be reanalyzed"))
+    assert model.predict_many(texts, top_k=2, seeds=0).to_lists() == [model.predict(t, top_k=2, seed=0) for t in texts]
+    
+    assert model.predict_many(texts, top_k=0).offsets == [0] * 5
+    with pytest.raises(ValueError, match="seeds must be an integer, None or one seed per text"):
+        model.predict_many(texts, seeds=[1, 2])
+    with pytest.raises(TypeError, match="seed must be an integer or None"):
+        model.predict_many(texts, seeds=["1"] * 4)
+    with pytest.raises(TypeError, match="text must be a string"):
+        model.predict_many(texts + [None])
+
+
 def test_semantic_diffusion_model_predict():
     """Test the predict method."""
     model = SemanticDiffusionModel(
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from paper2sw.model_configs import (
+    ModelConfig,
+    ModelKnowledgeBase,
+    load_knowledge_base,
+    lookup_model,
+    normalize_model_name,
+)
+
+
+def test_bundled_knowledge_base():
+    """Test lookups, family defaults and matrix shapes from the bundled data file."""
+    knowledge_base = load_knowledge_base()
+    assert knowledge_base.version == "1"
+    assert len(knowledge_base) > 50
+
+    llama = lookup_model("LLaMA-13B")
+    assert (llama.num_layers, llama.hidden_size, llama.intermediate_size) == (40, 5120, 13824)
+    assert llama.matrix_shape("mlp.down_proj") == (5120, 13824)
+    assert llama.matrix_shape("attention.q_proj") == (5120, 5120)
+    assert lookup_model("Opt-1.3B").name == "OPT-1.3B"
+    assert lookup_model("opt-13b").name == "OPT-13B"
+    assert lookup_model("Unknown-Model") is None
+    assert knowledge_base.family_default("llama").name == "Llama-7B"
+    assert knowledge_base.family_default("gpt").variant == "2"
+
+
+def test_trie_prefix_lookup():
+    """Test longest-prefix matches that stop at number boundaries."""
+    knowledge_base = ModelKnowledgeBase(
+        [ModelConfig("GPT-3", 96, 12288, 49152, 96), ModelConfig("Falcon-40B", 60, 8192, 32768, 128)]
+    )
+    assert normalize_model_name("Falcon 40B-Instruct") == "falcon40binstruct"
+    assert knowledge_base.lookup("Falcon 40B-Instruct").name == "Falcon-40B"
+    assert knowledge_base.lookup("gpt-3") is not None
+    assert knowledge_base.lookup("GPT-35") is None
+    assert knowledge_base.lookup("GPT-3.5") is None
+    assert knowledge_base.lookup("") is None
+
+
+def test_large_knowledge_base_from_file():
+    """Test loading a versioned file with thousands of entries."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "configs.tsv"
+        rows = [f"Synth-{i}B\t{i % 100 + 1}\t{64 * (i + 1)}\t{256 * (i + 1)}\t8" for i in range(5000)]
+        path.write_text("# version: 7\n" + "\n".join(rows) + "\nSynth-42B\t1\t2\t3\t4\t*\n", encoding="utf-8")
+
+        knowledge_base = load_knowledge_base(path)
+        assert knowledge_base.version == "7"
+        assert len(knowledge_base) == 5000
+        assert knowledge_base.lookup("synth-4999b").hidden_size == 64 * 5000
+        assert knowledge_base.family_default("synth").hidden_size == 2
+
+        assert len(load_knowledge_base(Path(tmpdir) / "missing.tsv")) == 0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from paper2sw.near_duplicates import (
+    NUM_SLOTS,
+    lsh_buckets,
+    minhash,
+    pack_sketch,
+    shingles,
+    similarity,
+    unpack_sketch,
+)
+from paper2sw.predictor import Predictor
+
+
+def _paper(rng: random.Random, words: int = 3000) -> str:
+    vocabulary = [f"term{i}" for i in range(2000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_minhash_estimates_jaccard_similarity():
+    """Test that sketch similarity tracks the Jaccard similarity of shingle sets."""
+    rng = random.Random(0)
+    text = _paper(rng)
+    words = text.split()
+    revised = " ".join(words[:1500] + ["an", "added", "sentence"] + words[1500:2900])
+    sketch, revised_sketch = minhash(text), minhash(revised)
+    exact = len(shingles(text) & shingles(revised)) / len(shingles(text) | shingles(revised))
+    assert abs(similarity(sketch, revised_sketch) - exact) < 0.1
+    assert similarity(sketch, minhash(_paper(rng))) < 0.1
+
+    # Markup and case do not change the shingles
+    assert minhash(text) == minhash("<p>" + text.upper().replace(" ", ", ") + "</p>")
+    assert len(set(lsh_buckets(sketch)) & set(lsh_buckets(revised_sketch))) > 0
+    assert unpack_sketch(pack_sketch(sketch)) == sketch
+    assert len(minhash("A short note.")) == NUM_SLOTS
+    assert minhash("") is None and minhash("-- %") is None
+
+
+def test_predictor_reuses_near_duplicate_analysis(monkeypatch):
+    """Test that a new version of an analyzed paper reuses its analysis and records the match."""
+    from paper2sw.semantic_analyzer import SemanticAnalyzer
+
+    analyzed = []
+    analyze_paper = SemanticAnalyzer.analyze_paper
+    monkeypatch.setattr(
+        SemanticAnalyzer, "analyze_paper", lambda self, text, *args: analyzed.append(text) or analyze_paper(self, text, *args)
+    )
+    rng = random.Random(1)
+    body = _paper(rng)
+    original = "Llama-13B has 40 layers and the super weight sits in an early mlp.down_proj.\n" + body
+    revised = original.replace("term1 ", "term2 ", 3) + "\nAcknowledgements: thanks to the reviewers."
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for name, text in (("v1.txt", original), ("v2.txt", revised), ("other.txt", _paper(rng))):
+            paths.append(Path(tmpdir) / name)
+            paths[-1].write_text(text)
+
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir, near_duplicate_threshold=0.8)
+        first = predictor.predict(str(paths[0]), top_k=3, seed=5)
+        reused = predictor.predict(str(paths[1]), top_k=3, seed=5)
+        assert [(p.model_family, p.layer) for p in reused] == [(p.model_family, p.layer) for p in first]
+        assert analyzed == [original]
+        match = predictor.analysis_store.recorded_match(revised)
+        assert match is not None and match[0] == predictor.analysis_store.paper_key(original) and match[1] >= 0.8
+
+        predictor.predict(str(paths[2]), top_k=3)
+        assert len(analyzed) == 2
+        assert predictor.analysis_store.recorded_match(paths[2].read_text()) is None
+
+        # Without a threshold every paper is analyzed
+        Predictor.from_pretrained(cache_dir=Path(tmpdir) / "plain").predict(str(paths[1]), top_k=3)
+        assert len(analyzed) == 3
+
+    with pytest.raises(ValueError, match="near_duplicate_threshold must be a number in"):
+        Predictor.from_pretrained(enable_cache=False, near_duplicate_threshold=1.5)
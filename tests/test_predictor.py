@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import pytest
+import tempfile
 from pathlib import Path
 from paper2sw.predictor import Predictor
+from paper2sw.selector import SelectedText, normalize_query_hints, select_relevant
 from paper2sw.types import SuperWeightPrediction
 
 
@@ -106,6 +108,48 @@ def test_predictor_predict():
         test_file.unlink()
 
 
+def test_predictor_iter_predict_streams_to_disk():
+    """Test that iter_predict equals predict and save_jsonl writes it as it is drawn."""
+    import json
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text("Llama-7B has 32 layers; the super weight sits in an early mlp.down_proj.")
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir)
+        
+        streamed = predictor.iter_predict(str(paper), top_k=2000, seed=1)
+        assert not isinstance(streamed, list)
+        out = Path(tmpdir) / "out.jsonl"
+        assert predictor.save_jsonl(streamed, out) == 2000
+        rows = [json.loads(line) for line in out.read_text().splitlines()]
+        expected = predictor.predict(str(paper), top_k=2000, seed=1, use_cache=False)
+        assert rows == [p.to_dict() for p in expected]
+        
+        # Small runs are cached once fully drawn, and replayed from the cache
+        assert predictor.cache.get(model_id=predictor.model_id, text=paper.read_text(), top_k=2000, seed=1) == expected
+        assert list(predictor.iter_predict(str(paper), top_k=2000, seed=1)) == expected
+
+
+def test_predictor_cache_keys_follow_versions(monkeypatch):
+    """Test that cached predictions are not served across generator, analyzer or knowledge-base versions."""
+    import paper2sw.predictor as predictor_module
+    import paper2sw.semantic_analyzer as analyzer_module
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        text = "Llama-7B has 32 layers; the super weight sits in an early mlp.down_proj."
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir)
+        predictor.cache.put(model_id=predictor.model_id, text=text, top_k=3, seed=1, predictions=[])
+        assert Predictor.from_pretrained(cache_dir=tmpdir).cache.get(
+            model_id=predictor.model_id, text=text, top_k=3, seed=1
+        ) == []
+        
+        for module, name in ((predictor_module, "PREDICTION_VERSION"), (analyzer_module, "ANALYZER_VERSION")):
+            with monkeypatch.context() as patch:
+                patch.setattr(module, name, "next")
+                bumped = Predictor.from_pretrained(cache_dir=tmpdir)
+                assert bumped.cache.get(model_id=predictor.model_id, text=text, top_k=3, seed=1) is None
+
+
 def test_predictor_predict_batch():
     """Test the predict_batch method."""
     predictor = Predictor.from_pretrained()
@@ -130,4 +174,253 @@ def test_predictor_predict_batch():
     finally:
         # Clean up test files
         test_file1.unlink()
-        test_file2.unlink()
\ No newline at end of file
+        test_file2.unlink()
+
+
+def test_predictor_streams_large_local_files(monkeypatch):
+    """Test that large local files go through streaming selection."""
+    import paper2sw.predictor as predictor_module
+
+    monkeypatch.setattr(predictor_module, "STREAM_SELECTION_MIN_BYTES", 1000)
+    predictor = Predictor.from_pretrained(enable_cache=False, selection_keep_ratio=0.25)
+    text = ("Unrelated filler text. " * 100 + "The mlp.down_proj super weight. ") * 10
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text(text)
+
+        assert predictor._streamable_path(str(paper)) == paper
+        assert predictor._read_selected(str(paper)) == select_relevant(text, keep_ratio=0.25).text
+        assert len(predictor.predict(str(paper), top_k=2)) == 2
+
+
+def test_predictor_streams_non_ascii_files_to_the_character_budget(monkeypatch):
+    """Test that streaming sizes the selection budget in characters, not bytes."""
+    import paper2sw.predictor as predictor_module
+
+    monkeypatch.setattr(predictor_module, "STREAM_SELECTION_MIN_BYTES", 1000)
+    predictor = Predictor.from_pretrained(enable_cache=False, selection_keep_ratio=0.25)
+    text = ("Überblick über die Schichten, 超级权重。 " * 80 + "The mlp.down_proj super weight. ") * 10
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text(text, encoding="utf-8")
+
+        assert paper.stat().st_size > 1.2 * len(text)
+        assert predictor._read_selected(str(paper)) == select_relevant(text, keep_ratio=0.25).text
+
+
+def test_predictor_streaming_never_reads_large_files_whole(monkeypatch):
+    """Test that a streamed paper is not loaded whole, even when selection fails."""
+    import paper2sw.predictor as predictor_module
+
+    def read_whole(*args, **kwargs):
+        raise AssertionError("large files must not be read whole")
+
+    monkeypatch.setattr(predictor_module, "STREAM_SELECTION_MIN_BYTES", 1000)
+    monkeypatch.setattr(predictor_module, "read_text_from_source", read_whole)
+    predictor = Predictor.from_pretrained(enable_cache=False, selection_keep_ratio=0.25)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text(("Filler text. " * 100 + "The mlp.down_proj super weight. ") * 10)
+        assert "mlp.down_proj" in predictor._read_selected(str(paper))
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("selection bug")
+
+        monkeypatch.setattr(predictor_module, "select_relevant_stream", broken)
+        with pytest.raises(RuntimeError, match="selection bug"):
+            predictor._read_selected(str(paper))
+
+
+def test_predictor_predict_batch_matches_predict_with_selection():
+    """Test that batched selection gives the same predictions as per-paper predict."""
+    predictor = Predictor.from_pretrained(enable_cache=False, selection_keep_ratio=0.3)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        papers = []
+        for i, family in enumerate(["Llama", "Mistral", "Gemma"]):
+            paper = Path(tmpdir) / f"paper{i}.txt"
+            paper.write_text((f"Filler about {family}. " * 150 + "The mlp.down_proj super weight. ") * 5)
+            papers.append(str(paper))
+        papers.append(str(Path(tmpdir) / "missing.txt"))
+
+        results = predictor.predict_batch(papers, top_k=2, seed=7)
+
+        assert results[:3] == [predictor.predict(p, top_k=2, seed=7) for p in papers[:3]]
+        assert results[3] == []
+
+
+def test_predictor_selection_cache_skips_selection(monkeypatch):
+    """Test that a repeated paper is served from the selection cache."""
+    import paper2sw.predictor as predictor_module
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir, selection_keep_ratio=0.3)
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text(("Filler text. " * 200 + "The mlp.down_proj super weight. ") * 5)
+
+        first = predictor.predict(str(paper), top_k=2, seed=3)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("selection should come from the cache")
+
+        monkeypatch.setattr(predictor_module, "select_relevant", fail)
+        monkeypatch.setattr(predictor_module, "select_relevant_batch", fail)
+        predictor.selection_cache._memory.clear()  # force the on-disk tier
+
+        assert predictor.predict(str(paper), top_k=2, seed=3) == first
+        assert predictor.predict_batch([str(paper)], top_k=2, seed=3) == [first]
+
+
+def test_predictor_use_cache_false_skips_selection_cache(monkeypatch):
+    """Test that use_cache=False neither reads nor writes the selection cache."""
+    import paper2sw.predictor as predictor_module
+
+    monkeypatch.setattr(predictor_module, "STREAM_SELECTION_MIN_BYTES", 4000)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir, selection_keep_ratio=0.3)
+        small = Path(tmpdir) / "small.txt"
+        small.write_text("Filler text. " * 100 + "The mlp.down_proj super weight. ")
+        large = Path(tmpdir) / "large.txt"
+        large.write_text(("Filler text. " * 200 + "The mlp.down_proj super weight. ") * 5)
+        papers = [str(small), str(large)]
+        selection_dir = predictor.selection_cache.cache_dir
+
+        for paper in papers:
+            predictor.predict(paper, top_k=2, seed=3, use_cache=False)
+            list(predictor.iter_predict(paper, top_k=2, seed=3, use_cache=False))
+        predictor.predict_batch(papers, top_k=2, seed=3, use_cache=False)
+        assert not predictor.selection_cache._memory
+        assert not list(selection_dir.iterdir())
+
+        expected = [predictor.predict(paper, top_k=2, seed=3) for paper in papers]
+        assert len(list(selection_dir.iterdir())) == 2
+
+        def stale(*args, **kwargs):
+            return SelectedText(text="stale", kept_fraction=1.0, num_chunks=1)
+
+        monkeypatch.setattr(predictor.selection_cache, "get", stale)
+        assert [predictor.predict(paper, top_k=2, seed=3, use_cache=False) for paper in papers] == expected
+        assert predictor.predict_batch(papers, top_k=2, seed=3, use_cache=False) == expected
+
+
+def test_predictor_does_not_cache_cut_short_analyses(monkeypatch):
+    """Test that predictions from an analysis that ran out of its time budget are not cached."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir, analysis_time_budget=60.0)
+        analyzer = predictor.model.analyzer
+        analyze_paper = analyzer.analyze_paper
+
+        def cut_short(*args, **kwargs):
+            architecture = analyze_paper(*args, **kwargs)
+            architecture.budget_exceeded = True
+            return architecture
+
+        monkeypatch.setattr(analyzer, "analyze_paper", cut_short)
+        texts = ["Llama-13B: the super weight sits in an early mlp.down_proj.", "Mistral-7B has 32 layers."]
+        papers = []
+        for i, text in enumerate(texts):
+            paper = Path(tmpdir) / f"paper{i}.txt"
+            paper.write_text(text)
+            papers.append(str(paper))
+
+        def cached(text):
+            return predictor.cache.get(model_id=predictor.model_id, text=text, top_k=2, seed=1)
+
+        first = predictor.predict(papers[0], top_k=2, seed=1)
+        assert list(predictor.iter_predict(papers[0], top_k=2, seed=1)) == first
+        assert predictor.predict_batch(papers, top_k=2, seed=1)[0] == first
+        assert [cached(text) for text in texts] == [None, None]
+
+        # A complete analysis under the same budget is cached as usual
+        monkeypatch.setattr(analyzer, "analyze_paper", analyze_paper)
+        assert predictor.predict_batch(papers, top_k=2, seed=1)[0] == first
+        assert cached(texts[0]) == first and cached(texts[1]) is not None
+
+
+def test_predictor_batch_fallback_caches_predictions(monkeypatch):
+    """Test that papers predicted one at a time after a failed batch are still cached."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir)
+        texts = ["Llama-13B: the super weight sits in an early mlp.down_proj.", "Mistral-7B has 32 layers."]
+        papers = []
+        for i, text in enumerate(texts):
+            paper = Path(tmpdir) / f"paper{i}.txt"
+            paper.write_text(text)
+            papers.append(str(paper))
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("batch failed")
+
+        monkeypatch.setattr(predictor.model, "predict_many", fail)
+        results = predictor.predict_batch(papers, top_k=2, seed=1)
+        assert results == [predictor.model.predict(text, top_k=2, seed=1) for text in texts]
+        assert [predictor.cache.get(model_id=predictor.model_id, text=text, top_k=2, seed=1) for text in texts] == results
+
+        # use_cache=False still leaves the cache alone
+        assert predictor.predict_batch(papers, top_k=3, seed=1, use_cache=False) == [
+            predictor.model.predict(text, top_k=3, seed=1) for text in texts
+        ]
+        assert predictor.cache.get(model_id=predictor.model_id, text=texts[0], top_k=3, seed=1) is None
+
+
+def test_predictor_selection_budget():
+    """Test that a character budget caps the text passed to the model."""
+    with pytest.raises(ValueError, match="max_chars must be a positive integer"):
+        Predictor.from_pretrained(selection_max_chars=0)
+
+    predictor = Predictor.from_pretrained(enable_cache=False, selection_max_tokens=250)
+    assert predictor.selection_budget == 1000
+
+    text = "Filler text. " * 2000 + "The mlp.down_proj super weight."
+    assert len(predictor._maybe_select(text)) <= 1000
+    assert "mlp.down_proj" in predictor._maybe_select(text)
+
+
+def test_predictor_query_hints_steer_selection():
+    """Test that query hints reach selection and get their own selection cache entries."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        predictor = Predictor.from_pretrained(cache_dir=tmpdir, selection_keep_ratio=0.2)
+        text = "Filler " * 400 + "alpha " * 3 + "Filler " * 400 + "beta " * 3 + "Filler " * 400
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text(text)
+
+        alpha = predictor._read_selected(str(paper), {"alpha": 20})
+        beta = predictor._read_selected(str(paper), {"beta": 20})
+        assert "alpha" in alpha and "beta" not in alpha
+        assert "beta" in beta and "alpha" not in beta
+        assert predictor._read_selected_many([str(paper)], normalize_query_hints({"beta": 20})) == [beta]
+
+        assert len(predictor.predict(str(paper), top_k=2, query_hints=["alpha", "beta"])) == 2
+        assert len(predictor.predict_batch([str(paper)], top_k=2, query_hints={"alpha": 4})[0]) == 2
+
+
+def test_predictor_sweeps_reuse_stored_analysis(monkeypatch):
+    """Test that sweeping top_k, seed, precision and model_id analyzes each paper once."""
+    from paper2sw.semantic_analyzer import SemanticAnalyzer
+
+    # Every analysis, single or batched, ends by building one architecture
+    analyzed = []
+    build = SemanticAnalyzer._build_architecture
+    monkeypatch.setattr(
+        SemanticAnalyzer, "_build_architecture", lambda self, family, *args, **kwargs: analyzed.append(family) or build(self, family, *args, **kwargs)
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        papers = []
+        for i, family in enumerate(["Llama-13B", "Mistral"]):
+            paper = Path(tmpdir) / f"paper{i}.txt"
+            paper.write_text(f"{family} has 40 layers; the super weight sits in an early mlp.down_proj.\n")
+            papers.append(str(paper))
+
+        for model_id, precision in (("sweep/a", "bf16"), ("sweep/b", "fp16")):
+            predictor = Predictor.from_pretrained(model_id=model_id, precision=precision, cache_dir=tmpdir)
+            for top_k, seed in ((2, 0), (3, 1)):
+                assert len(predictor.predict(papers[0], top_k=top_k, seed=seed)) == top_k
+                assert [len(preds) for preds in predictor.predict_batch(papers, top_k=top_k, seed=seed)] == [top_k] * 2
+        assert len(analyzed) == 2
+
+        # Early stopping changes the analyzer signature, so it analyzes again
+        Predictor.from_pretrained(cache_dir=tmpdir, analysis_early_stop=True).predict(papers[0], top_k=1)
+        assert len(analyzed) == 3
@@ -1,7 +1,27 @@
 from __future__ import annotations
 
+import io
+import tempfile
+
 import pytest
-from paper2sw.selector import _simple_chunks, select_relevant, SelectedText
+from paper2sw.cache import ChunkMemo
+from paper2sw.selector import (
+    _KEYWORD_WEIGHTS,
+    _chunk_scorer,
+    _content_defined_chunks,
+    KeywordScorer,
+    _simple_chunks,
+    _structured_chunks,
+    budget_chars,
+    get_keyword_scorer,
+    normalize_query_hints,
+    select_relevant,
+    select_relevant_batch,
+    select_relevant_stream,
+    select_relevant_windows,
+    SelectedText,
+)
+from paper2sw.text_index import TextIndex
 
 
 def test_simple_chunks():
@@ -101,4 +121,309 @@ def test_select_relevant_edge_cases():
         select_relevant("test text", keep_ratio=1.5)
     
     with pytest.raises(ValueError, match="keep_ratio must be between 0.0 and 1.0"):
-        select_relevant("test text", keep_ratio=-0.1)
\ No newline at end of file
+        select_relevant("test text", keep_ratio=-0.1)
+
+
+def test_keyword_scorer_matches_str_count():
+    """Test that both scorer strategies reproduce per-keyword str.count scoring."""
+    weights = dict(_KEYWORD_WEIGHTS)
+    weights["layerlayer"] = 9
+    weights["aa"] = 3
+    texts = [
+        "",
+        "The MLP.down_proj super-weight in layer 2 is an OUTLIER.",
+        "layerlayerlayer aaaaa down_proj down.proj mlp.down_proj",
+        "Feed-forward attention; q_proj k_proj v_proj o_proj gate_proj up_proj.",
+    ]
+    for text in texts:
+        lower = text.lower()
+        expected = sum(lower.count(kw) * w for kw, w in weights.items())
+        assert KeywordScorer(weights, use_automaton=False).score(text) == expected
+        assert KeywordScorer(weights, use_automaton=True).score(text) == expected
+
+
+def test_get_keyword_scorer_is_cached():
+    """Test that scorers are compiled once per keyword table."""
+    assert get_keyword_scorer() is get_keyword_scorer(dict(_KEYWORD_WEIGHTS))
+    assert get_keyword_scorer({"model": 1}) is not get_keyword_scorer()
+
+
+def test_normalize_query_hints():
+    """Test that equivalent hint sets normalize to the same key."""
+    assert normalize_query_hints(None) == ()
+    assert normalize_query_hints("Down_Proj") == (("down_proj", 9),)
+    assert normalize_query_hints(["b", "A", ""]) == normalize_query_hints({"a": 9, "B": 9})
+    assert normalize_query_hints([("a", 2), ("a", 3)]) == (("a", 3),)
+
+    with pytest.raises(TypeError, match="must be a number"):
+        normalize_query_hints({"a": "heavy"})
+    with pytest.raises(TypeError, match="must be strings"):
+        normalize_query_hints([(1, 2)])
+
+
+def test_query_hint_scorers_are_cached():
+    """Test that each hint set is compiled once and weighted hints steer selection."""
+    assert _chunk_scorer({"a": 1, "b": 2}) is _chunk_scorer([("b", 2), ("A", 1)])
+    assert _chunk_scorer("gamma") is _chunk_scorer(["gamma"])
+    assert _chunk_scorer("gamma") is not _chunk_scorer(None)
+
+    text = "Filler " * 400 + "alpha " * 3 + "Filler " * 400 + "beta " * 3 + "Filler " * 400
+    assert "alpha" in select_relevant(text, query_hint={"alpha": 20, "beta": 1}, keep_ratio=0.2).text
+    assert "beta" in select_relevant(text, query_hint={"alpha": 1, "beta": 20}, keep_ratio=0.2).text
+
+
+def test_select_relevant_stream_matches_select_relevant():
+    """Test that streaming selection returns the same text as in-memory selection."""
+    text = (
+        "Filler paragraph about training data and evaluation.\n\n" * 30
+        + "The super weight sits in mlp.down_proj of an early layer.\n\n"
+    ) * 20
+
+    for keep_ratio in (0.1, 0.3, 1.0):
+        expected = select_relevant(text, keep_ratio=keep_ratio)
+        from_handle = select_relevant_stream(io.StringIO(text), keep_ratio=keep_ratio, total_chars=len(text))
+        pieces = (text[i:i + 777] for i in range(0, len(text), 777))
+        from_pieces = select_relevant_stream(pieces, keep_ratio=keep_ratio, total_chars=len(text))
+        assert from_handle == expected
+        assert from_pieces == expected
+
+
+def test_select_relevant_stream_validation():
+    """Test validation in select_relevant_stream."""
+    with pytest.raises(ValueError, match="total_chars or max_chunks"):
+        select_relevant_stream(io.StringIO("text"))
+
+    with pytest.raises(ValueError, match="keep_ratio must be between 0.0 and 1.0"):
+        select_relevant_stream(io.StringIO("text"), keep_ratio=2.0, total_chars=4)
+
+    result = select_relevant_stream(io.StringIO("a" * 5000), max_chunks=1)
+    assert result.num_chunks == 1
+    assert len(result.text) == 2000
+
+
+def test_structured_chunks_respects_boundaries():
+    """Test that structured chunks split on headings and paragraphs without losing text."""
+    paragraph = "We describe the model in detail. " * 20
+    for heading in ("\\section{{Part {i}}}", "## Part {i}", "<h2>Part {i}</h2>"):
+        text = "\n\n".join(heading.format(i=i) + "\n" + paragraph for i in range(6))
+        chunks = _structured_chunks(text, target_chars=1000, max_chars=1500)
+
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 1500 for chunk in chunks)
+        assert all(chunk.startswith(heading.format(i=i)) for i, chunk in enumerate(chunks))
+
+
+def test_structured_chunks_keeps_keywords_whole():
+    """Test that oversized paragraphs are split between sentences, not inside words."""
+    sentence = "The super weight lives in mlp.down_proj of layer two. "
+    text = sentence * 100
+    chunks = _structured_chunks(text, target_chars=400, max_chars=500)
+
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    assert all(chunk.startswith("The super weight") for chunk in chunks)
+
+
+def test_select_relevant_chunker_option():
+    """Test selecting with the structured chunker and rejecting unknown chunkers."""
+    text = "\n\n".join(f"## Section {i}\n" + "Filler text. " * 100 for i in range(10))
+    text += "\n\n## Method\nThe mlp.down_proj super weight is critical.\n"
+
+    result = select_relevant(text, keep_ratio=0.1, chunker="structured")
+    assert "mlp.down_proj super weight" in result.text
+
+    with pytest.raises(ValueError, match="Unknown chunker"):
+        select_relevant(text, chunker="bogus")
+
+
+def _batch_texts():
+    words = ["model", "layer", "mlp.down_proj", "outlier", "filler", "text", "the", "results"]
+    texts = []
+    for n in (5, 400, 1500, 3000):
+        texts.append(" ".join(words[(i * 7 + n) % len(words)] for i in range(n)))
+    texts.append("")
+    return texts
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_select_relevant_batch_matches_select_relevant(use_numpy):
+    """Test that batch selection matches per-document selection exactly."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    texts = _batch_texts()
+    for chunker in ("fixed", "structured"):
+        for keep_ratio in (0.1, 0.5, 1.0):
+            expected = [select_relevant(t, keep_ratio=keep_ratio, chunker=chunker, query_hint="text") for t in texts]
+            result = select_relevant_batch(
+                texts, keep_ratio=keep_ratio, chunker=chunker, query_hint="text", use_numpy=use_numpy
+            )
+            assert result == expected
+
+    hints = {"text": 3, "document": 2}
+    expected = [select_relevant(t, keep_ratio=0.3, query_hint=hints) for t in texts]
+    assert select_relevant_batch(texts, keep_ratio=0.3, query_hint=hints, use_numpy=use_numpy) == expected
+
+
+def test_select_relevant_batch_validation():
+    """Test validation in select_relevant_batch."""
+    with pytest.raises(TypeError, match="Text must be a string"):
+        select_relevant_batch(["ok", 123])
+
+    with pytest.raises(ValueError, match="keep_ratio must be between 0.0 and 1.0"):
+        select_relevant_batch(["ok"], keep_ratio=1.5)
+
+    assert select_relevant_batch([]) == []
+
+
+def test_budget_chars():
+    """Test combining character and token budgets."""
+    assert budget_chars() is None
+    assert budget_chars(max_chars=1000) == 1000
+    assert budget_chars(max_tokens=100) == 400
+    assert budget_chars(max_chars=300, max_tokens=100) == 300
+
+    with pytest.raises(ValueError, match="max_chars must be a positive integer"):
+        budget_chars(max_chars=0)
+    with pytest.raises(ValueError, match="max_tokens must be a positive integer"):
+        budget_chars(max_tokens=-5)
+
+
+def test_select_relevant_budget_is_a_hard_cap():
+    """Test that budget selection never exceeds the budget and prefers relevant chunks."""
+    text = "\n\n".join(
+        f"## Section {i}\n" + ("The mlp.down_proj super weight. " if i % 7 == 0 else "") + "Filler text. " * (20 + i * 3)
+        for i in range(40)
+    )
+    for chunker in ("fixed", "structured"):
+        for max_chars in (1, 300, 2500, 10000):
+            result = select_relevant(text, max_chars=max_chars, chunker=chunker)
+            assert 0 < len(result.text) <= max_chars
+        assert "mlp.down_proj" in select_relevant(text, max_chars=2500, chunker=chunker).text
+
+    result = select_relevant(text, max_tokens=500, chunker="structured")
+    assert len(result.text) <= 2000
+
+    short = "Short text"
+    assert select_relevant(short, max_chars=100).text == short
+
+
+def test_select_relevant_stream_budget():
+    """Test that streaming selection honours a character budget."""
+    text = "Filler text. " * 2000
+    result = select_relevant_stream(io.StringIO(text), max_chars=4500)
+    assert result.num_chunks == 2
+    assert len(result.text) <= 4500
+
+
+@pytest.mark.parametrize("use_automaton", [False, True])
+def test_keyword_scorer_matches_agree_with_counts(use_automaton):
+    """Test that located occurrences agree with counts in both scan modes."""
+    scorer = KeywordScorer(dict(_KEYWORD_WEIGHTS), use_automaton=use_automaton)
+    text = "the mlp.down_proj super weight in an early layer; layer norm; model model".lower()
+    found = scorer.matches(text)
+    assert [sum(1 for _, i in found if i == k) for k in range(len(scorer.keywords))] == scorer.counts(text)
+    assert all(text.startswith(scorer.keywords[i], start) for start, i in found)
+
+
+def test_select_relevant_windows_keeps_straddling_passage():
+    """Test that a dense passage across a fixed chunk boundary is kept whole."""
+    passage = "The super weight in mlp.down_proj of an early layer is critical. " * 6
+    text = "x" * (2000 - len(passage) // 2) + passage
+    text += "y" * (8000 - len(text))
+
+    fixed = select_relevant(text, keep_ratio=0.25)
+    sliding = select_relevant_windows(text, keep_ratio=0.25)
+    assert passage not in fixed.text
+    assert passage in sliding.text
+    assert select_relevant(text, keep_ratio=0.25, chunker="sliding") == sliding
+
+
+def test_select_relevant_windows_matches_rescoring():
+    """Test that rolling window scores pick the same windows as rescoring each window."""
+    text = "".join(
+        f"Paragraph {i} about {'the mlp.down_proj layer' if i % 7 == 3 else 'training data'}. " * (i % 5 + 1)
+        for i in range(400)
+    )
+    scorer = get_keyword_scorer()
+    starts = range(0, len(text) - 2000 + 500, 500)
+    best = max(starts, key=lambda s: (scorer.score(text[s:s + 2000]), -s))
+
+    selected = select_relevant_windows(text, keep_ratio=0.01)
+    assert selected.num_chunks == 1
+    assert selected.text == text[best:best + 2000]
+
+    kept = select_relevant_windows(text, keep_ratio=0.5)
+    pieces = kept.text.split("\n\n")
+    offsets = sorted(text.index(piece) for piece in pieces)
+    assert all(b - a >= 2000 for a, b in zip(offsets, offsets[1:]))
+
+
+def test_select_relevant_windows_share_the_text_index(monkeypatch):
+    """Test that windows are scored from the shared index, even where lowercasing changes lengths."""
+    text = "".join(
+        f"\u0130stanbul paragraph {i} about {'the mlp.down_proj layer' if i % 7 == 3 else 'training data'}. "
+        * (i % 5 + 1)
+        for i in range(400)
+    )
+    assert len(text.lower()) != len(text)
+    index = TextIndex(text)
+    scorer = get_keyword_scorer()
+    starts = range(0, len(text) - 2000 + 500, 500)
+    best = max(starts, key=lambda s: (scorer.score_span(index, s, s + 2000), -s))
+
+    def rescore(*args, **kwargs):
+        raise AssertionError("windows should not be rescored one by one")
+
+    monkeypatch.setattr(KeywordScorer, "score", rescore)
+    selected = select_relevant(text, keep_ratio=0.01, chunker="sliding", text_index=index)
+    assert selected.text == text[best:best + 2000]
+    assert "mlp.down_proj" in index._positions
+    with pytest.raises(ValueError, match="different text"):
+        select_relevant_windows(text + "x", text_index=index)
+
+
+def test_select_relevant_windows_budget_and_validation():
+    """Test the window selector budget and argument checks."""
+    text = "Filler text. " * 2000 + "The mlp.down_proj super weight."
+    selected = select_relevant_windows(text, max_chars=1000)
+    assert len(selected.text) <= 1000
+    assert "mlp.down_proj" in selected.text
+
+    with pytest.raises(ValueError, match="stride_chars"):
+        select_relevant_windows(text, stride_chars=3000)
+    with pytest.raises(ValueError, match="keyword scoring only"):
+        select_relevant(text, chunker="sliding", scoring="bm25")
+
+
+def test_content_defined_chunks_survive_insertions():
+    """Test that an inserted line only changes the chunks around it."""
+    lines = [f"Line {i} about the model and its layers. " * (i % 4 + 1) for i in range(2000)]
+    text = "\n".join(lines)
+    revised = "\n".join(lines[:1000] + ["An inserted sentence."] + lines[1000:])
+
+    chunks = _content_defined_chunks(text)
+    revised_chunks = _content_defined_chunks(revised)
+    assert "".join(chunks) == text
+    assert "".join(revised_chunks) == revised
+    assert all(len(c) <= 2000 for c in chunks)
+    assert len(set(revised_chunks) - set(chunks)) <= 2
+
+    one_line = "word " * 2000
+    assert "".join(_content_defined_chunks(one_line, max_chars=300)) == one_line
+    assert all(len(c) <= 300 for c in _content_defined_chunks(one_line, max_chars=300))
+
+
+def test_select_relevant_with_chunk_memo(monkeypatch):
+    """Test that memoized chunk scores give the same selection and are reused."""
+    text = "\n".join(f"Paragraph {i} on {'the mlp.down_proj outlier' if i % 11 == 0 else 'training'}." for i in range(3000))
+    expected = select_relevant(text, keep_ratio=0.2, chunker="content")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        memo = ChunkMemo(cache_dir=tmpdir)
+        assert select_relevant(text, keep_ratio=0.2, chunker="content", memo=memo) == expected
+
+        def fail(self, chunk):
+            raise AssertionError("scores should come from the memo")
+
+        monkeypatch.setattr(KeywordScorer, "score", fail)
+        assert select_relevant(text, keep_ratio=0.2, chunker="content", memo=ChunkMemo(cache_dir=tmpdir)) == expected
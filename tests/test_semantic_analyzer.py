@@ -1,7 +1,16 @@
 from __future__ import annotations
 
 import pytest
-from paper2sw.semantic_analyzer import SemanticAnalyzer, ModelArchitecture, SuperWeightCandidate
+import re
+import tempfile
+from paper2sw.cache import ChunkMemo
+from paper2sw.semantic_analyzer import (
+    _NUMERIC_PATTERNS,
+    _NUMERIC_RANGES,
+    SemanticAnalyzer,
+    ModelArchitecture,
+    SuperWeightCandidate,
+)
 
 
 def test_semantic_analyzer_creation():
@@ -27,6 +36,33 @@ def test_infer_model_family():
     assert analyzer._infer_model_family("This is about an unknown model.") == "Unknown-Model"
 
 
+def test_infer_model_family_sizes_and_frequency():
+    """Test size variants, word boundaries and ranking families by mention count."""
+    analyzer = SemanticAnalyzer()
+    
+    assert analyzer._infer_model_family("We fine-tune Llama-2 13B; Llama 2 13B beats Llama-2-7b.") == "Llama-13B"
+    assert analyzer._infer_model_family("LLaMA-65B") == "Llama-65B"
+    assert analyzer._infer_model_family("Mixtral 8x7B is a sparse mixture of experts.") == "Mixtral-8x7B"
+    assert analyzer._infer_model_family("BERT-base-uncased and BERT-large") == "Bert-Base"
+    assert analyzer._infer_model_family("Phi-2 follows phi-1.5.") == "Phi-2"
+    
+    # Short names only match whole words
+    assert analyzer._infer_model_family("Optimization of t5x with a bartender.") == "Unknown-Model"
+    
+    # Names that are also English words need a size or a model word
+    assert analyzer._infer_model_family("We opt to use 12 layers; bloom filters are used.") == "Unknown-Model"
+    assert analyzer._infer_model_family("We opt for BLOOM-1b7 over BLOOM and bloom filters.") == "Bloom-1B7"
+    assert analyzer._infer_model_family("OPT models are open.") == "Opt-6.7B"
+    
+    # Named sizes extend versions, and resolve to their own configs
+    assert analyzer._infer_model_family("GPT-2 XL, unlike gpt2-xl or GPT-2, ...") == "Gpt-2-XL"
+    assert analyzer.analyze_paper("We probe gpt2-xl.").hidden_size == 1600
+    assert analyzer._infer_model_family("GPT-3 175B") == "Gpt-3"
+    
+    # The most mentioned family wins, regardless of table order
+    assert analyzer._infer_model_family("Unlike Llama, Falcon-40B and Falcon-7B use falcon tricks.") == "Falcon-40B"
+
+
 def test_extract_numerical_values():
     """Test extraction of numerical values."""
     analyzer = SemanticAnalyzer()
@@ -84,6 +120,13 @@ def test_analyze_paper():
     assert architecture.num_layers == 32
     assert architecture.hidden_size == 4096
     assert len(architecture.key_components) > 0
+    
+    # The knowledge base fills in only a size or version the paper names
+    named = analyzer.analyze_paper("We probe Llama-13B; its 40 layers matter.")
+    assert (named.num_layers, named.hidden_size, named.attention_heads) == (40, 5120, 40)
+    for text in ("We study Llama and its attention.", "Bloom filters are used."):
+        bare = analyzer.analyze_paper(text)
+        assert (bare.num_layers, bare.hidden_size, bare.attention_heads, bare.mlp_expansion) == (None,) * 4
 
 
 def test_predict_superweight_candidates():
@@ -107,4 +150,249 @@ def test_predict_superweight_candidates():
     for candidate in candidates[:3]:  # Check first few candidates
         assert candidate.layer < 8  # Should be in early layers
         assert candidate.confidence > 0
-        assert len(candidate.evidence) > 0
\ No newline at end of file
+        assert len(candidate.evidence) > 0
+
+
+def _paper_lines(count: int) -> list[str]:
+    facts = [
+        "The model uses 24 transformer layers.",
+        "We use a hidden size of 2048 and 16 attention heads.",
+        "Outliers appear in the mlp.down_proj of layer 2, unlike gemma.",
+        "Results on the benchmark improve over the llama baseline.",
+    ]
+    return [f"Paragraph {i}: {facts[i % len(facts)]} " + "Filler words about training. " * (i % 9) for i in range(count)]
+
+
+def test_analyze_paper_with_chunk_memo():
+    """Test that memoized chunk analysis matches whole-text analysis and reuses chunks."""
+    analyzer = SemanticAnalyzer()
+    lines = _paper_lines(600)
+    text = "\n".join(lines)
+    revised = "\n".join(lines[:300] + ["A new paragraph mentions mistral and 48 layers."] + lines[300:])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        memo = ChunkMemo(cache_dir=tmpdir)
+        for paper in (text, revised):
+            expected = analyzer.analyze_paper(paper)
+            result = analyzer.analyze_paper(paper, memo)
+            assert result.model_family == expected.model_family
+            assert (result.num_layers, result.hidden_size, result.attention_heads) == (
+                expected.num_layers, expected.hidden_size, expected.attention_heads
+            )
+            assert sorted(result.key_components) == sorted(expected.key_components)
+            assert sorted(result.mentioned_layers) == sorted(expected.mentioned_layers)
+
+        analyzed = []
+        original = analyzer._chunk_features
+        analyzer._chunk_features = lambda chunk, *span: analyzed.append(chunk) or original(chunk, *span)
+        fresh = ChunkMemo(cache_dir=tmpdir)
+        assert fresh.memoize([], "unused", len) == []
+        analyzer.analyze_paper(revised + "\nOne more closing line.", fresh)
+        assert sum(len(chunk) for chunk in analyzed) < len(revised) // 5
+
+
+def test_analyze_paper_in_process_pool(monkeypatch):
+    """Test that pooled analysis of a long text merges to the serial result."""
+    import paper2sw.semantic_analyzer as analyzer_module
+
+    monkeypatch.setattr(analyzer_module, "PARALLEL_MIN_CHARS", 10_000)
+    monkeypatch.setattr(analyzer_module, "_CHUNKS_PER_TASK", 2)
+    text = "\n".join(_paper_lines(600))
+    expected = SemanticAnalyzer().analyze_paper(text)
+
+    analyzer = SemanticAnalyzer(workers=2)
+    serial = analyzer._chunk_features
+    analyzer._chunk_features = lambda chunk: pytest.fail("chunks should be analyzed by the pool")
+    result = analyzer.analyze_paper(text)
+    assert (result.model_family, result.num_layers, result.hidden_size, result.attention_heads) == (
+        expected.model_family, expected.num_layers, expected.hidden_size, expected.attention_heads
+    )
+    assert sorted(result.key_components) == sorted(expected.key_components)
+    assert sorted(result.mentioned_layers) == sorted(expected.mentioned_layers)
+
+    analyzer._chunk_features = serial
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert analyzer.analyze_paper(text, ChunkMemo(cache_dir=tmpdir)) == result
+
+    with pytest.raises(ValueError, match="workers must be a positive integer or None"):
+        SemanticAnalyzer(workers=0)
+
+
+def test_analyze_paper_prefers_architecture_tables(monkeypatch):
+    """Test that table values win and free text is only scanned for the missing fields."""
+    analyzer = SemanticAnalyzer()
+    scanned = []
+    numeric_matches = analyzer._numeric_matches
+    monkeypatch.setattr(analyzer, "_numeric_matches", lambda text, params, **kwargs: scanned.append(params) or numeric_matches(text, params, **kwargs))
+    text = r"""We study LLaMA-13B. An ablation with 12 layers and 8 heads is in the appendix.
+\begin{tabular}{lcc}
+Model & Layers & Hidden size \\
+LLaMA-7B & 32 & 4096 \\
+LLaMA-13B & 40 & 5120 \\
+\end{tabular}
+"""
+    architecture = analyzer.analyze_paper(text)
+    assert (architecture.num_layers, architecture.hidden_size, architecture.attention_heads) == (40, 5120, 8)
+    assert scanned == [("mlp_expansion", "attention_heads")]
+    
+    scanned.clear()
+    analyzer.analyze_paper(text.replace("Hidden size", "Hidden size & Heads & MLP ratio").replace("5120", "5120 & 40 & 4"))
+    assert scanned == []
+
+
+def test_analyze_paper_early_stop():
+    """Test that early stopping reads sections by priority and reports the ones it skipped."""
+    text = r"""Super Weights in Llama-7B
+We find the super weight in the down projection of layer 2.
+\section{Introduction}
+Outliers matter.
+\section*{Experiments}
+We ablate a variant with 12 layers.
+\section{Model}
+The model has 32 layers, a hidden size of 4096 and 32 heads.
+\appendix
+\section{Scaling}
+Llama-13B has 40 layers.
+\section{References}
+"""
+    architecture = SemanticAnalyzer(early_stop=True).analyze_paper(text)
+    assert architecture.model_family == "Llama-7B"
+    assert (architecture.num_layers, architecture.hidden_size, architecture.attention_heads) == (32, 4096, 32)
+    assert architecture.skipped_sections == ["Introduction", "Experiments", "Scaling", "References"]
+    assert architecture.parameter_constraints == {"down_proj": "super-weight candidate"}
+    assert SemanticAnalyzer().analyze_paper(text).skipped_sections == []
+
+    # Without enough evidence every section is read and the result matches a full read
+    unresolved = text.replace("32 heads", "many heads")
+    expected = SemanticAnalyzer().analyze_paper(unresolved)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = SemanticAnalyzer(early_stop=True).analyze_paper(unresolved, ChunkMemo(cache_dir=tmpdir))
+    assert result.skipped_sections == []
+    assert (result.model_family, result.num_layers, result.hidden_size) == (
+        expected.model_family, expected.num_layers, expected.hidden_size
+    )
+
+    with pytest.raises(ValueError, match="early_stop must be a boolean"):
+        SemanticAnalyzer(early_stop="yes")
+
+
+def test_numeric_extractor_matches_per_pattern_findall():
+    """Test that the single-pass extractor finds exactly what per-pattern IGNORECASE findall did."""
+    analyzer = SemanticAnalyzer()
+    texts = [
+        "We use 32 attention heads with 8 heads of grouped-query attention and 24 layers.",
+        "NUM_LAYERS=48, D_MODEL:4096, MLP expansion factor is 4, ffn-expansion 8 and 12heads.",
+        "Grouped Query Attention over 16 heads, 1000 layers, hidden size of 63 and depth 7.",
+        "Sizes: İ ſ ı, uſes 12 tranſformer layers, multi-head 16, \u0663\u0662 heads\nnum\nheads 4",
+        "",
+        # Long runs of spaces and hyphens around numbers, and numbers far from any context
+        "grouped query attention" + " -" * 300 + "with 8" + " " * 500 + "heads and 4 heads",
+        "num" + " " * 500 + "layers" + "-" * 300 + "12" + " " * 400 + "layers, " + "words " * 100 + "7 layers",
+        "grouped-query attention " + "x" * 95 + " 16 heads; " + "filler " * 50 + "hidden size 1024, 2 heads",
+    ]
+    for text in texts:
+        expected = {
+            param: [
+                [int(v) for v in re.findall(p, text, re.IGNORECASE) if low <= int(v) <= high]
+                for p in patterns
+            ]
+            for param, patterns in _NUMERIC_PATTERNS.items()
+            for low, high in [_NUMERIC_RANGES[param]]
+        }
+        assert analyzer._numeric_matches(text) == expected
+
+
+def test_analyze_many_matches_analyze():
+    """Test that batched analysis of short papers gives each paper's own analysis."""
+    analyzer = SemanticAnalyzer()
+    texts = _paper_lines(40) + [
+        "",
+        "7 layers",
+        "Llama-2 13B\nhidden size 5120\n40 layers, 40 heads\ndown_proj",
+        "mlp feed forward, early layers 1, 2 and block 3",
+        "\\begin{tabular}{lc} layers & 32 \\\\ hidden & 2048 \\end{tabular} llama",
+        "phi-2: attention_heads=32",
+        "x" * 5000 + " mistral with 48 layers",
+        "İstanbul gemma-7b",
+    ]
+    for result, text in zip(analyzer.analyze_many(texts), texts):
+        expected = analyzer.analyze(text)
+        assert result.candidates == expected.candidates
+        for architecture in (result.architecture, expected.architecture):
+            architecture.key_components.sort()
+            architecture.mentioned_layers.sort()
+        assert result.architecture == expected.architecture
+    assert analyzer.analyze_many([]) == []
+    with pytest.raises(TypeError, match="text must be a string"):
+        analyzer.analyze_many(["fine", None])
+
+
+def test_extraction_in_bounded_windows_and_linear_time(monkeypatch):
+    """Test that windowed scanning finds what a whole-text scan does and pathological text stays fast."""
+    import time
+    import paper2sw.semantic_analyzer as analyzer_module
+
+    analyzer = SemanticAnalyzer()
+    # One long line, so number lines and layer mentions span many windows
+    text = " ".join(_paper_lines(200)) + " grouped-query attention with 8 heads, early layers 0, 1, 2 and Llama-2 13B"
+    expected = (
+        analyzer._numeric_matches(text),
+        sorted(analyzer._extract_architecture_components(text)[1]),
+        analyzer._family_mentions(text),
+    )
+    monkeypatch.setattr(analyzer_module, "_SCAN_WINDOW", 256)
+    monkeypatch.setattr(analyzer_module, "_SCAN_OVERLAP", 64)
+    assert (
+        analyzer._numeric_matches(text),
+        sorted(analyzer._extract_architecture_components(text)[1]),
+        analyzer._family_mentions(text),
+    ) == expected
+    monkeypatch.undo()
+
+    # Each of these took minutes when patterns were retried at every digit or backtracked per mention
+    for pathological in (
+        "1" * 200_000,
+        "grouped-query attention 1 " * 8_000,
+        "\\begin{tabular}{c}" * 10_000,
+        "layer" + "-" * 200_000 + "1",
+    ):
+        start = time.perf_counter()
+        analyzer.analyze_paper(pathological)
+        assert time.perf_counter() - start < 5
+
+
+def test_analyze_paper_time_budget():
+    """Test that an exhausted time budget gives a flagged, unmemoized partial result."""
+    text = "\n".join(_paper_lines(600))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        memo = ChunkMemo(cache_dir=tmpdir)
+        for analyzer in (SemanticAnalyzer(time_budget=1e-9), SemanticAnalyzer(time_budget=1e-9, early_stop=True)):
+            for result in (analyzer.analyze_paper(text), analyzer.analyze_paper(text, memo)):
+                assert result.budget_exceeded
+                assert (result.model_family, result.num_layers, result.mentioned_layers) == ("Unknown-Model", None, [])
+        assert memo.memoize(["never stored"], "unused", lambda chunk: None) == [None]
+        assert len(memo._memory) == 0
+
+    result = SemanticAnalyzer(time_budget=60).analyze_paper(text)
+    assert not result.budget_exceeded
+    assert result == SemanticAnalyzer().analyze_paper(text)
+
+    for time_budget in (0, -1, True, "5"):
+        with pytest.raises(ValueError, match="time_budget must be a positive number of seconds or None"):
+            SemanticAnalyzer(time_budget=time_budget)
+
+
+def test_analyze_paper_time_budget_bounds_dense_numbers():
+    """Test that a budgeted run on number-dense text takes little more than indexing it."""
+    import time
+
+    from paper2sw.text_index import TextIndex
+
+    analyzer = SemanticAnalyzer(time_budget=0.01)
+    for text in ("1-" * 200_000, "early layer " + "1, " * 133_333, "1\n" * 200_000):
+        start = time.perf_counter()
+        TextIndex(text).number_lines()
+        indexing = time.perf_counter() - start
+        start = time.perf_counter()
+        analyzer.analyze_paper(text)
+        assert time.perf_counter() - start < 4 * indexing + 0.5
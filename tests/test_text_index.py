@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+import re
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from paper2sw.predictor import Predictor
+from paper2sw.selector import select_relevant
+from paper2sw.semantic_analyzer import SemanticAnalyzer
+from paper2sw.text_index import TextIndex
+
+
+def test_text_index_lookups_match_rescanning():
+    """Test that index lookups agree with str.count, word-bounded regexes and digit lines."""
+    rng = random.Random(0)
+    words = ["Layer", "layers", "aaa", "a", "x_layer", "MLP", "12", "\n", "İ", "block 3"]
+    for _ in range(300):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+        index = TextIndex(text)
+        assert len(index.lower) == len(text)
+        for keyword in ("layer", "aa", "mlp", "i"):
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, len(text))
+            assert index.count(keyword, start, end) == index.lower[start:end].count(keyword)
+            assert index.has_word(keyword) == bool(re.search(rf"\b{keyword}\b", text, re.IGNORECASE))
+        digit_lines = [line for line in index.lower.split("\n") if re.search(r"\d", line)]
+        scanned = "".join(index.lower[start:end] for start, end in index.number_lines())
+        assert [line for line in scanned.split("\n") if line] == digit_lines
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, len(text))
+        window = "".join(index.lower[s:e] for s, e in index.number_lines(start, end))
+        assert [line for line in window.split("\n") if re.search(r"\d", line)] == [
+            line for line in index.lower[start:end].split("\n") if re.search(r"\d", line)
+        ]
+
+    index = TextIndex("aaaa Layer layer")
+    assert index.positions("aa") == [0, 2]
+    assert index.positions("layer") == [5, 11]
+    assert index.numbers == []
+    with pytest.raises(TypeError, match="text must be a string"):
+        TextIndex(None)
+
+
+def test_text_index_shared_by_selection_and_analysis():
+    """Test that selection and analysis give the same results with a shared index."""
+    text = ("Filler about training data. " * 40 + "\n") * 20 + (
+        "Llama-2 13B uses 40 layers and a hidden size of 5120 with 40 heads.\n"
+        "The super weight sits in the mlp.down_proj of layer 2.\n"
+    )
+    index = TextIndex(text)
+    for chunker in ("fixed", "structured", "content"):
+        assert select_relevant(text, keep_ratio=0.2, chunker=chunker, text_index=index) == select_relevant(
+            text, keep_ratio=0.2, chunker=chunker
+        )
+    assert SemanticAnalyzer().analyze_paper(text, text_index=index) == SemanticAnalyzer().analyze_paper(text)
+
+    with pytest.raises(ValueError, match="text_index was built for a different text"):
+        select_relevant(text, keep_ratio=0.2, text_index=TextIndex("other"))
+    with pytest.raises(ValueError, match="text_index was built for a different text"):
+        SemanticAnalyzer().analyze_paper(text, text_index=TextIndex("other"))
+
+
+def test_predictor_indexes_each_paper_once(monkeypatch):
+    """Test that Predictor builds one index per paper and passes it down to analysis."""
+    import paper2sw.text_index as text_index_module
+
+    built = []
+    original_init = text_index_module.TextIndex.__init__
+    monkeypatch.setattr(
+        text_index_module.TextIndex, "__init__", lambda self, text: built.append(text) or original_init(self, text)
+    )
+    predictor = Predictor.from_pretrained(enable_cache=False)
+    text = "Llama-2 13B uses 40 layers.\nThe super weight sits in the down projection of layer 2.\n"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paper = Path(tmpdir) / "paper.txt"
+        paper.write_text(text)
+        assert len(predictor.predict(str(paper), top_k=2)) == 2
+    assert built == [text]